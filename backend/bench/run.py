@@ -0,0 +1,295 @@
+"""
+API benchmark harness.
+
+Boots ``create_app`` against a file-backed SQLite database seeded with
+realistic volumes, drives each endpoint group with N concurrent workers
+for a fixed duration through the in-process WSGI client, and reports
+latency percentiles, throughput and SQL queries per request::
+
+    python bench/run.py --concurrency 8 --duration 10
+    python bench/run.py --output bench/results/after.json --compare bench/results/before.json
+
+Requests run in-process, so numbers measure the app and database, not
+the network stack.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND / "src"))
+
+from app import create_app  # noqa: E402
+from config import Config, engine_options  # noqa: E402
+from extensions import db  # noqa: E402
+from instrumentation import count_queries  # noqa: E402
+from seed_data import METROS, SeedVolumes, seed_database, synthetic_donations, write_inventory_file  # noqa: E402
+
+# Listing queries are centered on Pittsburgh
+CENTER = METROS[0][1:3]
+
+GROUPS = ["donations", "users", "history", "holds_list", "hold_cycle", "mixed"]
+
+
+class Recorder:
+    """Thread-safe collection of (latency, queries, status) samples per endpoint."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[tuple[float, int, int]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def timed(self, name: str, send):
+        """Run one request, recording its latency, query count and status."""
+        with count_queries() as queries:
+            started = time.perf_counter()
+            try:
+                response = send()
+                status = response.status_code
+            except Exception:
+                response, status = None, 599
+            elapsed = time.perf_counter() - started
+        with self._lock:
+            self.samples[name].append((elapsed, queries.count, status))
+        return response
+
+
+class Workload:
+    """Request generators for each endpoint group."""
+
+    def __init__(self, volumes: SeedVolumes, donation_ids: list[str], recorder: Recorder) -> None:
+        self.volumes = volumes
+        self.donation_ids = donation_ids
+        self.rec = recorder
+
+    def donations(self, client, rng: random.Random) -> None:
+        lat = CENTER[0] + rng.uniform(-0.2, 0.2)
+        lng = CENTER[1] + rng.uniform(-0.2, 0.2)
+        show_all = "&showAll=true" if rng.random() < 0.3 else ""
+        self.rec.timed("GET /donations", lambda: client.get(
+            f"/api/v1/donations?lat={lat:.4f}&lng={lng:.4f}&radius=10{show_all}"
+        ))
+
+    def users(self, client, rng: random.Random) -> None:
+        user_id = rng.randint(1, self.volumes.users)
+        self.rec.timed("GET /users/lookup", lambda: client.get(
+            f"/api/v1/users/lookup?email=user{user_id}@seed.test"
+        ))
+
+    def history(self, client, rng: random.Random) -> None:
+        user_id = rng.randint(1, self.volumes.users)
+        self.rec.timed("GET /history", lambda: client.get(f"/api/v1/history?userId={user_id}&limit=50"))
+
+    def holds_list(self, client, rng: random.Random) -> None:
+        user_id = rng.randint(1, self.volumes.users)
+        self.rec.timed("GET /holds", lambda: client.get(f"/api/v1/holds?userId={user_id}&limit=50"))
+
+    def hold_cycle(self, client, rng: random.Random) -> None:
+        user_id = rng.randint(1, self.volumes.users)
+        donation_id = rng.choice(self.donation_ids)
+        response = self.rec.timed("POST /holds", lambda: client.post(
+            "/api/v1/holds", json={"userId": user_id, "donationId": donation_id}
+        ))
+        if response is None or response.status_code != 201:
+            return
+        hold_id = response.get_json()["hold"]["id"]
+        if rng.random() < 0.5:
+            self.rec.timed("DELETE /holds/:id", lambda: client.delete(f"/api/v1/holds/{hold_id}"))
+        else:
+            self.rec.timed("POST /holds/:id/pickup", lambda: client.post(f"/api/v1/holds/{hold_id}/pickup"))
+
+    def mixed(self, client, rng: random.Random) -> None:
+        """Mostly reads with hold writes interleaved, so readers contend with commits."""
+        roll = rng.random()
+        if roll < 0.2:
+            self.hold_cycle(client, rng)
+        elif roll < 0.6:
+            self.donations(client, rng)
+        else:
+            self.history(client, rng)
+
+
+def summarize(samples: list[tuple[float, int, int]], wall_seconds: float) -> dict:
+    """Latency percentiles (ms), throughput and mean queries for one endpoint."""
+    latencies = sorted(s[0] for s in samples)
+
+    def pct(p: float) -> float:
+        index = min(len(latencies) - 1, max(0, round(p / 100 * len(latencies)) - 1))
+        return round(latencies[index] * 1000, 3)
+
+    statuses: dict[str, int] = defaultdict(int)
+    for _, _, status in samples:
+        statuses[str(status)] += 1
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if s[2] >= 500),
+        "rps": round(len(samples) / wall_seconds, 1),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "queries_per_request": round(sum(s[1] for s in samples) / len(samples), 2),
+        "statuses": dict(statuses),
+    }
+
+
+def run_group(app, workload: Workload, group: str, concurrency: int, duration: float, seed: int) -> float:
+    """Drive one endpoint group with ``concurrency`` workers; return wall time."""
+    action = getattr(workload, group)
+    deadline = time.perf_counter() + duration
+    start_gate = threading.Barrier(concurrency)
+
+    def worker(index: int) -> None:
+        rng = random.Random(f"{seed}-{group}-{index}")
+        client = app.test_client()
+        start_gate.wait()
+        while time.perf_counter() < deadline:
+            action(client, rng)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started
+
+
+def build_app(db_path: str, inventory_path: str, sqlite_pragmas: dict | None = None):
+    """
+    Create the app on a file-backed SQLite DB serving the synthetic inventory.
+
+    ``sqlite_pragmas`` overrides Config.SQLITE_PRAGMAS; pass {} for SQLite's
+    defaults (rollback journal, synchronous=FULL).
+    """
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        SQLALCHEMY_ENGINE_OPTIONS = engine_options(f"sqlite:///{db_path}")
+        SQLITE_PRAGMAS = Config.SQLITE_PRAGMAS if sqlite_pragmas is None else sqlite_pragmas
+        INVENTORY_BACKEND = "mock"
+        INVENTORY_DONATIONS_FILE = inventory_path
+        HOLD_SWEEP_INTERVAL_SECONDS = 0
+
+    return create_app(BenchConfig)
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results: dict, baseline: dict | None) -> None:
+    header = f"{'endpoint':<24}{'req':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'q/req':>8}{'err':>6}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<24}{r['requests']:>8}{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}"
+              f"{r['p99_ms']:>10}{r['queries_per_request']:>8}{r['errors']:>6}")
+        if baseline and name in baseline:
+            b = baseline[name]
+            deltas = [
+                _delta(r[key], b[key]) for key in ("rps", "p50_ms", "p95_ms", "p99_ms", "queries_per_request")
+            ]
+            print(f"{'  vs baseline':<24}{'':>8}{deltas[0]:>10}{deltas[1]:>10}{deltas[2]:>10}"
+                  f"{deltas[3]:>10}{deltas[4]:>8}")
+
+
+def _delta(new: float, old: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.0f}%"
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent workers per group.")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to drive each group.")
+    parser.add_argument("--groups", default=",".join(GROUPS), help=f"Comma-separated subset of {GROUPS}.")
+    parser.add_argument("--users", type=int, default=SeedVolumes.users)
+    parser.add_argument("--donations", type=int, default=SeedVolumes.donations)
+    parser.add_argument("--holds", type=int, default=SeedVolumes.holds)
+    parser.add_argument("--seed", type=int, default=0, help="Seed for data and request mix.")
+    parser.add_argument("--db", help="SQLite file to use (default: a fresh temp file).")
+    parser.add_argument("--sqlite-defaults", action="store_true",
+                        help="Skip Config.SQLITE_PRAGMAS (baseline for the WAL/pragma tuning).")
+    parser.add_argument("--output", help="Write results JSON here.")
+    parser.add_argument("--compare", help="Baseline results JSON to diff against.")
+    args = parser.parse_args(argv)
+
+    groups = [g for g in args.groups.split(",") if g]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown groups: {sorted(unknown)}")
+
+    volumes = SeedVolumes(args.users, args.holds, args.donations)
+    tmpdir = tempfile.TemporaryDirectory()
+    db_path = args.db or os.path.join(tmpdir.name, "bench.db")
+    inventory_path = os.path.join(tmpdir.name, "inventory.json")
+
+    started = time.perf_counter()
+    donations = synthetic_donations(volumes.donations, args.seed)
+    write_inventory_file(inventory_path, donations)
+    donation_ids = [d["id"] for d in donations]
+    app = build_app(db_path, inventory_path, {} if args.sqlite_defaults else None)
+    with app.app_context():
+        seeded = seed_database(volumes, args.seed, donation_ids)
+    seeded["donations"] = len(donations)
+    print(f"seeded {seeded} in {time.perf_counter() - started:.1f}s ({db_path})")
+
+    recorder = Recorder()
+    workload = Workload(volumes, donation_ids, recorder)
+    wall: dict[str, float] = {}
+    for group in groups:
+        before = set(recorder.samples)
+        elapsed = run_group(app, workload, group, args.concurrency, args.duration, args.seed)
+        for name in set(recorder.samples) - before:
+            wall[name] = elapsed
+
+    results = {name: summarize(samples, wall[name]) for name, samples in recorder.samples.items()}
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": "sqlite (file)",
+            "sqlite_pragmas": {} if args.sqlite_defaults else Config.SQLITE_PRAGMAS,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "seed": args.seed,
+            "volumes": seeded,
+        },
+        "results": results,
+    }
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["results"]
+    print_report(results, baseline)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"wrote {args.output}")
+    with app.app_context():
+        db.engine.dispose()
+    tmpdir.cleanup()
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Server throughput benchmark.
+
+Seeds one SQLite database, then serves it with each server in turn and
+drives the same read-heavy HTTP workload against it over real sockets::
+
+    python bench/servers.py --concurrency 16 --duration 15
+    python bench/servers.py --servers gunicorn --workers 4 --threads 4
+    python bench/servers.py --servers gunicorn --workers 3 --streams 3
+    python bench/servers.py --servers gunicorn --workers 3 --streams 12 --stream-pool
+
+Servers:
+    dev       ``flask run --debug`` (what ``python src/app.py`` starts)
+    gunicorn  ``gunicorn -c gunicorn.conf.py`` with --workers/--threads
+
+Unlike ``bench/run.py`` this goes through the network stack and the
+server's worker model, so it measures what a client would see.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+BACKEND = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND / "src"))
+sys.path.insert(0, str(BACKEND / "bench"))
+
+from run import CENTER, build_app, summarize  # noqa: E402
+from seed_data import SeedVolumes, seed_database, synthetic_donations, write_inventory_file  # noqa: E402
+
+SERVERS = ["dev", "gunicorn"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_command(name: str, port: int, workers: int | None = None, threads: int | None = None) -> list[str]:
+    if name == "dev":
+        return [sys.executable, "-m", "flask", "--app", "src/app.py", "--debug",
+                "run", "--port", str(port)]
+    command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}"]
+    if workers is not None:
+        command += ["--workers", str(workers)]
+    if threads is not None:
+        command += ["--threads", str(threads)]
+    return command
+
+
+def start_server(command: list[str], env: dict, log_path: str) -> subprocess.Popen:
+    with open(log_path, "w") as log:
+        return subprocess.Popen(
+            command, cwd=BACKEND, env=env,
+            stdout=log, stderr=subprocess.STDOUT, start_new_session=True,
+        )
+
+
+def _stop(proc: subprocess.Popen) -> None:
+    for sig in (signal.SIGINT, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            return
+        try:
+            proc.wait(timeout=10)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def wait_until_up(base_url: str, proc: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            if requests.get(f"{base_url}/api/v1/health", timeout=1).ok:
+                return
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not come up")
+
+
+def open_streams(base_url: str, count: int) -> list[dict]:
+    """
+    Open ``count`` SSE connections to /donations/stream and keep reading
+    them in background threads, like idle browser tabs listening for changes.
+
+    Returns:
+        One state dict per stream; pass them to ``close_streams``.
+    """
+    streams = []
+    for _ in range(count):
+        state = {"response": None, "closing": False, "dropped": False, "refused": False}
+
+        def read(state=state) -> None:
+            try:
+                resp = requests.get(f"{base_url}/api/v1/donations/stream", stream=True, timeout=(5, None))
+                state["response"] = resp
+                if resp.status_code == 503:
+                    # The worker's stream limit was reached; a browser would retry
+                    state["refused"] = True
+                    return
+                for _ in resp.iter_lines():
+                    pass
+            except Exception:
+                pass
+            # The server ending a stream we still wanted means its worker died
+            state["dropped"] = not state["closing"] and not state["refused"]
+
+        state["thread"] = threading.Thread(target=read, daemon=True)
+        state["thread"].start()
+        streams.append(state)
+    # Let every stream reach a worker before the measured load starts
+    time.sleep(1)
+    return streams
+
+
+def close_streams(streams: list[dict]) -> tuple[int, int]:
+    """
+    Close streams opened by ``open_streams``.
+
+    Returns:
+        How many the server dropped first, and how many it refused with 503.
+    """
+    for state in streams:
+        state["closing"] = True
+        if state["response"] is not None:
+            state["response"].close()
+    for state in streams:
+        state["thread"].join(timeout=5)
+    return sum(state["dropped"] for state in streams), sum(state["refused"] for state in streams)
+
+
+def drive(base_url: str, volumes: SeedVolumes, concurrency: int, duration: float, seed: int) -> dict:
+    """Send a donations/users/history mix from ``concurrency`` keep-alive clients."""
+    samples: list[tuple[float, int, int]] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    start_gate = threading.Barrier(concurrency)
+
+    def worker(index: int) -> None:
+        rng = random.Random(f"{seed}-{index}")
+        session = requests.Session()
+        local = []
+        start_gate.wait()
+        while time.perf_counter() < deadline:
+            roll = rng.random()
+            user_id = rng.randint(1, volumes.users)
+            if roll < 0.5:
+                lat = CENTER[0] + rng.uniform(-0.2, 0.2)
+                lng = CENTER[1] + rng.uniform(-0.2, 0.2)
+                path = f"/api/v1/donations?lat={lat:.4f}&lng={lng:.4f}&radius=10"
+            elif roll < 0.75:
+                path = f"/api/v1/users/lookup?email=user{user_id}@seed.test"
+            else:
+                path = f"/api/v1/history?userId={user_id}&limit=50"
+            started = time.perf_counter()
+            try:
+                status = session.get(base_url + path, timeout=30).status_code
+            except requests.RequestException:
+                status = 599
+            local.append((time.perf_counter() - started, 0, status))
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    result = summarize(samples, time.perf_counter() - started)
+    result.pop("queries_per_request", None)
+    return result
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--servers", default=",".join(SERVERS), help=f"Comma-separated subset of {SERVERS}.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent HTTP clients.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to drive each server.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() * 2 + 1, help="gunicorn workers.")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker.")
+    parser.add_argument("--streams", type=int, default=0,
+                        help="SSE streams held open on /donations/stream while driving load.")
+    parser.add_argument("--stream-pool", action="store_true",
+                        help="Open the streams against a separate GUNICORN_POOL=stream server.")
+    parser.add_argument("--users", type=int, default=SeedVolumes.users)
+    parser.add_argument("--donations", type=int, default=SeedVolumes.donations)
+    parser.add_argument("--holds", type=int, default=SeedVolumes.holds)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results JSON here.")
+    args = parser.parse_args(argv)
+
+    servers = [s for s in args.servers.split(",") if s]
+    if set(servers) - set(SERVERS):
+        parser.error(f"unknown servers: {sorted(set(servers) - set(SERVERS))}")
+
+    volumes = SeedVolumes(args.users, args.holds, args.donations)
+    tmpdir = tempfile.TemporaryDirectory()
+    db_path = os.path.join(tmpdir.name, "bench.db")
+    inventory_path = os.path.join(tmpdir.name, "inventory.json")
+    donations = synthetic_donations(volumes.donations, args.seed)
+    write_inventory_file(inventory_path, donations)
+    app = build_app(db_path, inventory_path)
+    with app.app_context():
+        seeded = seed_database(volumes, args.seed, [d["id"] for d in donations])
+    print(f"seeded {seeded}")
+
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "INVENTORY_BACKEND": "mock",
+        "INVENTORY_DONATIONS_FILE": inventory_path,
+        "HOLD_SWEEP_INTERVAL_SECONDS": "0",
+        "PYTHONPATH": str(BACKEND / "src"),
+        # Access logging would dominate a loopback benchmark
+        "GUNICORN_ACCESS_LOG": "",
+    }
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+    results = {}
+    for name in servers:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        log_path = os.path.join(tmpdir.name, f"{name}.log")
+        procs = [start_server(server_command(name, port, args.workers, args.threads), env, log_path)]
+        stream_url = base_url
+        try:
+            wait_until_up(base_url, procs[0])
+            if args.stream_pool:
+                stream_port = free_port()
+                stream_url = f"http://127.0.0.1:{stream_port}"
+                procs.append(start_server(
+                    server_command("gunicorn", stream_port), {**env, "GUNICORN_POOL": "stream"},
+                    os.path.join(tmpdir.name, f"{name}-stream.log"),
+                ))
+                wait_until_up(stream_url, procs[1])
+            streams = open_streams(stream_url, args.streams)
+            results[name] = drive(base_url, volumes, args.concurrency, args.duration, args.seed)
+            results[name]["streams_dropped"], results[name]["streams_refused"] = close_streams(streams)
+        except RuntimeError as exc:
+            raise SystemExit(f"{name}: {exc}\n{Path(log_path).read_text()[-2000:]}")
+        finally:
+            # The dev server's reloader runs the app in a child, so signal the
+            # whole group. SIGINT is gunicorn's quick shutdown; a graceful stop
+            # would wait out idle keep-alive connections.
+            for proc in procs:
+                _stop(proc)
+
+    header = (f"{'server':<12}{'req':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+              f"{'err':>6}{'dropped':>9}{'refused':>9}")
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<12}{r['requests']:>8}{r['rps']:>10}{r['p50_ms']:>10}"
+              f"{r['p95_ms']:>10}{r['p99_ms']:>10}{r['errors']:>6}{r['streams_dropped']:>9}"
+              f"{r['streams_refused']:>9}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "gunicorn_workers": args.workers,
+            "gunicorn_threads": args.threads,
+            "streams": args.streams,
+            "stream_pool": args.stream_pool,
+            "volumes": seeded,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"wrote {args.output}")
+    tmpdir.cleanup()
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Gunicorn configuration for ThePantry API.
+
+Run from the backend directory::
+
+    gunicorn -c gunicorn.conf.py
+
+Every setting can be overridden with an environment variable (see the
+README's "Production Server" section) or a command-line flag.
+
+- The app is preloaded: ``create_app`` runs once in the master and
+  workers are forked from it, so startup work (create_all, loading the
+  inventory file) is not repeated per worker.
+- Connections the master opened while loading the app are dropped in
+  each child after fork; sharing a socket between processes corrupts it.
+- Workers are recycled after a jittered number of requests so slow leaks
+  are bounded and workers don't all restart at once.
+- Workers are threaded (gthread) by default, so long-lived SSE streams
+  each occupy one thread rather than a whole worker, and a worker accepts
+  streams on at most half its threads so requests always have threads
+  left. ``GUNICORN_POOL=stream`` starts a separate pool sized for streams
+  instead; route ``/api/v1/donations/stream`` to it at the reverse proxy.
+"""
+import glob
+import multiprocessing
+import os
+
+pythonpath = "src"
+wsgi_app = "wsgi:app"
+
+# "api" serves every route; "stream" is a pool for SSE clients only
+pool = os.environ.get("GUNICORN_POOL", "api")
+stream_pool = pool == "stream"
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = int(os.environ.get("WEB_CONCURRENCY", 1 if stream_pool else multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 256 if stream_pool else 4))
+# An SSE client (/api/v1/donations/stream) holds its request open for as
+# long as it is connected. A gthread worker keeps serving on its other
+# threads meanwhile, and its timeout only watches the worker's heartbeat.
+# A sync worker would be blocked by one stream and killed after `timeout`.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+# Streams past this per worker get a 503 and retry. The API pool keeps half
+# its threads for requests; the stream pool keeps one for health checks
+stream_limit = os.environ.get(
+    "AVAILABILITY_STREAM_MAX_CONNECTIONS", str(max(threads - 1 if stream_pool else threads // 2, 1))
+)
+raw_env = [f"AVAILABILITY_STREAM_MAX_CONNECTIONS={stream_limit}"]
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Recycling a stream worker would drop all of its clients at once
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 0 if stream_pool else 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+# prometheus_client needs the directory as soon as the (preloaded) app is
+# imported, which happens before any server hook runs
+if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+def on_starting(server):
+    """Clear metric files left by a previous run of the server."""
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        # Also removes the master's own files; it never serves requests, and
+        # forked workers switch to files named after their own pid
+        for path in glob.glob(os.path.join(multiproc_dir, "*.db")):
+            os.remove(path)
+
+
+def post_fork(server, worker):
+    """Drop DB connections inherited from the master without closing them."""
+    from extensions import db
+    from wsgi import app
+
+    with app.app_context():
+        # Every bind, read replicas included. close=False: the parent still
+        # owns those sockets; just forget them
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    """Stop counting a dead worker's live gauges (in-flight requests)."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
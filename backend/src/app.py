@@ -3,46 +3,46 @@ Application Factory for ThePantry API
 
 - Creates the Flask app
 - Initializes extensions
-- Registers blueprints
+- Registers blueprints and CLI commands
 - Wires up service dependencies
 """
+from datetime import timedelta
 from typing import Type
 
 from flask import Flask
 from flask_cors import CORS
-from sqlalchemy import inspect, text
 
-from config import Config
+from cli import register_commands
+from config import Config, engine_options
+from db_routing import REPLICA_BIND_PREFIX, ReplicaRouter
+from db_utils import apply_sqlite_pragmas
 from extensions import db
+from instrumentation import ProfiledInventoryService, init_metrics, init_profiling
 from routes import donation_bp, user_bp, history_bp, hold_bp
+from services import AvailabilityBroker, CachingInventoryService, CoalescingInventoryService, HoldExpirySweeper
 from services import MockInventoryService
+from services import HttpInventoryService, InventoryRegion, InventoryService, InventoryServiceError
 from services import ReservationService
 
 
-def _ensure_hold_columns_for_sqlite() -> None:
-    """Backfill newly added Hold columns for existing SQLite databases."""
-    engine = db.engine
-    if engine.dialect.name != "sqlite":
-        return
+def _build_inventory_service(app: Flask) -> InventoryService:
+    """Create the InventoryService selected by INVENTORY_BACKEND."""
+    if app.config.get("INVENTORY_BACKEND", "mock") != "http":
+        if app.config.get("INVENTORY_DONATIONS_FILE"):
+            return MockInventoryService.from_file(app.config["INVENTORY_DONATIONS_FILE"])
+        return MockInventoryService()
 
-    inspector = inspect(engine)
-    table_names = inspector.get_table_names()
-    if "holds" not in table_names:
-        return
-
-    existing_columns = {column["name"] for column in inspector.get_columns("holds")}
-    statements = []
-
-    if "completed_at" not in existing_columns:
-        statements.append("ALTER TABLE holds ADD COLUMN completed_at DATETIME")
-    if "cancelled_at" not in existing_columns:
-        statements.append("ALTER TABLE holds ADD COLUMN cancelled_at DATETIME")
-
-    for statement in statements:
-        db.session.execute(text(statement))
+    regions = [InventoryRegion.from_dict(r) for r in app.config.get("INVENTORY_REGIONS") or []]
+    if not regions:
+        regions = [InventoryRegion("default", app.config["INVENTORY_API_URL"].rstrip("/"))]
+    return HttpInventoryService(
+        regions,
+        connect_timeout=app.config["INVENTORY_CONNECT_TIMEOUT_SECONDS"],
+        read_timeout=app.config["INVENTORY_READ_TIMEOUT_SECONDS"],
+        max_retries=app.config["INVENTORY_MAX_RETRIES"],
+        pool_size=app.config["INVENTORY_POOL_SIZE"],
+    )
 
-    if statements:
-        db.session.commit()
 
 def create_app(config_class: Type[Config] = Config) -> Flask:
     """
@@ -62,12 +62,62 @@ def create_app(config_class: Type[Config] = Config) -> Flask:
         app,
         resources={r"/api/*": {"origins": app.config.get("CORS_ORIGINS", "*")}},
     )
+    replica_urls = app.config.get("DATABASE_REPLICA_URLS") or []
+    if replica_urls:
+        binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+        for i, url in enumerate(replica_urls):
+            binds[f"{REPLICA_BIND_PREFIX}{i}"] = {"url": url, **engine_options(url)}
+        app.config["SQLALCHEMY_BINDS"] = binds
     db.init_app(app)
+    # Replicas get their schema through replication; keep them out of
+    # create_all/drop_all (the metadata registry is shared by all apps)
+    for key in list(db.metadatas):
+        if key and key.startswith(REPLICA_BIND_PREFIX):
+            del db.metadatas[key]
+    with app.app_context():
+        for engine in db.engines.values():
+            apply_sqlite_pragmas(engine, app.config.get("SQLITE_PRAGMAS", {}))
+    if replica_urls:
+        ReplicaRouter(app.config["REPLICA_READ_YOUR_WRITES_SECONDS"]).init_app(app)
     
     # Wire up service dependencies
-    inventory_service = MockInventoryService()
+    inventory_service = _build_inventory_service(app)
+    if app.config.get("INVENTORY_COALESCE_ENABLED"):
+        inventory_service = CoalescingInventoryService(inventory_service)
+    if app.config.get("INVENTORY_CACHE_ENABLED"):
+        inventory_service = CachingInventoryService(
+            inventory_service,
+            ttl_seconds=app.config["INVENTORY_CACHE_TTL_SECONDS"],
+            stale_seconds=app.config["INVENTORY_CACHE_STALE_SECONDS"],
+            max_entries=app.config["INVENTORY_CACHE_MAX_ENTRIES"],
+        )
+    if app.config.get("PROFILING_ENABLED"):
+        inventory_service = ProfiledInventoryService(inventory_service)
+        init_profiling(app)
     reservation_service = ReservationService(inventory_service)
     app.config["RESERVATION_SERVICE"] = reservation_service
+    if app.config.get("METRICS_ENABLED"):
+        init_metrics(app)
+
+    # Expire lapsed holds in the background so reads never write
+    sweep_interval = app.config.get("HOLD_SWEEP_INTERVAL_SECONDS", 0)
+    if sweep_interval > 0:
+        retention_hours = app.config.get("AVAILABILITY_CHANGE_RETENTION_HOURS", 0)
+        sweeper = HoldExpirySweeper(
+            app, sweep_interval,
+            timedelta(hours=retention_hours) if retention_hours > 0 else None,
+        )
+        app.extensions["hold_expiry_sweeper"] = sweeper
+        app.before_request(sweeper.ensure_started)
+
+    # Fan-out of availability changes to SSE streams; polls lazily
+    app.extensions["availability_broker"] = AvailabilityBroker(
+        app,
+        poll_interval_seconds=app.config["AVAILABILITY_STREAM_POLL_SECONDS"],
+        buffer_size=app.config["AVAILABILITY_STREAM_BUFFER"],
+        max_streams=app.config["AVAILABILITY_STREAM_MAX_CONNECTIONS"],
+        gap_timeout_seconds=app.config["AVAILABILITY_STREAM_GAP_SECONDS"],
+    )
     
     # Register route blueprints
     app.register_blueprint(donation_bp)
@@ -75,18 +125,24 @@ def create_app(config_class: Type[Config] = Config) -> Flask:
     app.register_blueprint(history_bp)
     app.register_blueprint(hold_bp)
     
+    @app.errorhandler(InventoryServiceError)
+    def inventory_unavailable(error):
+        return {"error": "Donation inventory is unavailable"}, 503
+
     # Health check endpoint
     @app.route('/api/v1/health', methods=['GET'])
     def health():
         return {"status": "ok"}
     
-    # Create database tables
+    register_commands(app)
+
+    # Create missing tables. Schema changes to existing databases are
+    # applied separately with `flask --app src/app.py migrate`.
     with app.app_context():
         db.create_all()
-        _ensure_hold_columns_for_sqlite()
     
     return app
 
 if __name__ == '__main__':
     app = create_app()
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    app.run(debug=True, port=5000)
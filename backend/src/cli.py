@@ -0,0 +1,197 @@
+"""
+Flask CLI commands for operating ThePantry backend.
+
+Run from the backend directory, e.g.::
+
+    flask --app src/app.py migrate
+"""
+import click
+from flask import Flask, current_app
+
+from extensions import db
+
+
+def register_commands(app: Flask) -> None:
+    """Attach the backend's management commands to the app's CLI."""
+    app.cli.add_command(migrate_command)
+    app.cli.add_command(sweep_holds_command)
+    app.cli.add_command(archive_holds_command)
+    app.cli.add_command(export_history_command)
+    app.cli.add_command(rebuild_pickup_stats_command)
+    app.cli.add_command(serve_fake_inventory_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(sync_replica_command)
+
+
+@click.command("migrate")
+@click.option("--status", is_flag=True, help="List pending migrations without applying them.")
+def migrate_command(status: bool) -> None:
+    """Apply pending schema migrations to the configured database."""
+    from migrations import pending_migrations, run_migrations
+
+    if status:
+        pending = pending_migrations(db.engine)
+        if not pending:
+            click.echo("Database is up to date.")
+        for migration in pending:
+            click.echo(f"pending  {migration.version:04d}  {migration.description}")
+        return
+
+    applied = run_migrations(db.engine)
+    if not applied:
+        click.echo("Database is up to date.")
+    for migration in applied:
+        click.echo(f"applied  {migration.version:04d}  {migration.description}")
+
+
+@click.command("sweep-holds")
+@click.option("--interval", type=float, default=60.0, show_default=True,
+              help="Seconds between sweeps.")
+@click.option("--once", is_flag=True, help="Run a single sweep and exit.")
+def sweep_holds_command(interval: float, once: bool) -> None:
+    """Expire lapsed holds and prune old availability changes, once or on a fixed interval."""
+    from datetime import timedelta
+
+    from services import HoldExpirySweeper
+
+    retention_hours = current_app.config.get("AVAILABILITY_CHANGE_RETENTION_HOURS", 0)
+    sweeper = HoldExpirySweeper(
+        current_app._get_current_object(), interval,
+        timedelta(hours=retention_hours) if retention_hours > 0 else None,
+    )
+    if once:
+        result = sweeper.sweep()
+        click.echo(
+            f"expired {result.expired} holds, pruned {result.pruned} availability changes "
+            f"in {result.duration_ms:.1f} ms"
+        )
+        return
+    click.echo(f"Sweeping expired holds every {interval:g}s (Ctrl+C to stop)")
+    sweeper.run_forever()
+
+
+@click.command("archive-holds")
+@click.option("--older-than-days", type=float, default=None,
+              help="Archive holds finished this many days ago [default: HOLD_ARCHIVE_AFTER_DAYS].")
+@click.option("--batch-size", type=click.IntRange(min=1), default=None,
+              help="Holds moved per transaction [default: HOLD_ARCHIVE_BATCH_SIZE].")
+@click.option("--throttle", type=float, default=None,
+              help="Seconds to pause between batches [default: HOLD_ARCHIVE_THROTTLE_SECONDS].")
+@click.option("--max-batches", type=click.IntRange(min=1), default=None,
+              help="Stop after this many batches (default: until drained).")
+def archive_holds_command(older_than_days, batch_size, throttle, max_batches) -> None:
+    """Move long-finished holds into holds_archive in throttled batches."""
+    from datetime import timedelta
+
+    from services import HoldArchiver
+
+    config = current_app.config
+    archiver = HoldArchiver(
+        current_app._get_current_object(),
+        timedelta(days=config["HOLD_ARCHIVE_AFTER_DAYS"] if older_than_days is None else older_than_days),
+        config["HOLD_ARCHIVE_BATCH_SIZE"] if batch_size is None else batch_size,
+        config["HOLD_ARCHIVE_THROTTLE_SECONDS"] if throttle is None else throttle,
+    )
+    result = archiver.run(max_batches)
+    click.echo(f"archived {result.archived} holds in {result.batches} batches "
+               f"({result.duration_ms:.1f} ms)")
+
+
+@click.command("export-history")
+@click.option("--format", "fmt", type=click.Choice(["ndjson", "csv"]), default="ndjson",
+              show_default=True, help="Output format.")
+@click.option("--output", type=click.File("w"), default="-",
+              help="File to write to. Defaults to stdout.")
+@click.option("--user-id", type=int, default=None, help="Only this user's pickups.")
+@click.option("--from", "start", type=click.DateTime(), default=None,
+              help="Inclusive lower bound on completed_at.")
+@click.option("--to", "end", type=click.DateTime(), default=None,
+              help="Exclusive upper bound on completed_at.")
+def export_history_command(fmt, output, user_id, start, end) -> None:
+    """Stream pickup history to a file as NDJSON or CSV."""
+    from services.history_export import EXPORT_FORMATS
+    from services.history_service import HistoryService
+
+    _, serialize = EXPORT_FORMATS[fmt]
+    records = HistoryService.iter_history(user_id=user_id, start=start, end=end)
+    for chunk in serialize(records):
+        output.write(chunk)
+
+
+@click.command("rebuild-pickup-stats")
+def rebuild_pickup_stats_command() -> None:
+    """Recompute the pickup stats rollups from pickup_history."""
+    from services.pickup_stats_service import PickupStatsService
+
+    written = PickupStatsService.rebuild()
+    click.echo(", ".join(f"{n} rows in {table}" for table, n in written.items()))
+
+
+@click.command("serve-fake-inventory")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to bind.")
+@click.option("--port", type=int, default=5050, show_default=True, help="Port to bind.")
+@click.option("--latency-ms", type=float, default=0.0, show_default=True,
+              help="Delay added to every response.")
+@click.option("--failure-rate", type=float, default=0.0, show_default=True,
+              help="Fraction of requests answered with 503.")
+def serve_fake_inventory_command(host, port, latency_ms, failure_rate) -> None:
+    """Run a local stand-in for the external inventory API."""
+    from fake_inventory_server import FakeInventoryServer
+
+    server = FakeInventoryServer(
+        latency_seconds=latency_ms / 1000, failure_rate=failure_rate, host=host, port=port
+    )
+    click.echo(f"Fake inventory listening on {server.url} (Ctrl+C to stop)")
+    server.serve_forever()
+
+
+@click.command("seed")
+@click.option("--users", type=int, default=1000, show_default=True, help="Users to insert.")
+@click.option("--holds", type=int, default=50000, show_default=True,
+              help="Holds to insert (completed ones also get pickup records).")
+@click.option("--donations", type=int, default=5000, show_default=True,
+              help="Synthetic inventory size.")
+@click.option("--seed", "seed", type=int, default=0, show_default=True, help="Random seed.")
+@click.option("--inventory-file", type=click.Path(dir_okay=False), default=None,
+              help="Write the synthetic inventory here (serve it via INVENTORY_DONATIONS_FILE).")
+def seed_command(users, holds, donations, seed, inventory_file) -> None:
+    """Bulk-insert deterministic synthetic users, holds, history and inventory."""
+    import time
+
+    from seed_data import SeedVolumes, seed_database, synthetic_donations, write_inventory_file
+
+    started = time.perf_counter()
+    inventory = synthetic_donations(donations, seed)
+    if inventory_file:
+        write_inventory_file(inventory_file, inventory)
+        click.echo(f"wrote {len(inventory)} donations to {inventory_file}")
+
+    counts = seed_database(SeedVolumes(users, holds, donations), seed, [d["id"] for d in inventory])
+    summary = ", ".join(f"{n} {table}" for table, n in counts.items())
+    click.echo(f"inserted {summary} in {time.perf_counter() - started:.1f}s")
+
+
+@click.command("sync-replica")
+@click.option("--interval", type=float, default=0, show_default=True,
+              help="Seconds between syncs; 0 syncs once and exits.")
+def sync_replica_command(interval: float) -> None:
+    """Copy the SQLite primary onto every SQLite replica bind (local testing)."""
+    import time
+
+    from db_routing import REPLICA_BIND_PREFIX, sync_sqlite_replica
+
+    primary = db.engine.url
+    replicas = [
+        engine.url for key, engine in db.engines.items()
+        if key and key.startswith(REPLICA_BIND_PREFIX)
+    ]
+    if primary.get_backend_name() != "sqlite" or not replicas:
+        raise click.ClickException("needs a SQLite primary and DATABASE_REPLICA_URLS pointing at SQLite files")
+    while True:
+        started = time.perf_counter()
+        for url in replicas:
+            sync_sqlite_replica(primary.database, url.database)
+        click.echo(f"synced {len(replicas)} replica(s) in {(time.perf_counter() - started) * 1000:.0f} ms")
+        if interval <= 0:
+            return
+        time.sleep(interval)
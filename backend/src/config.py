@@ -3,8 +3,40 @@ Application Configuration
 
 Centralizes all configuration settings.
 """
+import json
 import os
 
+
+def engine_options(database_uri: str) -> dict:
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS suited to the database in ``database_uri``.
+
+    Server databases (MySQL, PostgreSQL) get a sized pool with pre-ping and
+    recycling, so connections dropped by the server or a proxy are replaced
+    instead of failing a request. SQLite files get a sized pool only.
+    In-memory SQLite keeps SQLAlchemy's single-connection pool, which
+    accepts none of these options.
+
+    Args:
+        database_uri: SQLAlchemy database URL.
+
+    Returns:
+        Keyword arguments for ``create_engine``.
+    """
+    if database_uri.startswith("sqlite") and (":memory:" in database_uri or database_uri == "sqlite://"):
+        return {}
+    options = {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 20)),
+        "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT_SECONDS", 30)),
+    }
+    if not database_uri.startswith("sqlite"):
+        options["pool_pre_ping"] = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+        # Below MySQL's default wait_timeout (8h) and typical proxy idle limits
+        options["pool_recycle"] = int(os.environ.get("DB_POOL_RECYCLE_SECONDS", 1800))
+    return options
+
+
 class Config:
     """
     Base Configuration
@@ -14,10 +46,77 @@ class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret-key")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", "sqlite:///the_pantry.db")
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    # Comma-separated read replica URLs; read-only service calls use them
+    DATABASE_REPLICA_URLS = [u for u in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if u]
+    # After a user's hold/pickup write, their reads stay on the primary this long
+    REPLICA_READ_YOUR_WRITES_SECONDS = float(os.environ.get("REPLICA_READ_YOUR_WRITES_SECONDS", 5))
+    # PRAGMAs run on every new SQLite connection (ignored for other databases).
+    # WAL lets readers proceed while a write commits; NORMAL sync is durable
+    # under WAL except for the last commits before a power loss.
+    SQLITE_PRAGMAS = {
+        "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE_BYTES", 256 * 1024 * 1024)),
+        # Negative means KiB rather than pages: 64 MiB per connection
+        "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", -64000)),
+    }
     CORS_ORIGINS = [
         "http://localhost:5173",
         "http://127.0.0.1:5173",
     ]
+    # Seconds between in-app hold expiry sweeps; 0 disables the background
+    # sweeper (e.g. when running `flask sweep-holds` as a separate worker)
+    HOLD_SWEEP_INTERVAL_SECONDS = float(os.environ.get("HOLD_SWEEP_INTERVAL_SECONDS", 60))
+    # Each sweep also deletes availability changes older than this; 0 keeps
+    # them forever
+    AVAILABILITY_CHANGE_RETENTION_HOURS = float(os.environ.get("AVAILABILITY_CHANGE_RETENTION_HOURS", 24))
+    # `flask archive-holds`: holds finished more than this many days ago move
+    # to holds_archive, BATCH_SIZE per transaction with THROTTLE between
+    # batches so archiving never holds locks for long
+    HOLD_ARCHIVE_AFTER_DAYS = float(os.environ.get("HOLD_ARCHIVE_AFTER_DAYS", 30))
+    HOLD_ARCHIVE_BATCH_SIZE = int(os.environ.get("HOLD_ARCHIVE_BATCH_SIZE", 500))
+    HOLD_ARCHIVE_THROTTLE_SECONDS = float(os.environ.get("HOLD_ARCHIVE_THROTTLE_SECONDS", 0.1))
+    # Inventory adapter: "mock" (built-in samples) or "http" (external API)
+    INVENTORY_BACKEND = os.environ.get("INVENTORY_BACKEND", "mock")
+    # JSON file of donations served by the mock adapter (see `flask seed`);
+    # empty serves the built-in samples
+    INVENTORY_DONATIONS_FILE = os.environ.get("INVENTORY_DONATIONS_FILE", "")
+    # Single-region API root, used when INVENTORY_REGIONS is empty
+    INVENTORY_API_URL = os.environ.get("INVENTORY_API_URL", "http://127.0.0.1:5050")
+    # JSON list of {"name", "url", "bounds": [min_lat, min_lng, max_lat, max_lng]}
+    INVENTORY_REGIONS = json.loads(os.environ.get("INVENTORY_REGIONS", "[]"))
+    INVENTORY_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("INVENTORY_CONNECT_TIMEOUT_SECONDS", 2))
+    INVENTORY_READ_TIMEOUT_SECONDS = float(os.environ.get("INVENTORY_READ_TIMEOUT_SECONDS", 5))
+    INVENTORY_MAX_RETRIES = int(os.environ.get("INVENTORY_MAX_RETRIES", 2))
+    INVENTORY_POOL_SIZE = int(os.environ.get("INVENTORY_POOL_SIZE", 20))
+    # Collapse concurrent identical inventory calls into one (independent of the cache)
+    INVENTORY_COALESCE_ENABLED = os.environ.get("INVENTORY_COALESCE_ENABLED", "true").lower() == "true"
+    # In-process cache in front of the InventoryService
+    INVENTORY_CACHE_ENABLED = os.environ.get("INVENTORY_CACHE_ENABLED", "true").lower() == "true"
+    INVENTORY_CACHE_TTL_SECONDS = float(os.environ.get("INVENTORY_CACHE_TTL_SECONDS", 30))
+    INVENTORY_CACHE_STALE_SECONDS = float(os.environ.get("INVENTORY_CACHE_STALE_SECONDS", 120))
+    INVENTORY_CACHE_MAX_ENTRIES = int(os.environ.get("INVENTORY_CACHE_MAX_ENTRIES", 1024))
+    # Per-request profiling: Server-Timing header + structured log line
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "false").lower() == "true"
+    # Fraction of requests run under cProfile; dumps kept only above the threshold
+    PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+    PROFILE_THRESHOLD_MS = float(os.environ.get("PROFILE_THRESHOLD_MS", 500))
+    PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+    # Prometheus metrics at /api/v1/metrics. Under gunicorn also set
+    # PROMETHEUS_MULTIPROC_DIR so every worker's samples are aggregated
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+    # Server-Sent Events stream of availability changes
+    AVAILABILITY_STREAM_POLL_SECONDS = float(os.environ.get("AVAILABILITY_STREAM_POLL_SECONDS", 1))
+    AVAILABILITY_STREAM_HEARTBEAT_SECONDS = float(os.environ.get("AVAILABILITY_STREAM_HEARTBEAT_SECONDS", 15))
+    AVAILABILITY_STREAM_BUFFER = int(os.environ.get("AVAILABILITY_STREAM_BUFFER", 1024))
+    # Streams one process serves at once before answering 503; 0 = no limit.
+    # gunicorn.conf.py sets it from the worker's thread count
+    AVAILABILITY_STREAM_MAX_CONNECTIONS = int(os.environ.get("AVAILABILITY_STREAM_MAX_CONNECTIONS", 0))
+    # Seconds a missing change ID (an uncommitted or rolled-back transaction)
+    # holds back newer changes before the broker skips it
+    AVAILABILITY_STREAM_GAP_SECONDS = float(os.environ.get("AVAILABILITY_STREAM_GAP_SECONDS", 3))
     
     
 class TestConfig(Config):
@@ -27,4 +126,6 @@ class TestConfig(Config):
     Uses in-memory SQLite
     """
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
\ No newline at end of file
+    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    HOLD_SWEEP_INTERVAL_SECONDS = 0
\ No newline at end of file
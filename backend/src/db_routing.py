@@ -0,0 +1,207 @@
+"""
+Read-Replica Routing
+
+Sends SELECTs issued inside ``read_replica()`` to a replica engine and
+everything else to the primary. Replicas are ordinary Flask-SQLAlchemy
+binds named ``replica_<n>`` (see Config.DATABASE_REPLICA_URLS).
+
+Replicas lag the primary, so a user who just placed, cancelled or picked
+up a hold is pinned to the primary for REPLICA_READ_YOUR_WRITES_SECONDS.
+The pin is kept per user ID in the process and, for browsers spread
+across several workers, in a cookie holding the pin's expiry time.
+"""
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+
+REPLICA_BIND_PREFIX = "replica_"
+PRIMARY_COOKIE = "pantry_primary_until"
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+class RoutingSession(Session):
+    """
+    Session that runs read-only SELECTs on a replica when asked to.
+
+    A session sticks to one replica for its lifetime (one request), so a
+    request never sees two replicas at different positions. Once it has
+    written in the current transaction, every statement goes to the
+    primary until the transaction ends.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and _replica_reads.get()
+            and isinstance(clause, Select)
+            and not self._flushing
+            and not self.info.get("wrote")
+        ):
+            replica = self._replica_engine()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_engine(self) -> Engine | None:
+        key = self.info.get("replica_key")
+        engines = self._db.engines
+        if key is None:
+            keys = [k for k in engines if k and k.startswith(REPLICA_BIND_PREFIX)]
+            if not keys:
+                return None
+            key = self.info["replica_key"] = random.choice(keys)
+        return engines[key]
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _clear_write_mark(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop("wrote", None)
+
+
+class ReplicaRouter:
+    """
+    Decides whether a read may use a replica.
+
+    Args:
+        window_seconds: How long a user's reads stay on the primary after
+            one of their writes.
+        clock: Wall-clock time source; wall time (not monotonic) so the
+            cookie means the same thing in every worker.
+    """
+
+    def __init__(self, window_seconds: float, clock=time.time) -> None:
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._pinned: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def note_write(self, user_id: int | None) -> None:
+        """Pin ``user_id`` (and the current client, via cookie) to the primary."""
+        until = self._clock() + self.window_seconds
+        if user_id is not None:
+            with self._lock:
+                self._pinned[user_id] = until
+                if len(self._pinned) > 10_000:
+                    now = self._clock()
+                    self._pinned = {u: t for u, t in self._pinned.items() if t > now}
+        if has_request_context():
+            g.primary_until = until
+
+    def must_use_primary(self, user_id: int | None = None) -> bool:
+        """True if ``user_id`` or the current client wrote within the window."""
+        now = self._clock()
+        if user_id is not None and self._pinned.get(user_id, 0) > now:
+            return True
+        if has_request_context():
+            try:
+                return float(request.cookies.get(PRIMARY_COOKIE, 0)) > now
+            except ValueError:
+                return False
+        return False
+
+    def init_app(self, app: Flask) -> None:
+        """Register the router, pin users on hold writes and set the pin cookie."""
+        # Imported here: services import the models, which import this module
+        from services.hold_events import hold_cancelled, hold_completed, hold_created
+
+        app.extensions["replica_router"] = self
+        for signal in (hold_created, hold_cancelled, hold_completed):
+            signal.connect(_on_hold_write)
+
+        @app.after_request
+        def set_primary_cookie(response: Response) -> Response:
+            for hold in g.pop("replica_written_holds", ()):
+                self.note_write(hold.user_id)
+            until = g.pop("primary_until", None)
+            if until is not None:
+                response.set_cookie(
+                    PRIMARY_COOKIE, f"{until:.3f}",
+                    max_age=max(1, int(self.window_seconds) + 1), httponly=True, samesite="Lax",
+                )
+            return response
+
+
+@contextmanager
+def read_replica(user_id: int | None = None) -> Iterator[None]:
+    """
+    Let SELECTs inside the block run on a replica.
+
+    Falls through to the primary when no replica is configured or when
+    ``user_id`` (or the requesting client) wrote recently.
+
+    Args:
+        user_id: User whose data is being read, for read-your-writes.
+    """
+    router = current_app.extensions.get("replica_router")
+    if router is None or router.must_use_primary(user_id):
+        yield
+        return
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def note_write(user_id: int | None) -> None:
+    """Record that ``user_id`` just wrote, if replica routing is enabled."""
+    router = current_app.extensions.get("replica_router")
+    if router is not None:
+        router.note_write(user_id)
+
+
+def _on_hold_write(sender, hold, **kwargs) -> None:
+    router = current_app.extensions.get("replica_router")
+    if router is None:
+        return
+    if has_request_context():
+        # The commit expired ``hold``; by after_request the route has
+        # usually reloaded it, so reading user_id there costs no query
+        g.setdefault("replica_written_holds", []).append(hold)
+    else:
+        router.note_write(hold.user_id)
+
+
+def sync_sqlite_replica(primary_path: str, replica_path: str) -> None:
+    """
+    Copy a SQLite database onto a replica file, consistently.
+
+    Uses SQLite's online backup API: the primary stays writable while it
+    runs, and connections already open on the replica see the new snapshot
+    on their next query. Meant for local testing; production replicas use
+    the database's own replication.
+
+    Args:
+        primary_path: Path of the primary database file.
+        replica_path: Path of the replica file to overwrite.
+    """
+    source = sqlite3.connect(primary_path)
+    target = sqlite3.connect(replica_path, timeout=30)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
@@ -0,0 +1,134 @@
+"""
+Dialect-aware SQL helpers.
+
+Small wrappers for statements whose syntax differs between SQLite and
+MySQL, so services can rely on database guarantees without branching
+on the dialect themselves.
+"""
+from collections.abc import Iterable
+
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: dict) -> None:
+    """
+    Run ``PRAGMA name = value`` for each entry on every new SQLite connection.
+
+    Does nothing for other dialects. Must be called before the engine
+    opens its first connection, or that connection keeps the defaults.
+
+    Args:
+        engine: Engine to configure.
+        pragmas: PRAGMA names mapped to values, e.g. {"journal_mode": "WAL"}.
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+def insert_ignore(model: type[db.Model], values: dict) -> bool:
+    """
+    INSERT a row unless it collides with an existing primary/unique key.
+
+    Runs inside the caller's transaction and never raises on a key
+    conflict, so the caller can keep using the transaction afterwards.
+
+    Args:
+        model: Mapped model class whose table receives the row.
+        values: Column values for the new row.
+
+    Returns:
+        True if the row was inserted, False if it already existed.
+    """
+    dialect = db.session.get_bind(mapper=model).dialect.name
+
+    if dialect == "sqlite":
+        stmt = sqlite.insert(model).values(**values).on_conflict_do_nothing()
+    elif dialect == "postgresql":
+        stmt = postgresql.insert(model).values(**values).on_conflict_do_nothing()
+    elif dialect in ("mysql", "mariadb"):
+        stmt = mysql.insert(model).values(**values).prefix_with("IGNORE")
+    else:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(model).values(**values))
+        except IntegrityError:
+            return False
+        return True
+
+    return db.session.execute(stmt).rowcount == 1
+
+
+def upsert_add(model: type[db.Model], rows: list[dict], column: str) -> None:
+    """
+    Insert rows, or add their ``column`` value to rows whose key already exists.
+
+    One multi-row statement on SQLite, PostgreSQL and MySQL, so incrementing
+    N counters costs a single round trip. Runs inside the caller's
+    transaction.
+
+    Args:
+        model: Mapped model class; its primary key identifies the counter.
+        rows: Column values for each counter, including ``column``.
+        column: Numeric column to increment.
+    """
+    if not rows:
+        return
+    dialect = db.session.get_bind(mapper=model).dialect.name
+    target = getattr(model, column)
+    key_columns = [c.name for c in inspect(model).primary_key]
+
+    if dialect in ("sqlite", "postgresql"):
+        module = sqlite if dialect == "sqlite" else postgresql
+        stmt = module.insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns, set_={column: target + stmt.excluded[column]}
+        )
+    elif dialect in ("mysql", "mariadb"):
+        stmt = mysql.insert(model).values(rows)
+        stmt = stmt.on_duplicate_key_update({column: target + stmt.inserted[column]})
+    else:
+        for row in rows:
+            bump = (
+                update(model)
+                .filter_by(**{k: row[k] for k in key_columns})
+                .values({column: target + row[column]})
+            )
+            # Another transaction may insert the key between our UPDATE and INSERT
+            if not db.session.execute(bump).rowcount and not insert_ignore(model, row):
+                db.session.execute(bump)
+        return
+    db.session.execute(stmt)
+
+
+def reload_all(instances: Iterable[db.Model]) -> None:
+    """
+    Reload expired instances of one model with a single SELECT.
+
+    After a commit every instance is expired, and serializing N of them
+    would otherwise issue N primary-key lookups. Loading their rows in one
+    query repopulates the instances already in the identity map.
+
+    Args:
+        instances: Persistent instances of the same mapped class.
+    """
+    instances = [obj for obj in instances if obj is not None]
+    if not instances:
+        return
+    mapper = inspect(type(instances[0]))
+    pk = mapper.primary_key[0]
+    ids = [inspect(obj).identity[0] for obj in instances]
+    db.session.execute(select(mapper).where(pk.in_(ids))).scalars().all()
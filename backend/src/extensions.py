@@ -6,4 +6,7 @@ This avoids circular imports between app.py and model files.
 """
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
\ No newline at end of file
+from db_routing import RoutingSession
+
+# RoutingSession sends reads inside read_replica() to a replica bind, if any
+db = SQLAlchemy(session_options={"class_": RoutingSession})
\ No newline at end of file
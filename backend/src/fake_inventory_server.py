@@ -0,0 +1,162 @@
+"""
+Fake Donation Inventory Server
+
+Local stand-in for the external inventory API, serving the same endpoints
+HttpInventoryService calls. Backed by a MockInventoryService, with optional
+injected latency and failures, so the HTTP adapter can be tested and
+benchmarked offline::
+
+    flask --app src/app.py serve-fake-inventory --port 5050 --latency-ms 20
+
+Built on ``http.server`` rather than the Werkzeug dev server because the
+latter closes every connection, which would hide the effect of pooling.
+"""
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from services.inventory_service import MockInventoryService
+
+
+def to_external(donation: dict) -> dict:
+    """Translate an internal Donation dict into the external snake_case record."""
+    return {
+        "id": donation["id"],
+        "description": donation.get("description"),
+        "donation_type": donation.get("donationType"),
+        "quantity": donation.get("quantity"),
+        "donor_name": donation.get("donorName"),
+        "donor_contact": donation.get("donorContact"),
+        "lat": donation["lat"],
+        "lng": donation["lng"],
+        "address": donation.get("address"),
+        "expires_at": donation.get("expiresAt"),
+    }
+
+
+class _InventoryHandler(BaseHTTPRequestHandler):
+    """Serves ``GET /donations`` and ``GET /donations/<id>`` with keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    server: "FakeInventoryServer"
+
+    def do_GET(self) -> None:
+        server = self.server
+        with server.lock:
+            server.stats["requests"] += 1
+            server.stats["connections"].add(self.client_address)
+            failing = (
+                server.stats["requests"] <= server.fail_first
+                or random.random() < server.failure_rate
+            )
+            if failing:
+                server.stats["failures"] += 1
+        if server.latency_seconds:
+            time.sleep(server.latency_seconds)
+        if failing:
+            return self._send(503, {"error": "unavailable"})
+
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        inventory = server.inventory
+        if url.path == "/donations":
+            if "ids" in query:
+                found = inventory.get_donations_by_ids(query["ids"].split(","))
+                return self._send(200, [to_external(d) for d in found.values()])
+            lat, lng = query.get("lat"), query.get("lng")
+            donations = inventory.get_available_donations(
+                float(lat) if lat is not None else None,
+                float(lng) if lng is not None else None,
+                float(query.get("radius", 50)),
+            )
+            return self._send(200, [to_external(d) for d in donations])
+        if url.path.startswith("/donations/"):
+            donation = inventory.get_donation_by_id(unquote(url.path[len("/donations/"):]))
+            if donation is None:
+                return self._send(404, {"error": "not found"})
+            return self._send(200, to_external(donation))
+        self._send(404, {"error": "not found"})
+
+    def _send(self, status: int, body) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class FakeInventoryServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP/1.1 server emulating the external inventory API.
+
+    Attributes:
+        url (str): Base URL of the server.
+        inventory (MockInventoryService): Donations being served.
+        latency_seconds (float): Delay added to every response.
+        failure_rate (float): Probability (0..1) of answering 503.
+        fail_first (int): Number of initial requests answered with 503.
+        stats (dict): Counters: requests, failures and the set of client
+            addresses seen (one per TCP connection).
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        inventory: MockInventoryService | None = None,
+        latency_seconds: float = 0.0,
+        failure_rate: float = 0.0,
+        fail_first: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        Args:
+            inventory: Donations to serve. Defaults to the built-in samples.
+            latency_seconds: Delay added to every response.
+            failure_rate: Probability (0..1) of answering 503 to a request.
+            fail_first: Number of initial requests answered with 503.
+            host: Interface to bind.
+            port: Port to bind; 0 picks a free one.
+        """
+        super().__init__((host, port), _InventoryHandler)
+        self.inventory = inventory or MockInventoryService()
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self.fail_first = fail_first
+        self.url = f"http://{host}:{self.server_port}"
+        self.stats = {"requests": 0, "failures": 0, "connections": set()}
+        self.lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def handle_error(self, request, client_address) -> None:
+        """Ignore clients that hung up (e.g. after a read timeout)."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def __enter__(self) -> "FakeInventoryServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Serve on a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, name="fake-inventory", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,15 @@
+from .query_counter import QueryCount, count_queries, statement_shape
+from .metrics import init_metrics, render_metrics
+from .profiling import ProfiledInventoryService, RequestProfile, current_profile, init_profiling
+
+__all__ = [
+    "QueryCount",
+    "count_queries",
+    "statement_shape",
+    "init_metrics",
+    "render_metrics",
+    "ProfiledInventoryService",
+    "RequestProfile",
+    "current_profile",
+    "init_profiling",
+]
@@ -0,0 +1,226 @@
+"""
+Prometheus Metrics
+
+Request latency histograms, in-flight requests, DB pool checkout wait,
+inventory cache lookups and hold lifecycle counters, exposed in the
+Prometheus text format at ``GET /api/v1/metrics``.
+
+Metrics are module-level prometheus_client objects; updating one is a
+local increment, so the request path never takes a shared lock or does
+I/O for metrics. Hold counters are fed by the signals in
+``services.hold_events``.
+
+Under gunicorn, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty directory
+shared by all workers (before the app is imported). Each worker then
+writes its samples to mmapped files there and a scrape of any worker
+returns the sum over all of them.
+"""
+import os
+import threading
+import time
+
+from flask import Flask, Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from extensions import db
+from services.caching_inventory_service import CachingInventoryService
+from services.hold_events import (
+    hold_cancelled, hold_completed, hold_conflicted, hold_created, holds_expired,
+)
+from services.hold_service import HoldService
+
+REQUEST_LATENCY = Histogram(
+    "pantry_http_request_duration_seconds",
+    "Time spent handling a request, by route template.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    "pantry_http_requests",
+    "Requests handled, by route template and status code.",
+    ["method", "route", "status"],
+)
+IN_FLIGHT = Gauge(
+    "pantry_http_requests_in_flight",
+    "Requests currently being handled.",
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "pantry_db_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5),
+)
+CACHE_LOOKUPS = Counter(
+    "pantry_inventory_cache_lookups",
+    "Inventory cache lookups by result (hit, stale, miss, coalesced).",
+    ["result"],
+)
+HOLDS_CREATED = Counter("pantry_holds_created", "Holds placed.")
+HOLDS_CONFLICTED = Counter(
+    "pantry_holds_conflicted", "Hold requests rejected because the donation was taken."
+)
+HOLDS_EXPIRED = Counter("pantry_holds_expired", "Holds that lapsed and were expired.")
+HOLDS_COMPLETED = Counter("pantry_holds_completed", "Holds picked up.")
+HOLDS_CANCELLED = Counter("pantry_holds_cancelled", "Holds cancelled by their owner.")
+ACTIVE_HOLDS = Gauge(
+    "pantry_holds_active",
+    "Live holds, counted from the database at scrape time.",
+    multiprocess_mode="mostrecent",
+)
+
+# stats() keys of CachingInventoryService -> CACHE_LOOKUPS result label
+_CACHE_RESULTS = {"hits": "hit", "stale_hits": "stale", "misses": "miss", "coalesced": "coalesced"}
+# Minimum seconds between copies of the cache counters into CACHE_LOOKUPS
+_CACHE_SYNC_SECONDS = 1.0
+
+
+def _on_hold_created(sender, hold, **kwargs) -> None:
+    HOLDS_CREATED.inc()
+
+
+def _on_hold_conflicted(sender, donation_id, **kwargs) -> None:
+    HOLDS_CONFLICTED.inc()
+
+
+def _on_holds_expired(sender, count, **kwargs) -> None:
+    HOLDS_EXPIRED.inc(count)
+
+
+def _on_hold_completed(sender, hold, **kwargs) -> None:
+    HOLDS_COMPLETED.inc()
+
+
+def _on_hold_cancelled(sender, hold, **kwargs) -> None:
+    HOLDS_CANCELLED.inc()
+
+
+class _CacheStatsSync:
+    """
+    Copies a cache's cumulative stats() into CACHE_LOOKUPS as deltas.
+
+    The cache keeps its own counters under its lock; reading them on every
+    request would contend with lookups, so this runs at most once per
+    _CACHE_SYNC_SECONDS and otherwise returns after one clock read.
+    """
+
+    def __init__(self, cache: CachingInventoryService) -> None:
+        self._cache = cache
+        self._seen = dict.fromkeys(_CACHE_RESULTS, 0)
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now < self._next_sync:
+            return
+        if not self._lock.acquire(blocking=force):
+            return
+        try:
+            self._next_sync = now + _CACHE_SYNC_SECONDS
+            stats = self._cache.stats()
+            for key, result in _CACHE_RESULTS.items():
+                delta = stats.get(key, 0) - self._seen[key]
+                if delta > 0:
+                    CACHE_LOOKUPS.labels(result=result).inc(delta)
+                    self._seen[key] += delta
+        finally:
+            self._lock.release()
+
+
+def _instrument_pool(engine: Engine) -> None:
+    """Time every connection checkout from ``engine``'s current pool."""
+    pool = engine.pool
+    if getattr(pool, "_pantry_timed", False):
+        return
+    checkout = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return checkout()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+    pool._pantry_timed = True
+
+
+def _find_cache(inventory_service) -> CachingInventoryService | None:
+    """Return the CachingInventoryService in a decorator chain, if any."""
+    while inventory_service is not None:
+        if isinstance(inventory_service, CachingInventoryService):
+            return inventory_service
+        inventory_service = getattr(inventory_service, "inner", None)
+    return None
+
+
+def render_metrics() -> Response:
+    """
+    Render every metric in the Prometheus text format.
+
+    With PROMETHEUS_MULTIPROC_DIR set, the samples of all worker processes
+    are aggregated; otherwise only this process's registry is rendered.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app: Flask) -> None:
+    """
+    Register the metrics hooks and the ``/api/v1/metrics`` endpoint on ``app``.
+
+    Must be called after RESERVATION_SERVICE is configured so the
+    inventory cache (if any) can be found.
+    """
+    hold_created.connect(_on_hold_created, sender=HoldService)
+    hold_conflicted.connect(_on_hold_conflicted, sender=HoldService)
+    holds_expired.connect(_on_holds_expired, sender=HoldService)
+    hold_completed.connect(_on_hold_completed, sender=HoldService)
+    hold_cancelled.connect(_on_hold_cancelled, sender=HoldService)
+
+    with app.app_context():
+        engine = db.engine
+    _instrument_pool(engine)
+    # dispose() swaps in a fresh pool (e.g. after a fork); time that one too
+    event.listen(engine, "engine_disposed", _instrument_pool)
+
+    reservation_service = app.config.get("RESERVATION_SERVICE")
+    cache = _find_cache(getattr(reservation_service, "inventory", None))
+    sync_cache_stats = _CacheStatsSync(cache) if cache is not None else None
+
+    @app.before_request
+    def start_request_metrics() -> None:
+        g.metrics_started = time.perf_counter()
+        IN_FLIGHT.inc()
+
+    @app.after_request
+    def record_request_metrics(response: Response) -> Response:
+        started = g.get("metrics_started")
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            REQUEST_LATENCY.labels(request.method, route).observe(time.perf_counter() - started)
+            REQUESTS.labels(request.method, route, str(response.status_code)).inc()
+        if sync_cache_stats is not None:
+            sync_cache_stats()
+        return response
+
+    @app.teardown_request
+    def end_request_metrics(exc: BaseException | None) -> None:
+        if g.pop("metrics_started", None) is not None:
+            IN_FLIGHT.dec()
+
+    @app.route("/api/v1/metrics", methods=["GET"])
+    def metrics():
+        if sync_cache_stats is not None:
+            sync_cache_stats(force=True)
+        ACTIVE_HOLDS.set(HoldService.count_active_holds())
+        return render_metrics()
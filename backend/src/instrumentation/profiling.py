@@ -0,0 +1,204 @@
+"""
+Request Profiling
+
+Opt-in per-request timing breakdown. For every request it records wall
+time, SQL statement count and time (from SQLAlchemy engine events) and
+time spent behind the InventoryService boundary, then reports them as a
+``Server-Timing`` header and one structured log line. A sampled fraction
+of requests can also run under cProfile; dumps are kept only for requests
+slower than a threshold.
+
+Enable with ``PROFILING_ENABLED=true``.
+"""
+import cProfile
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections.abc import Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from flask import Flask, Response, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from services.inventory_service import InventoryService
+
+logger = logging.getLogger("pantry.request")
+
+_active: ContextVar["RequestProfile | None"] = ContextVar("request_profile", default=None)
+_install_lock = threading.Lock()
+_installed = False
+
+
+@dataclass
+class RequestProfile:
+    """
+    Timing breakdown of one request.
+
+    Attributes:
+        started (float): perf_counter() at request start.
+        db_queries (int): SQL statements executed.
+        db_seconds (float): Time spent executing SQL.
+        inventory_calls (int): Calls into the InventoryService.
+        inventory_seconds (float): Time spent in the InventoryService.
+    """
+    started: float
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    inventory_calls: int = 0
+    inventory_seconds: float = 0.0
+
+
+def current_profile() -> RequestProfile | None:
+    """Return the profile of the request running in this context, if any."""
+    return _active.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _active.get() is not None:
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    profile = _active.get()
+    starts = conn.info.get("profile_query_start")
+    if profile is not None and starts:
+        profile.db_seconds += time.perf_counter() - starts.pop()
+        profile.db_queries += 1
+
+
+def _install_sql_listeners() -> None:
+    global _installed
+    if _installed:
+        return
+    with _install_lock:
+        if not _installed:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            _installed = True
+
+
+class ProfiledInventoryService(InventoryService):
+    """InventoryService decorator that charges call time to the current request."""
+
+    def __init__(self, inner: InventoryService) -> None:
+        """
+        Args:
+            inner: InventoryService to wrap.
+        """
+        self.inner = inner
+
+    def get_available_donations(
+        self, lat: float | None = None, lng: float | None = None, radius: float = 50
+    ) -> list[dict]:
+        return self._timed(self.inner.get_available_donations, lat, lng, radius)
+
+    def get_donation_by_id(self, donation_id: str) -> dict | None:
+        return self._timed(self.inner.get_donation_by_id, donation_id)
+
+    def get_donations_by_ids(self, donation_ids: Iterable[str]) -> dict[str, dict]:
+        return self._timed(self.inner.get_donations_by_ids, donation_ids)
+
+    def get_snapshot_version(self) -> int | str | None:
+        return self.inner.get_snapshot_version()
+
+    def __getattr__(self, name: str):
+        # Pass through adapter extras (stats(), upsert_donation(), ...)
+        return getattr(self.inner, name)
+
+    @staticmethod
+    def _timed(fn, *args):
+        profile = _active.get()
+        if profile is None:
+            return fn(*args)
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            profile.inventory_calls += 1
+            profile.inventory_seconds += time.perf_counter() - started
+
+
+def init_profiling(app: Flask) -> None:
+    """
+    Register the profiling hooks on ``app``.
+
+    Reads PROFILE_SAMPLE_RATE (fraction of requests run under cProfile),
+    PROFILE_THRESHOLD_MS (minimum wall time for a dump to be kept) and
+    PROFILE_DIR (where ``.prof`` dumps are written).
+    """
+    _install_sql_listeners()
+    sample_rate = app.config.get("PROFILE_SAMPLE_RATE", 0.0)
+    threshold_ms = app.config.get("PROFILE_THRESHOLD_MS", 500.0)
+    profile_dir = app.config.get("PROFILE_DIR", "profiles")
+
+    @app.before_request
+    def start_profile() -> None:
+        g.profile_token = _active.set(RequestProfile(time.perf_counter()))
+        g.profiler = None
+        if sample_rate and random.random() < sample_rate:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                g.profiler = profiler
+            except ValueError:
+                # Another profiler is already active in this thread
+                pass
+
+    @app.after_request
+    def report_profile(response: Response) -> Response:
+        profile = _active.get()
+        if profile is None:
+            return response
+        wall_ms = (time.perf_counter() - profile.started) * 1000
+        db_ms = profile.db_seconds * 1000
+        inventory_ms = profile.inventory_seconds * 1000
+
+        response.headers.add("Server-Timing", ", ".join([
+            f"app;dur={wall_ms:.1f}",
+            f'db;dur={db_ms:.1f};desc="{profile.db_queries} queries"',
+            f'inventory;dur={inventory_ms:.1f};desc="{profile.inventory_calls} calls"',
+        ]))
+        logger.info(json.dumps({
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "wall_ms": round(wall_ms, 2),
+            "db_queries": profile.db_queries,
+            "db_ms": round(db_ms, 2),
+            "inventory_calls": profile.inventory_calls,
+            "inventory_ms": round(inventory_ms, 2),
+        }))
+
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            if wall_ms >= threshold_ms:
+                _dump(profiler, profile_dir, wall_ms)
+        return response
+
+    @app.teardown_request
+    def end_profile(exc: BaseException | None) -> None:
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+        token = g.pop("profile_token", None)
+        if token is not None:
+            _active.reset(token)
+
+
+def _dump(profiler: cProfile.Profile, profile_dir: str, wall_ms: float) -> None:
+    """Write a cProfile dump named after the request, e.g. ``GET_api_v1_donations_812ms_<ts>.prof``."""
+    os.makedirs(profile_dir, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", request.path).strip("_")
+    path = os.path.join(
+        profile_dir, f"{request.method}_{slug}_{wall_ms:.0f}ms_{time.time_ns()}.prof"
+    )
+    profiler.dump_stats(path)
+    logger.warning("slow request profiled: %s %s %.0fms -> %s", request.method, request.path, wall_ms, path)
@@ -0,0 +1,125 @@
+"""
+SQL Query Counter
+
+Counts the SQL statements executed inside a block of code. A single
+listener on every SQLAlchemy Engine increments the counter that is active
+in the current context (thread or task), so concurrent requests are
+counted independently and code outside a counting block pays only one
+ContextVar lookup per statement.
+"""
+import re
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_active: ContextVar["QueryCount | None"] = ContextVar("query_count", default=None)
+_install_lock = threading.Lock()
+_installed = False
+
+# Expanded IN lists and numeric literals that vary between otherwise identical statements
+_IN_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+@dataclass
+class QueryCount:
+    """
+    Statements seen while a ``count_queries`` block was active.
+
+    Attributes:
+        count (int): Number of statements executed.
+        statements (list[str]): The SQL text of each statement, if recorded.
+    """
+    count: int = 0
+    statements: list[str] = field(default_factory=list)
+    record: bool = False
+
+    def repeated_reads(self, threshold: int = 3) -> dict[str, int]:
+        """
+        Find SELECTs that ran ``threshold`` or more times with the same shape.
+
+        A read repeated once per row of an earlier result is the N+1
+        pattern; batching it into one query keeps the count constant as the
+        data grows. Writes are not reported, since batch endpoints
+        legitimately issue one per item. Requires ``record=True``.
+
+        Args:
+            threshold: Minimum repetitions to report. The default of 3
+                tolerates a load followed by a post-commit refresh.
+
+        Returns:
+            Dict mapping each repeated statement shape to its count.
+        """
+        shapes = Counter(
+            statement_shape(sql) for sql in self.statements
+            if sql.lstrip().upper().startswith("SELECT")
+        )
+        return {shape: n for shape, n in shapes.items() if n >= threshold}
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize SQL so statements differing only in bound values compare equal.
+
+    Collapses whitespace, IN lists of any length and numeric literals.
+    """
+    shape = " ".join(statement.split())
+    shape = _IN_LIST.sub("(?)", shape)
+    return _NUMBER.sub("N", shape)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _active.get()
+    if counter is not None:
+        counter.count += 1
+        if counter.record:
+            counter.statements.append(statement)
+
+
+def _ensure_installed() -> None:
+    global _installed
+    if _installed:
+        return
+    with _install_lock:
+        if not _installed:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            _installed = True
+
+
+@contextmanager
+def count_queries(record: bool = False) -> Iterator[QueryCount]:
+    """
+    Count SQL statements executed in the current context inside the block.
+
+    Blocks can nest; statements in an inner block also count toward the
+    enclosing one.
+
+    Args:
+        record: Also keep the SQL text of every statement.
+
+    Yields:
+        QueryCount updated live while the block runs.
+
+    Example::
+
+        with count_queries() as queries:
+            client.get("/api/v1/donations")
+        print(queries.count)
+    """
+    _ensure_installed()
+    counter = QueryCount(record=record)
+    parent = _active.get()
+    token = _active.set(counter)
+    try:
+        yield counter
+    finally:
+        _active.reset(token)
+        if parent is not None:
+            parent.count += counter.count
+            parent.statements.extend(counter.statements)
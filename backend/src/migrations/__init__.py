@@ -0,0 +1,8 @@
+"""
+Versioned schema migrations.
+
+Run with ``flask --app src/app.py migrate`` from the backend directory.
+"""
+from .runner import Migration, applied_versions, pending_migrations, run_migrations
+
+__all__ = ["Migration", "applied_versions", "pending_migrations", "run_migrations"]
@@ -0,0 +1,61 @@
+"""
+Idempotent schema operations shared by migrations.
+
+Each helper inspects the live schema first, so the same statement is
+safe on SQLite and MySQL whether or not the change already exists.
+"""
+from sqlalchemy import BindParameter, inspect, text
+from sqlalchemy.engine import Connection
+
+
+def has_table(conn: Connection, table: str) -> bool:
+    """Return True if the table exists."""
+    return inspect(conn).has_table(table)
+
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    """Return True if the table exists and has the column."""
+    if not has_table(conn, table):
+        return False
+    return column in {c["name"] for c in inspect(conn).get_columns(table)}
+
+
+def has_index(conn: Connection, table: str, index: str) -> bool:
+    """Return True if the table exists and has an index with this name."""
+    if not has_table(conn, table):
+        return False
+    return index in {i["name"] for i in inspect(conn).get_indexes(table)}
+
+
+def add_column(conn: Connection, table: str, column: str, ddl_type: str) -> None:
+    """Add a nullable column unless it already exists."""
+    if has_table(conn, table) and not has_column(conn, table, column):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+def create_index(conn: Connection, table: str, index: str, columns: list[str], unique: bool = False) -> None:
+    """Create an index unless one with the same name already exists."""
+    if has_table(conn, table) and not has_index(conn, table, index):
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        conn.execute(text(f"CREATE {kind} {index} ON {table} ({', '.join(columns)})"))
+
+
+def insert_ignore_select(
+    conn: Connection, table: str, columns: list[str], select_sql: str, *params: BindParameter
+) -> None:
+    """
+    INSERT the rows of a SELECT, skipping any whose key already exists.
+
+    The migration counterpart of ``db_utils.insert_ignore``: backfills can
+    run against a table that create_all or live traffic has already
+    partly filled, and re-running one is harmless.
+    """
+    cols = ", ".join(columns)
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        sql = f"INSERT OR IGNORE INTO {table} ({cols}) {select_sql}"
+    elif dialect in ("mysql", "mariadb"):
+        sql = f"INSERT IGNORE INTO {table} ({cols}) {select_sql}"
+    else:
+        sql = f"INSERT INTO {table} ({cols}) {select_sql} ON CONFLICT DO NOTHING"
+    conn.execute(text(sql).bindparams(*params))
@@ -0,0 +1,107 @@
+"""
+Migration Runner
+
+Applies versioned schema migrations in order and records each applied
+version in the ``schema_migrations`` table. Every migration is written to
+be idempotent so re-running against a partially migrated database (MySQL
+auto-commits DDL) converges on the same schema.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import ModuleType
+from typing import Callable
+
+from sqlalchemy import (
+    Column, DateTime, Engine, Integer, MetaData, String, Table, inspect, select,
+)
+from sqlalchemy.engine import Connection
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    A single schema change.
+
+    Attributes:
+        version (int): Strictly increasing version number.
+        description (str): Short human-readable summary.
+        upgrade (Callable[[Connection], None]): Applies the change. Must be
+            safe to run against a schema that already has it.
+    """
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+    @classmethod
+    def from_module(cls, module: ModuleType) -> "Migration":
+        """Build a Migration from a module exposing VERSION, DESCRIPTION and upgrade()."""
+        return cls(module.VERSION, module.DESCRIPTION, module.upgrade)
+
+
+def applied_versions(engine: Engine) -> set[int]:
+    """
+    Return the set of migration versions already recorded for a database.
+
+    Args:
+        engine: Engine bound to the target database.
+
+    Returns:
+        Applied version numbers; empty if the bookkeeping table is missing.
+    """
+    if not inspect(engine).has_table(schema_migrations.name):
+        return set()
+    with engine.connect() as conn:
+        return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(engine: Engine, migrations: list[Migration] | None = None) -> list[Migration]:
+    """
+    Return migrations not yet applied to the database, in version order.
+
+    Args:
+        engine: Engine bound to the target database.
+        migrations: Candidate migrations. Defaults to the registered set.
+    """
+    if migrations is None:
+        from .versions import MIGRATIONS
+        migrations = MIGRATIONS
+    applied = applied_versions(engine)
+    return sorted(
+        (m for m in migrations if m.version not in applied),
+        key=lambda m: m.version,
+    )
+
+
+def run_migrations(engine: Engine, migrations: list[Migration] | None = None) -> list[Migration]:
+    """
+    Apply every pending migration, each in its own transaction.
+
+    Args:
+        engine: Engine bound to the target database.
+        migrations: Migrations to consider. Defaults to the registered set.
+
+    Returns:
+        The migrations that were applied, in order.
+    """
+    _metadata.create_all(engine, checkfirst=True)
+    applied = []
+    for migration in pending_migrations(engine, migrations):
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=datetime.now(timezone.utc),
+            ))
+        applied.append(migration)
+    return applied
@@ -0,0 +1,26 @@
+"""
+Registered migrations, in the order they must be applied.
+
+Add new migrations as ``mNNNN_<name>.py`` modules exposing VERSION,
+DESCRIPTION and ``upgrade(conn)``, then append them here.
+"""
+from ..runner import Migration
+from . import (
+    m0001_hold_lifecycle_columns,
+    m0002_donation_availability,
+    m0003_hot_path_indexes,
+    m0004_hold_pagination_index,
+    m0005_availability_changes,
+    m0006_holds_archive,
+    m0007_pickup_rollups,
+)
+
+MIGRATIONS = [
+    Migration.from_module(m0001_hold_lifecycle_columns),
+    Migration.from_module(m0002_donation_availability),
+    Migration.from_module(m0003_hot_path_indexes),
+    Migration.from_module(m0004_hold_pagination_index),
+    Migration.from_module(m0005_availability_changes),
+    Migration.from_module(m0006_holds_archive),
+    Migration.from_module(m0007_pickup_rollups),
+]
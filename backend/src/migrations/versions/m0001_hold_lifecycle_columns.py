@@ -0,0 +1,12 @@
+"""Add completed_at / cancelled_at to holds (previously backfilled at boot)."""
+from sqlalchemy.engine import Connection
+
+from ..ops import add_column
+
+VERSION = 1
+DESCRIPTION = "hold lifecycle timestamp columns"
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "holds", "completed_at", "DATETIME")
+    add_column(conn, "holds", "cancelled_at", "DATETIME")
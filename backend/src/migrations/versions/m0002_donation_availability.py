@@ -0,0 +1,38 @@
+"""Create donation_availability and backfill it from existing holds."""
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.engine import Connection
+
+from ..ops import has_table, insert_ignore_select
+
+VERSION = 2
+DESCRIPTION = "donation availability table"
+
+
+def upgrade(conn: Connection) -> None:
+    if not has_table(conn, "donation_availability"):
+        conn.execute(text(
+            "CREATE TABLE donation_availability ("
+            " donation_id VARCHAR(100) NOT NULL PRIMARY KEY,"
+            " hold_id INTEGER NOT NULL,"
+            " status VARCHAR(9) NOT NULL)"
+        ))
+
+    if not has_table(conn, "holds"):
+        return
+
+    # create_all runs first and traffic may already have claimed donations,
+    # so fill in whatever is missing rather than only an empty table.
+    # Completed pickups first: they win over any stale active hold
+    insert_ignore_select(
+        conn, "donation_availability", ["donation_id", "hold_id", "status"],
+        "SELECT donation_id, MAX(id), 'COMPLETED' FROM holds"
+        " WHERE status = 'COMPLETED' GROUP BY donation_id",
+    )
+    insert_ignore_select(
+        conn, "donation_availability", ["donation_id", "hold_id", "status"],
+        "SELECT donation_id, MAX(id), 'ACTIVE' FROM holds"
+        " WHERE status = 'ACTIVE' AND expires_at > :now GROUP BY donation_id",
+        bindparam("now", datetime.now(timezone.utc), type_=DateTime),
+    )
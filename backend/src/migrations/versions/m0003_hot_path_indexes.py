@@ -0,0 +1,13 @@
+"""Secondary indexes for the hold and pickup history hot paths."""
+from sqlalchemy.engine import Connection
+
+from ..ops import create_index
+
+VERSION = 3
+DESCRIPTION = "hot-path indexes on holds and pickup_history"
+
+
+def upgrade(conn: Connection) -> None:
+    create_index(conn, "holds", "ix_holds_donation_status", ["donation_id", "status"])
+    create_index(conn, "holds", "ix_holds_user_status_created", ["user_id", "status", "created_at"])
+    create_index(conn, "pickup_history", "ix_pickup_history_user_completed", ["user_id", "completed_at"])
@@ -0,0 +1,12 @@
+"""Index backing keyset pagination of a user's holds on (created_at, id)."""
+from sqlalchemy.engine import Connection
+
+from ..ops import create_index
+
+VERSION = 4
+DESCRIPTION = "holds (user_id, created_at) pagination index"
+
+
+def upgrade(conn: Connection) -> None:
+    # The primary key is implicitly the trailing index column on SQLite and InnoDB
+    create_index(conn, "holds", "ix_holds_user_created", ["user_id", "created_at"])
@@ -0,0 +1,26 @@
+"""Append-only availability change log backing the listing version / ETag."""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from ..ops import has_table
+
+VERSION = 5
+DESCRIPTION = "availability change log"
+
+
+def upgrade(conn: Connection) -> None:
+    if has_table(conn, "availability_changes"):
+        return
+    # AUTOINCREMENT is SQLite-only; other dialects never reuse identity values
+    pk = (
+        "INTEGER PRIMARY KEY AUTOINCREMENT"
+        if conn.dialect.name == "sqlite"
+        else "INTEGER NOT NULL AUTO_INCREMENT PRIMARY KEY"
+    )
+    conn.execute(text(
+        "CREATE TABLE availability_changes ("
+        f" id {pk},"
+        " donation_id VARCHAR(100) NOT NULL,"
+        " is_held BOOLEAN NOT NULL,"
+        " changed_at DATETIME NOT NULL)"
+    ))
@@ -0,0 +1,28 @@
+"""Archive table for terminal holds and the index the archiver scans."""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from ..ops import create_index, has_table
+
+VERSION = 6
+DESCRIPTION = "holds archive table"
+
+
+def upgrade(conn: Connection) -> None:
+    if not has_table(conn, "holds_archive"):
+        conn.execute(text(
+            "CREATE TABLE holds_archive ("
+            " id INTEGER NOT NULL PRIMARY KEY,"
+            " user_id INTEGER NOT NULL,"
+            " donation_id VARCHAR(100) NOT NULL,"
+            " status VARCHAR(9) NOT NULL,"
+            " created_at DATETIME NOT NULL,"
+            " expires_at DATETIME NOT NULL,"
+            " completed_at DATETIME,"
+            " cancelled_at DATETIME,"
+            " archived_at DATETIME NOT NULL,"
+            " FOREIGN KEY (user_id) REFERENCES users (id))"
+        ))
+    create_index(conn, "holds_archive", "ix_holds_archive_user_created", ["user_id", "created_at"])
+    # Lets the archiver (and the expiry sweeper) range-scan by status and age
+    create_index(conn, "holds", "ix_holds_status_expires", ["status", "expires_at"])
@@ -0,0 +1,45 @@
+"""Pickup stats rollup tables, backfilled from pickup_history."""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from ..ops import has_table
+
+VERSION = 7
+DESCRIPTION = "pickup stats rollups"
+
+# table -> (key column DDL, key expressions over pickup_history)
+ROLLUPS = {
+    "pickup_daily_counts": (
+        ["day DATE NOT NULL"],
+        ["DATE(completed_at)"],
+    ),
+    "pickup_user_daily_counts": (
+        ["user_id INTEGER NOT NULL", "day DATE NOT NULL"],
+        ["user_id", "DATE(completed_at)"],
+    ),
+    "pickup_donor_daily_counts": (
+        ["donor VARCHAR(255) NOT NULL", "day DATE NOT NULL"],
+        ["COALESCE(donor_contact, '')", "DATE(completed_at)"],
+    ),
+}
+
+
+def upgrade(conn: Connection) -> None:
+    for table, (columns, keys) in ROLLUPS.items():
+        names = [c.split()[0] for c in columns]
+        if not has_table(conn, table):
+            conn.execute(text(
+                f"CREATE TABLE {table} ({', '.join(columns)}, pickups INTEGER NOT NULL,"
+                f" PRIMARY KEY ({', '.join(names)}))"
+            ))
+
+        if not has_table(conn, "pickup_history"):
+            continue
+        # create_all may have made the table already; fill it unless pickups were counted
+        if conn.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).first():
+            continue
+        conn.execute(text(
+            f"INSERT INTO {table} ({', '.join(names)}, pickups)"
+            f" SELECT {', '.join(keys)}, COUNT(*) FROM pickup_history"
+            f" GROUP BY {', '.join(keys)}"
+        ))
@@ -1,5 +1,19 @@
 from .user import User
 from .hold import Hold
+from .hold_archive import HoldArchive
 from .pickup_history import PickupHistory
+from .pickup_rollups import PickupDailyCount, PickupDonorDailyCount, PickupUserDailyCount
+from .donation_availability import DonationAvailability
+from .availability_change import AvailabilityChange
 
-__all__ = ["User", "Hold", "PickupHistory"]
\ No newline at end of file
+__all__ = [
+    "User",
+    "Hold",
+    "HoldArchive",
+    "PickupHistory",
+    "PickupDailyCount",
+    "PickupUserDailyCount",
+    "PickupDonorDailyCount",
+    "DonationAvailability",
+    "AvailabilityChange",
+]
@@ -0,0 +1,51 @@
+"""
+AvailabilityChange Model
+
+Append-only log of donation availability transitions. Its highest ID is
+the global availability version used to validate cached listings.
+"""
+from datetime import datetime, timezone
+
+from extensions import db
+
+
+class AvailabilityChange(db.Model):
+    """
+    SQLAlchemy model representing one change to a donation's availability.
+
+    HoldService appends a row in the same transaction as every hold create,
+    cancel, complete and expiry, so the maximum ``id`` only ever grows and
+    changes exactly when some donation's availability may have changed.
+    Reading it is a single primary-key lookup that never touches holds.
+
+    Attributes:
+        id (int): Primary key, auto-incremented and never reused.
+        donation_id (str): Identifier of the donation whose state changed.
+        is_held (bool): True if the donation became unavailable (held or
+            picked up), False if it returned to the pool.
+        changed_at (datetime): UTC timestamp of the change.
+    """
+    __tablename__ = "availability_changes"
+    # AUTOINCREMENT keeps SQLite from reusing IDs after old rows are pruned
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    donation_id = db.Column(db.String(100), nullable=False)
+    is_held = db.Column(db.Boolean, nullable=False)
+    changed_at = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the change to a JSON-compatible dictionary.
+
+        Returns:
+            out: Dict with keys: id, donationId, isHeld, changedAt.
+        """
+        return {
+            "id": self.id,
+            "donationId": self.donation_id,
+            "isHeld": self.is_held,
+            "changedAt": self.changed_at.isoformat(),
+        }
@@ -0,0 +1,37 @@
+"""
+DonationAvailability Model
+
+Materialized, per-donation availability state kept in step with the
+Hold lifecycle. One row exists for every donation that is currently
+unavailable (actively held or picked up).
+"""
+from extensions import db
+from models.hold import HoldStatus
+
+
+class DonationAvailability(db.Model):
+    """
+    SQLAlchemy model representing the unavailable state of a single donation.
+
+    Maintained by HoldService on every hold transition so that "which of these
+    donations are unavailable" is answered with primary-key lookups instead of
+    scanning the whole (ever-growing) holds table.
+
+    - An ACTIVE row is written when a hold is placed and removed when the hold
+      is cancelled or expired. Readers join to the owning hold by primary key
+      to treat a lapsed hold as available without writing anything.
+    - A COMPLETED row is written on pickup and never removed; the donation is
+      gone for good.
+
+    Attributes:
+        donation_id (str): Primary key. Identifier of the unavailable donation.
+        hold_id (int): ID of the hold that made the donation unavailable. Not a
+            foreign key: completed holds are later moved to holds_archive
+            with the same ID (see HoldService.archive_terminal_holds).
+        status (HoldStatus): Either ACTIVE or COMPLETED.
+    """
+    __tablename__ = "donation_availability"
+
+    donation_id = db.Column(db.String(100), primary_key=True)
+    hold_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.Enum(HoldStatus), nullable=False, default=HoldStatus.ACTIVE)
@@ -44,6 +44,12 @@ class Hold(db.Model):
         user (User): Relationship back to the owning User.
     """
     __tablename__ = "holds"
+    __table_args__ = (
+        db.Index("ix_holds_donation_status", "donation_id", "status"),
+        db.Index("ix_holds_user_status_created", "user_id", "status", "created_at"),
+        db.Index("ix_holds_user_created", "user_id", "created_at"),
+        db.Index("ix_holds_status_expires", "status", "expires_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
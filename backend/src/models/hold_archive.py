@@ -0,0 +1,55 @@
+"""
+HoldArchive Model
+
+Cold storage for holds that reached a terminal state long ago. Rows are
+moved here from ``holds`` by HoldService.archive_terminal_holds so the
+table every hold operation touches stays small.
+"""
+from datetime import datetime, timezone
+
+from extensions import db
+from models.hold import Hold, HoldStatus
+
+
+class HoldArchive(db.Model):
+    """
+    SQLAlchemy model representing an archived (expired, cancelled or
+    completed) hold.
+
+    Columns mirror Hold and keep the hold's original ID, so an archived
+    hold serializes exactly like a live one and DonationAvailability rows
+    that point at a completed hold stay valid.
+
+    Attributes:
+        id (int): Primary key; the hold's ID in the ``holds`` table.
+        user_id (int): Foreign key referencing the User who placed the hold.
+        donation_id (str): Identifier of the donation that was held.
+        status (HoldStatus): Terminal state the hold ended in.
+        created_at (datetime): UTC timestamp of when the hold was created.
+        expires_at (datetime): UTC timestamp of when the hold expired or
+            would have expired.
+        completed_at (datetime | None): UTC timestamp of pickup confirmation.
+        cancelled_at (datetime | None): UTC timestamp of hold cancellation.
+        archived_at (datetime): UTC timestamp of when the row was archived.
+    """
+    __tablename__ = "holds_archive"
+    __table_args__ = (
+        db.Index("ix_holds_archive_user_created", "user_id", "created_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    donation_id = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.Enum(HoldStatus), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    cancelled_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+    is_active = False
+
+    # Same JSON shape as a live hold, so clients need not tell them apart
+    to_dict = Hold.to_dict
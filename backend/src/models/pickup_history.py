@@ -26,6 +26,9 @@ class PickupHistory(db.Model):
         user (User): Relationship back to the owning User.
     """
     __tablename__ = "pickup_history"
+    __table_args__ = (
+        db.Index("ix_pickup_history_user_completed", "user_id", "completed_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,63 @@
+"""
+Pickup Rollup Models
+
+Per-day pickup counters kept in step with pickup_history, overall and
+broken down by user and by donor. Each table's primary key leads with
+the dimension and ends with the day, so any stats query is a single
+primary-key range scan whose cost grows with the days returned, not
+with the size of pickup_history.
+"""
+from extensions import db
+
+
+class PickupDailyCount(db.Model):
+    """
+    SQLAlchemy model counting all pickups completed on one UTC day.
+
+    Attributes:
+        day (date): Primary key. UTC date the pickups were completed.
+        pickups (int): Number of pickups completed that day.
+    """
+    __tablename__ = "pickup_daily_counts"
+
+    day = db.Column(db.Date, primary_key=True)
+    pickups = db.Column(db.Integer, nullable=False, default=0)
+
+
+class PickupUserDailyCount(db.Model):
+    """
+    SQLAlchemy model counting one user's pickups on one UTC day.
+
+    Attributes:
+        user_id (int): Primary key part. User who completed the pickups.
+        day (date): Primary key part. UTC date the pickups were completed.
+        pickups (int): Number of pickups.
+    """
+    __tablename__ = "pickup_user_daily_counts"
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    day = db.Column(db.Date, primary_key=True)
+    pickups = db.Column(db.Integer, nullable=False, default=0)
+
+
+class PickupDonorDailyCount(db.Model):
+    """
+    SQLAlchemy model counting pickups from one donor on one UTC day.
+
+    The inventory has no donor identifier, so the donor key is the
+    free-text ``donor_contact`` copied onto each pickup (the inventory's
+    ``donorContact``, usually a phone number such as ``412-555-0101``). It
+    is stored and matched verbatim: a donor whose contact is written two
+    ways is counted twice, and donors sharing a contact are counted
+    together. Pickups with no contact are counted under the empty string.
+
+    Attributes:
+        donor (str): Primary key part. Verbatim ``donor_contact``, or "".
+        day (date): Primary key part. UTC date the pickups were completed.
+        pickups (int): Number of pickups.
+    """
+    __tablename__ = "pickup_donor_daily_counts"
+
+    donor = db.Column(db.String(255), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    pickups = db.Column(db.Integer, nullable=False, default=0)
@@ -1,7 +1,11 @@
 """
 Donation routes — exposes donation listing endpoints.
 """
-from flask import Blueprint, jsonify, request, current_app
+from collections.abc import Iterator
+
+from flask import Blueprint, Response, jsonify, make_response, request, current_app
+
+from services.availability_broker import AvailabilityBroker, AvailabilityEvent, ConsumerTooSlow
 
 donation_bp = Blueprint("donations", __name__, url_prefix="/api/v1/donations")
 
@@ -14,26 +18,142 @@ def list_donations():
     GET /api/v1/donations?lat=...&lng=...&radius=...&showAll=true
 
     Query Params:
-        lat (float): Latitude of search center. Defaults to 0.
-        lng (float): Longitude of search center. Defaults to 0.
+        lat (float): Latitude of search center. If lat or lng is omitted,
+            donations are not filtered by location.
+        lng (float): Longitude of search center.
         radius (float): Search radius in miles. Defaults to 50.
         showAll (str): If "true", includes held donations with isHeld flag.
             Defaults to "false".
 
+    Headers:
+        If-None-Match: ETag from a previous response. If the listing version
+            has not changed, 304 is returned without loading holds or
+            inventory.
+
     Returns:
         200: JSON array of donation objects. Each donation includes an
-             isHeld flag when showAll=true.
+             isHeld flag when showAll=true. Carries a weak ETag.
+        304: Listing unchanged since the given ETag.
     """
-    lat = request.args.get("lat", 0, type=float)
-    lng = request.args.get("lng", 0, type=float)
+    lat = request.args.get("lat", type=float)
+    lng = request.args.get("lng", type=float)
     radius = request.args.get("radius", 50, type=float)
     show_all = request.args.get("showAll", "false").lower() == "true"
 
     reservation_svc = current_app.config["RESERVATION_SERVICE"]
 
+    # Read the version before the data so a concurrent change can only make
+    # the ETag older than the body, never newer
+    version = reservation_svc.get_listing_version()
+    if version is not None and request.if_none_match.contains_weak(version):
+        response = make_response("", 304)
+        response.set_etag(version, weak=True)
+        return response
+
     if show_all:
         donations = reservation_svc.get_all_donations(lat, lng, radius)
     else:
         donations = reservation_svc.get_available_donations(lat, lng, radius)
 
-    return jsonify(donations), 200
\ No newline at end of file
+    response = make_response(jsonify(donations), 200)
+    if version is not None:
+        response.set_etag(version, weak=True)
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@donation_bp.route("/stream", methods=["GET"])
+def stream_availability():
+    """
+    Push donation availability changes as Server-Sent Events.
+
+    GET /api/v1/donations/stream
+
+    Each change is an ``availability`` event whose data is
+    ``{"donationId": str, "isHeld": bool}`` and whose id is the change's
+    version. A comment line is sent every heartbeat interval while idle.
+
+    Headers:
+        Last-Event-ID: ID of the last event received. Missed changes are
+            replayed from the database; if too many were missed a ``reset``
+            event tells the client to reload the full listing. May also be
+            passed as the ``lastEventId`` query param.
+
+    Returns:
+        200: ``text/event-stream`` that stays open.
+        400: Last-Event-ID is not an integer.
+        503: This worker already serves AVAILABILITY_STREAM_MAX_CONNECTIONS
+             streams. Carries Retry-After; ``EventSource`` reconnects on its own.
+    """
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("lastEventId")
+    if last_event_id is not None:
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            return jsonify({"error": "Last-Event-ID must be an integer"}), 400
+
+    broker = current_app.extensions["availability_broker"]
+    if not broker.try_open_stream():
+        response = jsonify({"error": "Too many open streams, retry shortly"})
+        response.status_code = 503
+        response.headers["Retry-After"] = "5"
+        return response
+    try:
+        broker.ensure_started()
+    except Exception:
+        broker.close_stream()
+        raise
+
+    # Replay from the database up to what the broker has published, then
+    # stream from the in-memory ring
+    backlog: list[AvailabilityEvent] = []
+    reset = False
+    cursor = broker.last_id
+    if last_event_id is not None and last_event_id >= cursor:
+        cursor = last_event_id
+    elif last_event_id is not None:
+        replayed = broker.replay(last_event_id)
+        if replayed is None:
+            reset = True
+        else:
+            backlog = replayed
+            cursor = backlog[-1].id if backlog else cursor
+
+    heartbeat = current_app.config["AVAILABILITY_STREAM_HEARTBEAT_SECONDS"]
+    response = Response(
+        _event_stream(broker, cursor, backlog, reset, heartbeat),
+        mimetype="text/event-stream",
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    # Stop reverse proxies (nginx) from buffering the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    response.call_on_close(broker.close_stream)
+    return response
+
+
+def _event_stream(
+    broker: AvailabilityBroker,
+    cursor: int,
+    backlog: list[AvailabilityEvent],
+    reset: bool,
+    heartbeat: float,
+) -> Iterator[str]:
+    """Yield SSE frames; holds no database connection while idle."""
+    yield "retry: 3000\n\n"
+    if reset:
+        yield f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+    for event in backlog:
+        yield event.to_sse()
+
+    while not broker.stopped:
+        try:
+            events = broker.wait_for_events(cursor, heartbeat)
+        except ConsumerTooSlow:
+            # Close; the client reconnects with Last-Event-ID and replays
+            return
+        if not events:
+            yield ": ping\n\n"
+            continue
+        for event in events:
+            yield event.to_sse()
+        cursor = events[-1].id
@@ -1,8 +1,13 @@
 """
 History routes — exposes pickup history endpoints.
 """
-from flask import Blueprint, jsonify, request
+from datetime import datetime
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from services.history_export import EXPORT_FORMATS
 from services.history_service import HistoryService
+from services.pagination import DEFAULT_PAGE_SIZE
+from services.pickup_stats_service import PickupStatsService
 
 history_bp = Blueprint("history", __name__, url_prefix="/api/v1/history")
 
@@ -10,20 +15,119 @@ history_bp = Blueprint("history", __name__, url_prefix="/api/v1/history")
 @history_bp.route("", methods=["GET"])
 def get_history():
     """
-    Retrieve all completed pickups for a user, newest first.
+    Retrieve completed pickups for a user, newest first.
 
-    GET /api/v1/history?userId=...
+    GET /api/v1/history?userId=...&limit=...&cursor=...
 
     Query Params:
         userId (int): Required. ID of the user whose history to retrieve.
+        limit (int): Page size. If limit or cursor is given, the response
+            is paginated.
+        cursor (str): ``nextCursor`` from the previous page.
 
     Returns:
-        200: JSON array of pickup history records.
-        400: Missing userId query param.
+        200: JSON array of pickup history records, or when paginated
+             ``{"items": [...], "nextCursor": str | null}``.
+        400: Missing userId query param or invalid cursor.
     """
     user_id = request.args.get("userId", type=int)
     if not user_id:
         return jsonify({"error": "userId query param is required"}), 400
 
+    limit = request.args.get("limit", type=int)
+    cursor = request.args.get("cursor")
+    if limit is not None or cursor is not None:
+        try:
+            page = HistoryService.get_history_page(user_id, limit or DEFAULT_PAGE_SIZE, cursor)
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+        return jsonify({
+            "items": [r.to_dict() for r in page.items],
+            "nextCursor": page.next_cursor,
+        }), 200
+
     records = HistoryService.get_history_for_user(user_id)
-    return jsonify([r.to_dict() for r in records]), 200
\ No newline at end of file
+    return jsonify([r.to_dict() for r in records]), 200
+
+
+@history_bp.route("/export", methods=["GET"])
+def export_history():
+    """
+    Stream pickup history across all users as NDJSON or CSV.
+
+    GET /api/v1/history/export?format=csv&userId=...&from=...&to=...
+
+    Rows are read from a server-side cursor in chunks and written to the
+    response as they arrive, so memory use does not grow with table size.
+
+    Query Params:
+        format (str): "ndjson" (default) or "csv".
+        userId (int): Optional. Only this user's pickups.
+        from (str): Optional ISO date/datetime, inclusive lower bound on completedAt.
+        to (str): Optional ISO date/datetime, exclusive upper bound on completedAt.
+
+    Returns:
+        200: Streamed NDJSON or CSV body.
+        400: Unknown format or unparseable date.
+    """
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+
+    try:
+        start = _parse_datetime(request.args.get("from"))
+        end = _parse_datetime(request.args.get("to"))
+    except ValueError:
+        return jsonify({"error": "from/to must be ISO 8601 dates"}), 400
+
+    mimetype, serialize = EXPORT_FORMATS[fmt]
+    records = HistoryService.iter_history(
+        user_id=request.args.get("userId", type=int), start=start, end=end
+    )
+    return Response(
+        stream_with_context(serialize(records)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=pickup_history.{fmt}"},
+    )
+
+
+@history_bp.route("/stats", methods=["GET"])
+def get_stats():
+    """
+    Daily pickup counts from the precomputed rollups.
+
+    GET /api/v1/history/stats?userId=...&donor=...&from=...&to=...
+
+    Query Params:
+        userId (int): Optional. Only this user's pickups.
+        donor (str): Optional. Only pickups whose donor contact (the
+            inventory's free-text ``donorContact``, e.g. ``412-555-0101``)
+            equals this value exactly. Cannot be combined with userId.
+        from (str): Optional ISO date, first day included.
+        to (str): Optional ISO date, first day excluded.
+
+    Returns:
+        200: ``{"total": int, "days": [{"date": str, "pickups": int}]}``.
+        400: Both userId and donor given, or unparseable date.
+    """
+    try:
+        start = _parse_datetime(request.args.get("from"))
+        end = _parse_datetime(request.args.get("to"))
+    except ValueError:
+        return jsonify({"error": "from/to must be ISO 8601 dates"}), 400
+
+    try:
+        stats = PickupStatsService.get_stats(
+            user_id=request.args.get("userId", type=int),
+            donor=request.args.get("donor"),
+            start=start.date() if start else None,
+            end=end.date() if end else None,
+        )
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify(stats), 200
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    """Parse an optional ISO 8601 date or datetime query param."""
+    return datetime.fromisoformat(value) if value else None
@@ -3,9 +3,13 @@ Hold routes — exposes reservation/hold management endpoints.
 """
 from flask import Blueprint, jsonify, request, current_app
 from services.hold_service import HoldService
+from services.pagination import DEFAULT_PAGE_SIZE
 
 hold_bp = Blueprint("holds", __name__, url_prefix="/api/v1/holds")
 
+# Upper bound on donations per batch request
+MAX_BATCH_SIZE = 50
+
 
 @hold_bp.route("", methods=["POST"])
 def create_hold():
@@ -33,33 +37,96 @@ def create_hold():
     return jsonify(result), 201
 
 
+@hold_bp.route("/batch", methods=["POST"])
+def create_holds_batch():
+    """
+    Reserve several donations for a user in one request and one transaction.
+
+    POST /api/v1/holds/batch
+    Body: { "userId": int, "donationIds": [string], "allOrNothing": bool }
+
+    Returns:
+        201: At least one hold was created; per-item results included.
+        400: Missing/invalid fields, a donation ID that is not a non-empty
+             string, or more than MAX_BATCH_SIZE donations.
+        409: No hold was created; per-item results included.
+    """
+    data = request.get_json()
+    donation_ids = data.get("donationIds") if data else None
+    if not data or "userId" not in data or not isinstance(donation_ids, list) or not donation_ids:
+        return jsonify({"error": "userId and a non-empty donationIds list are required"}), 400
+    if not all(isinstance(d, str) and d for d in donation_ids):
+        return jsonify({"error": "donationIds must be a list of non-empty strings"}), 400
+    if len(donation_ids) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} donations per batch"}), 400
+
+    reservation_svc = current_app.config["RESERVATION_SERVICE"]
+    result = reservation_svc.request_holds(
+        data["userId"], donation_ids, all_or_nothing=bool(data.get("allOrNothing", False))
+    )
+
+    created = any(r["success"] for r in result["results"])
+    return jsonify(result), 201 if created else 409
+
+
 @hold_bp.route("", methods=["GET"])
 def list_holds():
     """
     List holds for a user.
 
-    GET /api/v1/holds?userId=...&active=true
+    GET /api/v1/holds?userId=...&active=true&includeDonation=true&includeArchived=true&limit=...&cursor=...
 
     Query Params:
         userId (int): Required. ID of the user.
         active (str): If "true", returns only active holds. Defaults to "false".
+        includeDonation (str): If "true", each hold carries a ``donation``
+            object fetched in one batch inventory call. Defaults to "false".
+        includeArchived (str): If "true", holds moved to the archive are
+            included too. Ignored with active=true. Defaults to "false".
+        limit (int): Page size. If limit or cursor is given, the response
+            is paginated.
+        cursor (str): ``nextCursor`` from the previous page.
 
     Returns:
-        200: JSON array of hold objects.
-        400: Missing userId query param.
+        200: JSON array of hold objects, or when paginated
+             ``{"items": [...], "nextCursor": str | null}``.
+        400: Missing userId query param or invalid cursor.
     """
     user_id = request.args.get("userId", type=int)
     if not user_id:
         return jsonify({"error": "userId query param is required"}), 400
 
     active_only = request.args.get("active", "false").lower() == "true"
-
-    if active_only:
+    include_donation = request.args.get("includeDonation", "false").lower() == "true"
+    include_archived = request.args.get("includeArchived", "false").lower() == "true"
+
+    limit = request.args.get("limit", type=int)
+    cursor = request.args.get("cursor")
+    paginated = limit is not None or cursor is not None
+
+    next_cursor = None
+    if paginated:
+        try:
+            page = HoldService.get_holds_page(
+                user_id, limit or DEFAULT_PAGE_SIZE, cursor,
+                active_only=active_only, include_archived=include_archived,
+            )
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+        holds, next_cursor = page.items, page.next_cursor
+    elif active_only:
         holds = HoldService.get_active_holds_for_user(user_id)
     else:
-        holds = HoldService.get_all_holds_for_user(user_id)
+        holds = HoldService.get_all_holds_for_user(user_id, include_archived=include_archived)
 
-    return jsonify([h.to_dict() for h in holds]), 200
+    payload = [h.to_dict() for h in holds]
+    if include_donation:
+        reservation_svc = current_app.config["RESERVATION_SERVICE"]
+        payload = reservation_svc.attach_donations(payload)
+
+    if paginated:
+        return jsonify({"items": payload, "nextCursor": next_cursor}), 200
+    return jsonify(payload), 200
 
 
 @hold_bp.route("/<int:hold_id>", methods=["DELETE"])
@@ -85,6 +152,33 @@ def cancel_hold(hold_id):
     return jsonify(result), 200
 
 
+@hold_bp.route("/pickup/batch", methods=["POST"])
+def confirm_pickups_batch():
+    """
+    Confirm several pickups at once, committed in a single transaction.
+
+    POST /api/v1/holds/pickup/batch
+    Body: { "holdIds": [int] }
+
+    Returns:
+        200: At least one pickup confirmed; per-item results included.
+        400: Missing/invalid holdIds or more than MAX_BATCH_SIZE holds.
+        404: No pickup confirmed; per-item results included.
+    """
+    data = request.get_json()
+    hold_ids = data.get("holdIds") if data else None
+    if not isinstance(hold_ids, list) or not hold_ids or not all(isinstance(h, int) for h in hold_ids):
+        return jsonify({"error": "holdIds must be a non-empty list of integers"}), 400
+    if len(hold_ids) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} holds per batch"}), 400
+
+    reservation_svc = current_app.config["RESERVATION_SERVICE"]
+    result = reservation_svc.confirm_pickups(hold_ids)
+
+    confirmed = any(r["success"] for r in result["results"])
+    return jsonify(result), 200 if confirmed else 404
+
+
 @hold_bp.route("/<int:hold_id>/pickup", methods=["POST"])
 def confirm_pickup(hold_id):
     """
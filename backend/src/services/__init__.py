@@ -1,14 +1,33 @@
-from .inventory_service import InventoryService, MockInventoryService
+from .inventory_service import InventoryService, InventoryServiceError, MockInventoryService
+from .caching_inventory_service import CachingInventoryService
+from .coalescing_inventory_service import CoalescingInventoryService
+from .http_inventory_service import HttpInventoryService, InventoryRegion
 from .hold_service import HoldService
+from .hold_expiry_sweeper import HoldExpirySweeper, SweepResult
+from .hold_archiver import ArchiveResult, HoldArchiver
+from .availability_broker import AvailabilityBroker, AvailabilityEvent
 from .history_service import HistoryService
+from .pickup_stats_service import PickupStatsService
 from .reservation_service import ReservationService
 from .user_service import UserService
 
 __all__ = [
     "InventoryService",
+    "InventoryServiceError",
     "MockInventoryService",
+    "CachingInventoryService",
+    "CoalescingInventoryService",
+    "HttpInventoryService",
+    "InventoryRegion",
     "HoldService",
+    "HoldExpirySweeper",
+    "SweepResult",
+    "HoldArchiver",
+    "ArchiveResult",
+    "AvailabilityBroker",
+    "AvailabilityEvent",
     "HistoryService",
+    "PickupStatsService",
     "UserService",
     "ReservationService",
 ]
\ No newline at end of file
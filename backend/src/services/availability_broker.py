@@ -0,0 +1,281 @@
+"""
+Availability Broker
+
+Fans out donation availability changes to Server-Sent Events streams.
+One background thread per process tails the availability change log and
+appends new changes to a bounded in-memory ring; every open stream just
+holds a cursor into that ring, so idle connections cost no database
+connection, no thread of the broker's own and no per-client buffer.
+
+The ring only feeds live streams. Reconnecting clients replay from the
+``availability_changes`` table, which every worker shares, so a client
+can resume on a different worker or after its worker was recycled.
+
+Change IDs are allocated when a row is inserted but become visible when
+its transaction commits, so on MySQL a lower ID can appear after a
+higher one. The broker publishes strictly in ID order and stops at a
+missing ID until it shows up or ``gap_timeout_seconds`` pass (its
+transaction rolled back and the ID will never be used).
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+
+from flask import Flask
+
+from extensions import db
+from services.hold_service import HoldService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AvailabilityEvent:
+    """
+    A single availability delta as pushed to clients.
+
+    Attributes:
+        id (int): AvailabilityChange ID; used as the SSE event ID.
+        donation_id (str): Donation whose availability changed.
+        is_held (bool): True if the donation is now unavailable.
+    """
+    id: int
+    donation_id: str
+    is_held: bool
+
+    def to_sse(self) -> str:
+        """Serialize as one SSE ``availability`` event."""
+        data = json.dumps({"donationId": self.donation_id, "isHeld": self.is_held})
+        return f"id: {self.id}\nevent: availability\ndata: {data}\n\n"
+
+
+class ConsumerTooSlow(Exception):
+    """Raised when a stream's cursor has fallen out of the broker's ring."""
+
+
+class AvailabilityBroker:
+    """
+    Tails the availability change log and broadcasts new changes.
+
+    Backpressure: the ring keeps the newest ``buffer_size`` events. A stream
+    that falls further behind than that gets ``ConsumerTooSlow`` and is
+    closed; the client reconnects with ``Last-Event-ID`` and catches up from
+    the database (or is told to reload if it is too far behind).
+
+    Admission: every stream holds a request thread for as long as it is
+    open. ``max_streams`` caps how many one process serves at once so
+    streams cannot take every thread of a worker; further clients get a
+    503 and retry, or are routed to a dedicated stream pool.
+
+    Like HoldExpirySweeper, the polling thread is started lazily by the first
+    stream so it always lives in the process that serves traffic.
+
+    Attributes:
+        app (Flask): Application whose context each poll runs in.
+        poll_interval_seconds (float): Delay between change log polls.
+        buffer_size (int): Number of recent events kept in memory.
+        max_streams (int): Streams this process serves at once; 0 means no limit.
+        gap_timeout_seconds (float): How long a missing change ID holds back
+            later changes before it is skipped.
+        last_id (int): ID of the newest change published; every change up to
+            it has been published or given up on.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        poll_interval_seconds: float = 1.0,
+        buffer_size: int = 1024,
+        max_streams: int = 0,
+        gap_timeout_seconds: float = 3.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            app: Flask application to push an app context for.
+            poll_interval_seconds: Seconds between polls of the change log.
+            buffer_size: Capacity of the in-memory event ring.
+            max_streams: Maximum concurrently open streams; 0 for no limit.
+            gap_timeout_seconds: Seconds to wait for a missing change ID.
+            clock: Monotonic time source; injectable for tests.
+        """
+        self.app = app
+        self.poll_interval_seconds = poll_interval_seconds
+        self.buffer_size = buffer_size
+        self.max_streams = max_streams
+        self.gap_timeout_seconds = gap_timeout_seconds
+        self.last_id: int | None = None
+        self._clock = clock
+        self._gap_since: float | None = None
+        self._open_streams = 0
+        self._streams_lock = threading.Lock()
+        self._ring: deque[AvailabilityEvent] = deque()
+        self._evicted_through = 0
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def poll(self) -> int:
+        """
+        Read changes newer than ``last_id`` and publish them in ID order.
+
+        The first poll only records the current version; history before the
+        broker started is served through ``replay``.
+
+        Returns:
+            Number of events published.
+        """
+        with self.app.app_context():
+            try:
+                if self.last_id is None:
+                    self.last_id = HoldService.get_availability_version()
+                    return 0
+                changes = HoldService.get_availability_changes(self.last_id, self.buffer_size)
+                events = self._contiguous(
+                    [AvailabilityEvent(c.id, c.donation_id, c.is_held) for c in changes]
+                )
+            finally:
+                db.session.remove()
+        if events:
+            self.publish(events)
+        return len(events)
+
+    def _contiguous(self, events: list[AvailabilityEvent]) -> list[AvailabilityEvent]:
+        """Return the leading events that follow ``last_id`` without a gap, or skip a gap that timed out."""
+        ready = []
+        expected = self.last_id + 1
+        for event in events:
+            if event.id != expected:
+                now = self._clock()
+                if self._gap_since is None:
+                    self._gap_since = now
+                if now - self._gap_since < self.gap_timeout_seconds:
+                    break
+                logger.warning("availability changes %d-%d never committed; skipping", expected, event.id - 1)
+            self._gap_since = None
+            ready.append(event)
+            expected = event.id + 1
+        return ready
+
+    def publish(self, events: list[AvailabilityEvent]) -> None:
+        """Append events to the ring and wake every waiting stream."""
+        with self._changed:
+            self._ring.extend(events)
+            while len(self._ring) > self.buffer_size:
+                self._evicted_through = self._ring.popleft().id
+            self.last_id = events[-1].id
+            self._changed.notify_all()
+
+    def wait_for_events(self, after_id: int, timeout: float) -> list[AvailabilityEvent]:
+        """
+        Block until events newer than ``after_id`` exist or the timeout passes.
+
+        Args:
+            after_id: ID of the last event the stream has sent.
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            Events with ID greater than ``after_id``, oldest first; empty on timeout.
+
+        Raises:
+            ConsumerTooSlow: If events after ``after_id`` were already
+                dropped from the ring.
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._stop.is_set() or (self._ring and self._ring[-1].id > after_id),
+                timeout,
+            )
+            if after_id < self._evicted_through:
+                raise ConsumerTooSlow(after_id)
+            if not self._ring or self._ring[-1].id <= after_id:
+                return []
+            return [e for e in self._ring if e.id > after_id]
+
+    def try_open_stream(self) -> bool:
+        """
+        Reserve a stream slot; pair every True result with ``close_stream``.
+
+        Returns:
+            False if ``max_streams`` streams are already open.
+        """
+        with self._streams_lock:
+            if self.max_streams and self._open_streams >= self.max_streams:
+                return False
+            self._open_streams += 1
+            return True
+
+    def close_stream(self) -> None:
+        """Release a slot reserved by ``try_open_stream``."""
+        with self._streams_lock:
+            self._open_streams -= 1
+
+    def replay(self, after_id: int) -> list[AvailabilityEvent] | None:
+        """
+        Return persisted events after ``after_id`` for a reconnecting client.
+
+        Only events up to ``last_id`` are returned; newer ones reach the
+        client through the ring, so a change that commits late is never
+        skipped by a stream that replayed past it. Must be called inside an
+        app context, after ``ensure_started``.
+
+        Args:
+            after_id: Value of the client's ``Last-Event-ID``.
+
+        Returns:
+            Missed events oldest first, or None if the client should reload
+            the full listing: more than ``buffer_size`` were missed, or some
+            were already pruned from the change log.
+        """
+        oldest = HoldService.get_oldest_availability_change_id()
+        if oldest is not None and after_id < oldest - 1:
+            return None
+        changes = HoldService.get_availability_changes(after_id, self.buffer_size + 1, self.last_id)
+        if len(changes) > self.buffer_size:
+            return None
+        return [AvailabilityEvent(c.id, c.donation_id, c.is_held) for c in changes]
+
+    def run_forever(self) -> None:
+        """Poll every ``poll_interval_seconds`` until ``stop()`` is called."""
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("availability broker poll failed")
+            self._stop.wait(self.poll_interval_seconds)
+
+    def ensure_started(self) -> None:
+        """
+        Start the background thread if it is not already running.
+
+        The first poll runs in the caller before the thread starts, so once
+        this returns every change newer than ``last_id`` will reach the ring.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            if self.last_id is None:
+                self.poll()
+            self._thread = threading.Thread(
+                target=self.run_forever, name="availability-broker", daemon=True
+            )
+            self._thread.start()
+
+    @property
+    def stopped(self) -> bool:
+        """True once ``stop()`` has been called."""
+        return self._stop.is_set()
+
+    def stop(self) -> None:
+        """Stop polling and release every waiting stream."""
+        self._stop.set()
+        with self._changed:
+            self._changed.notify_all()
@@ -0,0 +1,288 @@
+"""
+Caching Inventory Service
+
+Decorator that wraps any InventoryService with a bounded, TTL-based
+in-process cache so repeated listings and lookups don't each pay a
+round trip to the external inventory API.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any, Callable, Hashable
+
+from services.geo import haversine_miles, within_radius
+from services.inventory_service import InventoryService
+from services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class CachingInventoryService(InventoryService):
+    """
+    InventoryService decorator with TTL, stale-while-revalidate and LRU eviction.
+
+    - Area listings are keyed by a quantized (lat, lng, radius) so nearby
+      searches share an entry. The wrapped service is queried around the
+      snapped center with the radius padded by the largest possible snap
+      distance, so the entry covers every query that maps to its key; each
+      caller's result is then filtered to its own center and radius, and
+      matches what the wrapped service would return for the exact query.
+    - Single donations are cached per ID. Unknown IDs are not cached.
+    - Entries younger than ``ttl_seconds`` are served as-is. Entries up to
+      ``stale_seconds`` past their TTL are served immediately while one
+      background refresh fetches a fresh copy. Older entries are refetched
+      synchronously.
+    - At most ``max_entries`` entries are kept; the least recently used
+      entry is evicted first.
+    - Loads, including batch refetches, go through a SingleFlight group
+      keyed by the cache key, so when a popular entry is missing or expired,
+      concurrent callers share one fetch instead of all hitting the wrapped
+      service.
+
+    Callers always receive copies, so mutating a returned dict (e.g. adding
+    ``isHeld``) never leaks into the cache.
+
+    The snapshot version is built only from state every worker process
+    shares, so all workers hand out the same ETag for the same listing:
+    the wrapped service's own version if it reports one, otherwise the
+    current TTL bucket of the wall clock. When the wrapped version moves,
+    cached entries are dropped so the data served matches the version
+    reported. Without one, a refill can change the data within a bucket;
+    revalidating clients then see it at the next bucket, no later than any
+    other reader of a TTL-old entry would.
+
+    Attributes:
+        inner (InventoryService): The wrapped inventory service.
+        ttl_seconds (float): Freshness window of an entry.
+        stale_seconds (float): Extra window in which a stale entry is served
+            while it is revalidated.
+        max_entries (int): Maximum number of cached entries.
+        coordinate_step (float): Lat/lng quantization step in degrees.
+        radius_step (float): Radius quantization step in miles (rounded up).
+    """
+
+    def __init__(
+        self,
+        inner: InventoryService,
+        ttl_seconds: float = 30,
+        stale_seconds: float = 120,
+        max_entries: int = 1024,
+        coordinate_step: float = 0.01,
+        radius_step: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            inner: InventoryService to wrap.
+            ttl_seconds: Seconds an entry is considered fresh.
+            stale_seconds: Seconds after the TTL during which a stale entry is
+                returned while being refreshed in the background.
+            max_entries: Upper bound on cached entries (LRU eviction).
+            coordinate_step: Lat/lng grid size in degrees used for cache keys.
+            radius_step: Radius granularity in miles used for cache keys.
+            clock: Monotonic time source; injectable for tests.
+            wall_clock: Epoch time source for the TTL bucket in the snapshot
+                version; injectable for tests.
+        """
+        self.inner = inner
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.coordinate_step = coordinate_step
+        self.radius_step = radius_step
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._refreshing: set[Hashable] = set()
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._wall_clock = wall_clock
+        self._upstream_version: int | str | None = None
+        self._stats = {"hits": 0, "misses": 0, "stale_hits": 0, "refreshes": 0, "evictions": 0}
+
+    def get_available_donations(
+        self, lat: float | None = None, lng: float | None = None, radius: float = 50
+    ) -> list[dict]:
+        """Return donations in the area, served from a covering cache entry when possible."""
+        q_lat, q_lng, q_radius = self._quantize(lat, lng, radius)
+        if q_lat is None:
+            fetch_radius = q_radius
+        else:
+            fetch_radius = q_radius + self._snap_error_miles(q_lat)
+        donations = self._get(
+            ("area", q_lat, q_lng, q_radius),
+            lambda: self.inner.get_available_donations(q_lat, q_lng, fetch_radius),
+        )
+        if q_lat is not None:
+            donations = within_radius(donations, lat, lng, radius)
+        return [d.copy() for d in donations]
+
+    def get_donation_by_id(self, donation_id: str) -> dict | None:
+        """Return a single donation, served from cache when possible."""
+        donation = self._get(
+            ("donation", donation_id),
+            lambda: self.inner.get_donation_by_id(donation_id),
+        )
+        return donation.copy() if donation is not None else None
+
+    def get_donations_by_ids(self, donation_ids: Iterable[str]) -> dict[str, dict]:
+        """
+        Return several donations, fetching only the uncached ones in one batch.
+
+        Cached entries are served under the same fresh/stale rules as
+        ``get_donation_by_id``; stale ones are refetched with the misses
+        instead of being revalidated in the background. The refetch goes
+        through the SingleFlight group keyed by the set of IDs, so
+        concurrent requests for the same missing donations share one batch.
+        """
+        found = {}
+        missing = []
+        now = self._clock()
+        with self._lock:
+            for donation_id in dict.fromkeys(donation_ids):
+                key = ("donation", donation_id)
+                entry = self._entries.get(key)
+                if entry is not None and now - entry[1] < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    found[donation_id] = entry[0]
+                else:
+                    self._stats["misses"] += 1
+                    missing.append(donation_id)
+
+        if missing:
+            found.update(self._flights.do(
+                ("donations", frozenset(missing)), lambda: self._load_many(missing)
+            ))
+
+        return {donation_id: d.copy() for donation_id, d in found.items()}
+
+    def get_snapshot_version(self) -> int | str | None:
+        """
+        Return the upstream version or the current TTL bucket (see class docstring).
+
+        Returns:
+            Version, or None when entries are never fresh
+            (``ttl_seconds <= 0``) and the wrapped service reports no version.
+        """
+        upstream = self.inner.get_snapshot_version()
+        if upstream is None:
+            if self.ttl_seconds <= 0:
+                return None
+            # Upstream can't say when it changes; assume it may have once per TTL
+            return f"t{int(self._wall_clock() // self.ttl_seconds)}"
+        with self._lock:
+            if upstream != self._upstream_version:
+                self._entries.clear()
+                self._upstream_version = upstream
+        return upstream
+
+    def stats(self) -> dict:
+        """
+        Return cache counters.
+
+        Returns:
+            Dict with hits, misses, stale_hits, refreshes, evictions, size,
+            hit_ratio (fresh + stale hits over all lookups) and coalesced
+            (misses that shared another caller's in-flight fetch).
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        stats["coalesced"] = self._flights.stats()["coalesced"]
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def invalidate(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def _quantize(
+        self, lat: float | None, lng: float | None, radius: float
+    ) -> tuple[float | None, float | None, float]:
+        """Snap a query to the cache grid; radius is rounded up so coverage never shrinks."""
+        if lat is None or lng is None:
+            return None, None, radius
+        step = self.coordinate_step
+        q_lat = round(round(lat / step) * step, 6)
+        q_lng = round(round(lng / step) * step, 6)
+        q_radius = math.ceil(radius / self.radius_step) * self.radius_step
+        return q_lat, q_lng, q_radius
+
+    def _snap_error_miles(self, q_lat: float) -> float:
+        """
+        Upper bound on the distance between a query center and the grid
+        point ``_quantize`` snapped it to.
+
+        The farthest point of a cell is a corner on its equator side, where
+        a degree of longitude is widest. A little extra is allowed for the
+        rounding of snapped coordinates to six decimals.
+        """
+        half = self.coordinate_step / 2 + 1e-6
+        corner_lat = max(-90.0, min(90.0, q_lat - math.copysign(half, q_lat)))
+        return haversine_miles(q_lat, 0.0, corner_lat, half)
+
+    def _get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Look up a key, applying fresh / stale-while-revalidate / miss rules."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, fetched_at = entry
+                age = now - fetched_at
+                if age < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value
+                if age < self.ttl_seconds + self.stale_seconds:
+                    self._entries.move_to_end(key)
+                    self._stats["stale_hits"] += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh, args=(key, load), daemon=True
+                        ).start()
+                    return value
+            self._stats["misses"] += 1
+
+        return self._flights.do(key, lambda: self._load(key, load))
+
+    def _refresh(self, key: Hashable, load: Callable[[], Any]) -> None:
+        """Background revalidation of a stale entry."""
+        try:
+            self._flights.do(key, lambda: self._load(key, load))
+            with self._lock:
+                self._stats["refreshes"] += 1
+        except Exception:
+            logger.exception("inventory cache refresh failed for %r", key)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Fetch a value from the wrapped service and cache it unless it is None."""
+        value = load()
+        if value is not None:
+            self._store(key, value)
+        return value
+
+    def _load_many(self, donation_ids: list[str]) -> dict[str, dict]:
+        """Fetch donations from the wrapped service in one batch and cache them."""
+        fetched = self.inner.get_donations_by_ids(donation_ids)
+        for donation_id, donation in fetched.items():
+            self._store(("donation", donation_id), donation)
+        return fetched
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """Insert or replace an entry, evicting least recently used ones over capacity."""
+        with self._lock:
+            self._entries[key] = (value, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
@@ -0,0 +1,84 @@
+"""
+Coalescing Inventory Service
+
+Decorator that wraps any InventoryService with single-flight request
+coalescing, so concurrent identical calls share one round trip to the
+external inventory API whether or not the inventory cache is enabled.
+"""
+from collections.abc import Iterable
+
+from services.inventory_service import InventoryService
+from services.single_flight import SingleFlight
+
+
+class CoalescingInventoryService(InventoryService):
+    """
+    InventoryService decorator that collapses concurrent identical calls.
+
+    - Area listings are keyed by the exact ``(lat, lng, radius)``.
+    - Single lookups are keyed by donation ID.
+    - Batch lookups are keyed by the set of requested IDs, so two requests
+      for the same donations in a different order share one call.
+
+    Nothing is remembered once a call returns; that is the job of
+    ``CachingInventoryService``, which sits in front of this decorator when
+    enabled. Every caller receives its own copies, so one request mutating
+    a result (e.g. adding ``isHeld``) never leaks into another's.
+
+    Attributes:
+        inner (InventoryService): The wrapped inventory service.
+    """
+
+    def __init__(self, inner: InventoryService) -> None:
+        """
+        Args:
+            inner: InventoryService to wrap.
+        """
+        self.inner = inner
+        self._flights = SingleFlight()
+
+    def get_available_donations(
+        self, lat: float | None = None, lng: float | None = None, radius: float = 50
+    ) -> list[dict]:
+        """Return donations in the area, sharing any identical call in flight."""
+        donations = self._flights.do(
+            ("area", lat, lng, radius),
+            lambda: self.inner.get_available_donations(lat, lng, radius),
+        )
+        return [d.copy() for d in donations]
+
+    def get_donation_by_id(self, donation_id: str) -> dict | None:
+        """Return a single donation, sharing any lookup of it in flight."""
+        donation = self._flights.do(
+            ("donation", donation_id),
+            lambda: self.inner.get_donation_by_id(donation_id),
+        )
+        return donation.copy() if donation is not None else None
+
+    def get_donations_by_ids(self, donation_ids: Iterable[str]) -> dict[str, dict]:
+        """Return several donations, sharing any batch for the same IDs in flight."""
+        donation_ids = list(dict.fromkeys(donation_ids))
+        if not donation_ids:
+            return {}
+        found = self._flights.do(
+            ("donations", frozenset(donation_ids)),
+            lambda: self.inner.get_donations_by_ids(donation_ids),
+        )
+        return {donation_id: d.copy() for donation_id, d in found.items()}
+
+    def get_snapshot_version(self) -> int | str | None:
+        return self.inner.get_snapshot_version()
+
+    def stats(self) -> dict:
+        """
+        Return coalescing counters.
+
+        Returns:
+            Dict with executions, coalesced, errors, in_flight and
+            coalesce_ratio (see ``SingleFlight.stats``).
+        """
+        return self._flights.stats()
+
+    def __getattr__(self, name: str):
+        # Pass through adapter extras (upsert_donation(), close(), ...)
+        return getattr(self.inner, name)
@@ -0,0 +1,181 @@
+"""
+Geo Utilities
+
+Great-circle distance and an in-process uniform-grid spatial index for
+answering "what is within R miles of this point" without scanning every
+donation. Independent of any particular InventoryService implementation.
+"""
+import math
+from typing import Iterable
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Miles spanned by one degree of latitude
+MILES_PER_DEGREE_LAT = 69.0
+
+
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Great-circle distance between two points.
+
+    Args:
+        lat1: Latitude of the first point in degrees.
+        lng1: Longitude of the first point in degrees.
+        lat2: Latitude of the second point in degrees.
+        lng2: Longitude of the second point in degrees.
+
+    Returns:
+        Distance in miles.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def within_radius(donations: Iterable[dict], lat: float, lng: float, radius: float) -> list[dict]:
+    """
+    Exact radius filter for donation dicts carrying ``lat``/``lng`` keys.
+
+    Args:
+        donations: Candidate donations.
+        lat: Latitude of the search center.
+        lng: Longitude of the search center.
+        radius: Search radius in miles.
+
+    Returns:
+        The donations whose great-circle distance from the center is <= radius.
+    """
+    return [
+        d for d in donations
+        if haversine_miles(lat, lng, d["lat"], d["lng"]) <= radius
+    ]
+
+
+def bounding_box(lat: float, lng: float, radius: float) -> tuple[float, float, float, float]:
+    """
+    Lat/lng box enclosing a circle of ``radius`` miles around (lat, lng).
+
+    Longitude bounds may fall outside [-180, 180] when the circle crosses
+    the antimeridian; near the poles the box spans every longitude.
+
+    Returns:
+        Tuple of (min_lat, min_lng, max_lat, max_lng).
+    """
+    d_lat = radius / MILES_PER_DEGREE_LAT
+    max_abs_lat = min(90.0, abs(lat) + d_lat)
+    cos_lat = math.cos(math.radians(max_abs_lat))
+    if cos_lat < 1e-6 or radius / (MILES_PER_DEGREE_LAT * cos_lat) >= 180:
+        d_lng = 180.0
+        lng = 0.0
+    else:
+        d_lng = radius / (MILES_PER_DEGREE_LAT * cos_lat)
+    return max(-90.0, lat - d_lat), lng - d_lng, min(90.0, lat + d_lat), lng + d_lng
+
+
+class SpatialGridIndex:
+    """
+    Uniform lat/lng grid index over point items.
+
+    Items are bucketed by the grid cell containing their coordinates. A
+    radius query visits only the cells overlapping the query's bounding box
+    (wrapping across the antimeridian) and then applies an exact haversine
+    filter. Items can be added, moved and removed incrementally, so the
+    index never needs a full rebuild when inventory changes.
+
+    Attributes:
+        cell_degrees (float): Edge length of a grid cell in degrees.
+    """
+
+    def __init__(self, cell_degrees: float = 0.1) -> None:
+        """
+        Args:
+            cell_degrees: Cell size in degrees. ~0.1 (about 7 miles of
+                latitude) suits city-scale searches.
+        """
+        self.cell_degrees = cell_degrees
+        self._lat_cells = math.ceil(180 / cell_degrees)
+        self._lng_cells = math.ceil(360 / cell_degrees)
+        self._cells: dict[tuple[int, int], dict[str, tuple[float, float]]] = {}
+        self._item_cells: dict[str, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._item_cells)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._item_cells
+
+    def add(self, item_id: str, lat: float, lng: float) -> None:
+        """Insert an item, or move it if it is already indexed."""
+        cell = self._cell_for(lat, lng)
+        previous = self._item_cells.get(item_id)
+        if previous is not None and previous != cell:
+            self._discard(item_id, previous)
+        self._cells.setdefault(cell, {})[item_id] = (lat, lng)
+        self._item_cells[item_id] = cell
+
+    def remove(self, item_id: str) -> None:
+        """Remove an item if present."""
+        cell = self._item_cells.pop(item_id, None)
+        if cell is not None:
+            self._discard(item_id, cell)
+
+    def query(self, lat: float, lng: float, radius: float) -> list[str]:
+        """
+        Return IDs of items within ``radius`` miles of (lat, lng).
+
+        Args:
+            lat: Latitude of the search center.
+            lng: Longitude of the search center.
+            radius: Search radius in miles.
+
+        Returns:
+            Matching item IDs, in no particular order.
+        """
+        matches = []
+        for cell in self._candidate_cells(lat, lng, radius):
+            for item_id, (item_lat, item_lng) in self._cells.get(cell, {}).items():
+                if haversine_miles(lat, lng, item_lat, item_lng) <= radius:
+                    matches.append(item_id)
+        return matches
+
+    def _cell_for(self, lat: float, lng: float) -> tuple[int, int]:
+        row = min(int((lat + 90) // self.cell_degrees), self._lat_cells - 1)
+        col = int(((lng + 180) % 360) // self.cell_degrees) % self._lng_cells
+        return row, col
+
+    def _discard(self, item_id: str, cell: tuple[int, int]) -> None:
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            return
+        bucket.pop(item_id, None)
+        if not bucket:
+            del self._cells[cell]
+
+    def _candidate_cells(self, lat: float, lng: float, radius: float) -> Iterable[tuple[int, int]]:
+        """Cells overlapping the query's bounding box (or all occupied cells if fewer)."""
+        d_lat = radius / MILES_PER_DEGREE_LAT
+        row_lo = max(0, int((lat - d_lat + 90) // self.cell_degrees))
+        row_hi = min(self._lat_cells - 1, int((lat + d_lat + 90) // self.cell_degrees))
+
+        # Longitude degrees shrink toward the poles; near them, scan all columns
+        max_abs_lat = min(90.0, abs(lat) + d_lat)
+        cos_lat = math.cos(math.radians(max_abs_lat))
+        if cos_lat < 1e-6 or radius / (MILES_PER_DEGREE_LAT * cos_lat) >= 180:
+            cols = range(self._lng_cells)
+        else:
+            d_lng = radius / (MILES_PER_DEGREE_LAT * cos_lat)
+            col_lo = int((lng - d_lng + 180) // self.cell_degrees)
+            col_hi = int((lng + d_lng + 180) // self.cell_degrees)
+            cols = [c % self._lng_cells for c in range(col_lo, col_hi + 1)]
+
+        box_size = (row_hi - row_lo + 1) * len(cols)
+        if box_size > len(self._cells):
+            # Huge radius: cheaper to walk occupied cells than the bounding box
+            col_set = set(cols)
+            return [
+                cell for cell in self._cells
+                if row_lo <= cell[0] <= row_hi and cell[1] in col_set
+            ]
+        return [(row, col) for row in range(row_lo, row_hi + 1) for col in cols]
@@ -0,0 +1,63 @@
+"""
+History Export
+
+Serializes a stream of PickupHistory records as NDJSON or CSV text
+chunks, suitable for a streaming HTTP response or writing to a file.
+Only one chunk of records is held in memory at a time.
+"""
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+
+from models.pickup_history import PickupHistory
+
+# Field order for CSV output; matches PickupHistory.to_dict keys
+CSV_FIELDS = [
+    "id",
+    "userId",
+    "donationId",
+    "donationDescription",
+    "donorContact",
+    "pickupLocation",
+    "completedAt",
+]
+
+# Records serialized per yielded text chunk
+RECORDS_PER_CHUNK = 500
+
+
+def iter_ndjson(records: Iterable[PickupHistory]) -> Iterator[str]:
+    """Yield newline-delimited JSON, one object per record."""
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record.to_dict()))
+        if len(lines) >= RECORDS_PER_CHUNK:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def iter_csv(records: Iterable[PickupHistory]) -> Iterator[str]:
+    """Yield CSV text with a header row, one row per record."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    count = 0
+    for record in records:
+        writer.writerow(record.to_dict())
+        count += 1
+        if count % RECORDS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+# format name -> (mimetype, serializer)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", iter_ndjson),
+    "csv": ("text/csv", iter_csv),
+}
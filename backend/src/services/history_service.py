@@ -4,8 +4,17 @@ History Service
 Stores and retrieves chronological record of a user's completed
 donation pickups.
 """
+from collections.abc import Iterator
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from db_routing import read_replica
 from extensions import db
 from models.pickup_history import PickupHistory
+from services import unit_of_work
+from services.pagination import Page, keyset_page
+from services.pickup_stats_service import PickupStatsService
 
 
 class HistoryService:
@@ -22,6 +31,7 @@ class HistoryService:
         Record a completed pickup in the user's history.
 
         Called by ReservationService after a hold is confirmed as picked up.
+        The pickup is counted in the stats rollups in the same transaction.
 
         Args:
             user_id: ID of the user who completed the pickup.
@@ -39,9 +49,11 @@ class HistoryService:
             donation_description=donation_description,
             donor_contact=donor_contact,
             pickup_location=pickup_location,
+            completed_at=datetime.now(timezone.utc),
         )
         db.session.add(record)
-        db.session.commit()
+        PickupStatsService.stage_pickup(user_id, donor_contact, record.completed_at)
+        unit_of_work.commit()
         return record
 
     @staticmethod
@@ -55,9 +67,72 @@ class HistoryService:
         Returns:
             List of PickupHistory records ordered by completed_at descending.
         """
-        return (
-            PickupHistory.query
-            .filter_by(user_id=user_id)
-            .order_by(PickupHistory.completed_at.desc())
-            .all()
-        )
\ No newline at end of file
+        with read_replica(user_id):
+            return (
+                PickupHistory.query
+                .filter_by(user_id=user_id)
+                .order_by(PickupHistory.completed_at.desc())
+                .all()
+            )
+
+    @staticmethod
+    def get_history_page(user_id: int, limit: int, cursor: str | None = None) -> Page:
+        """
+        Retrieve one page of a user's completed pickups, newest first.
+
+        Uses keyset pagination on (completed_at, id), so every page costs
+        the same no matter how far the client has scrolled.
+
+        Args:
+            user_id: ID of the user.
+            limit: Maximum number of records on the page.
+            cursor: ``next_cursor`` from the previous page, or None.
+
+        Returns:
+            Page of PickupHistory records and the cursor for the next page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        with read_replica(user_id):
+            return keyset_page(
+                PickupHistory.query.filter_by(user_id=user_id),
+                PickupHistory.completed_at,
+                PickupHistory.id,
+                limit,
+                cursor,
+            )
+
+
+    @staticmethod
+    def iter_history(
+        user_id: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[PickupHistory]:
+        """
+        Stream pickup records across all users in primary-key order.
+
+        Rows are fetched from a server-side cursor ``chunk_size`` at a time,
+        so memory stays flat no matter how large the table is.
+
+        Args:
+            user_id: If given, only this user's pickups.
+            start: If given, only pickups completed at or after this time.
+            end: If given, only pickups completed before this time.
+            chunk_size: Rows fetched from the database per round trip.
+
+        Yields:
+            PickupHistory records.
+        """
+        stmt = select(PickupHistory).order_by(PickupHistory.id)
+        if user_id is not None:
+            stmt = stmt.where(PickupHistory.user_id == user_id)
+        if start is not None:
+            stmt = stmt.where(PickupHistory.completed_at >= start)
+        if end is not None:
+            stmt = stmt.where(PickupHistory.completed_at < end)
+
+        result = db.session.execute(stmt.execution_options(yield_per=chunk_size))
+        yield from result.scalars()
@@ -0,0 +1,25 @@
+"""
+Hold Domain Events
+
+Blinker signals sent by HoldService on hold lifecycle transitions, so
+cross-cutting consumers (metrics, notifications) can subscribe without
+HoldService knowing about them. Write events are sent only after the
+change is committed. Receivers run synchronously in the request thread
+and must be cheap.
+
+Every signal is sent with ``HoldService`` as the sender.
+"""
+from blinker import Namespace
+
+_signals = Namespace()
+
+#: A hold was placed. kwargs: hold
+hold_created = _signals.signal("hold-created")
+#: A hold request lost to an existing hold or pickup. kwargs: donation_id
+hold_conflicted = _signals.signal("hold-conflicted")
+#: Holds lapsed and were marked expired. kwargs: count
+holds_expired = _signals.signal("holds-expired")
+#: A hold was picked up. kwargs: hold
+hold_completed = _signals.signal("hold-completed")
+#: A hold was cancelled by its owner. kwargs: hold
+hold_cancelled = _signals.signal("hold-cancelled")
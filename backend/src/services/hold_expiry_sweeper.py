@@ -0,0 +1,121 @@
+"""
+Hold Expiry Sweeper
+
+Periodically expires lapsed holds with a single set-based UPDATE so that
+read endpoints never have to write, and prunes old availability changes.
+Runs either as a background thread
+inside the app or as a standalone worker (``flask sweep-holds``).
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask
+
+from services.hold_service import HoldService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """
+    Outcome of a single sweep.
+
+    Attributes:
+        expired (int): Number of holds flipped to EXPIRED.
+        duration_ms (float): Wall time of the sweep in milliseconds.
+        pruned (int): Number of availability changes deleted.
+    """
+    expired: int
+    duration_ms: float
+    pruned: int = 0
+
+
+class HoldExpirySweeper:
+    """
+    Runs HoldService.expire_stale_holds on a fixed interval, followed by
+    HoldService.prune_availability_changes when a retention is set.
+
+    The background thread is started lazily on the first request handled by
+    the process, so it is never spawned by CLI commands and always lives in
+    the process that serves traffic (e.g. after a pre-fork server forks).
+
+    Attributes:
+        app (Flask): Application whose context each sweep runs in.
+        interval_seconds (float): Delay between sweeps.
+        change_retention (timedelta | None): Age after which availability
+            changes are deleted; None keeps them forever.
+        last_result (SweepResult | None): Result of the most recent sweep.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        interval_seconds: float,
+        change_retention: timedelta | None = None,
+    ) -> None:
+        """
+        Args:
+            app: Flask application to push an app context for.
+            interval_seconds: Seconds between sweeps. Must be positive.
+            change_retention: Prune availability changes older than this.
+        """
+        self.app = app
+        self.interval_seconds = interval_seconds
+        self.change_retention = change_retention
+        self.last_result: SweepResult | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def sweep(self) -> SweepResult:
+        """
+        Expire all lapsed holds once and report what happened.
+
+        Returns:
+            SweepResult with the number of expired holds and pruned
+            changes, and the elapsed time.
+        """
+        started = time.perf_counter()
+        pruned = 0
+        with self.app.app_context():
+            expired = HoldService.expire_stale_holds()
+            if self.change_retention is not None:
+                cutoff = datetime.now(timezone.utc) - self.change_retention
+                pruned = HoldService.prune_availability_changes(cutoff)
+        result = SweepResult(expired, (time.perf_counter() - started) * 1000, pruned)
+        self.last_result = result
+        logger.info(
+            "hold expiry sweep: expired=%d pruned=%d duration_ms=%.1f",
+            result.expired, result.pruned, result.duration_ms,
+        )
+        return result
+
+    def run_forever(self) -> None:
+        """Sweep every ``interval_seconds`` until ``stop()`` is called."""
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("hold expiry sweep failed")
+            self._stop.wait(self.interval_seconds)
+
+    def ensure_started(self) -> None:
+        """Start the background thread if it is not already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self.run_forever, name="hold-expiry-sweeper", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Signal the background thread to exit after its current sweep."""
+        self._stop.set()
@@ -6,10 +6,35 @@ Enforces the 2-hour reservation timeout. Responsible for ensuring
 no double-booking (each donation claimed by at most one recipient).
 """
 
+from collections.abc import Iterable
 from datetime import datetime, timezone
 
+from sqlalchemy import and_, delete, exists, func, insert, literal, or_, select, union_all, update
+
+from db_routing import read_replica
+from db_utils import insert_ignore
 from extensions import db
+from models.availability_change import AvailabilityChange
+from models.donation_availability import DonationAvailability
 from models.hold import Hold, HoldStatus
+from models.hold_archive import HoldArchive
+from services import unit_of_work
+from services.hold_events import (
+    hold_cancelled, hold_completed, hold_conflicted, hold_created, holds_expired,
+)
+from services.pagination import Page, keyset_page, merge_pages
+
+# Max donation IDs per availability lookup query
+AVAILABILITY_LOOKUP_CHUNK = 500
+
+# States a hold never leaves; only these are moved to holds_archive
+ARCHIVABLE_STATUSES = (HoldStatus.EXPIRED, HoldStatus.CANCELLED, HoldStatus.COMPLETED)
+
+# Columns copied verbatim from holds to holds_archive
+_ARCHIVED_COLUMNS = [
+    "id", "user_id", "donation_id", "status", "created_at",
+    "expires_at", "completed_at", "cancelled_at",
+]
 
 
 class HoldService:
@@ -19,37 +44,91 @@ class HoldService:
         """
         Create a new hold on a donation for a user.
 
-        Checks all existing "active" holds for this donation. If any are
-        genuinely active (not time-expired), the request is rejected.
-        Stale holds are lazily marked as expired.
+        Double-booking is prevented by the database, not by a read-then-write
+        check: the hold claims the donation's DonationAvailability row, whose
+        primary key allows only one owner. A slot owned by a hold that has
+        lapsed but not yet been swept is taken over with a conditional UPDATE
+        and the lapsed hold is marked expired. Everything happens in a single
+        transaction; a caller that loses a race simply gets None. A losing
+        claim writes nothing, so its provisional hold row is deleted rather
+        than rolling back, which would also discard an enclosing
+        UnitOfWork's changes.
 
         Args:
             user_id: ID of the user placing the hold.
             donation_id: ID of the donation to reserve.
 
         Returns:
-            The new Hold on success, or None if the donation is already held.
+            The new Hold on success, or None if the donation is already held
+            or has been picked up.
         """
-        existing = Hold.query.filter_by(
-            donation_id=donation_id, status=HoldStatus.ACTIVE
-        ).all()
-        changed = False
-
-        for h in existing:
-            if h.is_active:
-                return None  # Donation already claimed
-            else:
-                h.status = HoldStatus.EXPIRED
-                changed = True
-
-        if changed:
-            db.session.commit()
-
         hold = Hold(user_id=user_id, donation_id=donation_id)
         db.session.add(hold)
-        db.session.commit()
+        db.session.flush()
+
+        if not HoldService._claim_donation(hold):
+            db.session.delete(hold)
+            unit_of_work.commit()
+            hold_conflicted.send(HoldService, donation_id=donation_id)
+            return None
+
+        unit_of_work.commit()
+        unit_of_work.on_commit(lambda: hold_created.send(HoldService, hold=hold))
         return hold
 
+    @staticmethod
+    def create_holds(
+        user_id: int, donation_ids: list[str], all_or_nothing: bool = False
+    ) -> dict[str, Hold | None]:
+        """
+        Create holds on several donations for one user in a single transaction.
+
+        Each donation is claimed the same way as in ``create_hold``. A
+        donation that is already taken is skipped (its provisional hold row
+        is removed) without disturbing the others. With ``all_or_nothing``,
+        the batch runs inside a SAVEPOINT and any conflict rolls back to it,
+        leaving earlier work in the caller's transaction intact.
+
+        Args:
+            user_id: ID of the user placing the holds.
+            donation_ids: Distinct donation IDs to reserve.
+            all_or_nothing: If True, persist nothing unless every claim succeeds.
+
+        Returns:
+            Dict mapping each donation ID to its new Hold, or None if that
+            donation was already held or picked up. If ``all_or_nothing`` and
+            any value is None, none of the returned holds were persisted.
+        """
+        results: dict[str, Hold | None] = {}
+        savepoint = db.session.begin_nested() if all_or_nothing else None
+        for donation_id in donation_ids:
+            hold = Hold(user_id=user_id, donation_id=donation_id)
+            db.session.add(hold)
+            db.session.flush()
+            if HoldService._claim_donation(hold):
+                results[donation_id] = hold
+            else:
+                results[donation_id] = None
+                if not all_or_nothing:
+                    db.session.delete(hold)
+                    db.session.flush()
+
+        if all_or_nothing and None in results.values():
+            savepoint.rollback()
+            unit_of_work.commit()
+        else:
+            if savepoint is not None:
+                savepoint.commit()
+            unit_of_work.commit()
+            created = [h for h in results.values() if h is not None]
+            unit_of_work.on_commit(
+                lambda: [hold_created.send(HoldService, hold=h) for h in created]
+            )
+        for donation_id, hold in results.items():
+            if hold is None:
+                hold_conflicted.send(HoldService, donation_id=donation_id)
+        return results
+
     @staticmethod
     def get_hold_by_id(hold_id: int) -> Hold | None:
         """
@@ -63,12 +142,29 @@ class HoldService:
         """
         return db.session.get(Hold, hold_id)
 
+    @staticmethod
+    def get_holds_by_ids(hold_ids: list[int]) -> dict[int, Hold]:
+        """
+        Retrieve several holds by ID in one query.
+
+        Args:
+            hold_ids: Primary keys of the holds.
+
+        Returns:
+            Dict mapping each found hold ID to its Hold.
+        """
+        if not hold_ids:
+            return {}
+        holds = Hold.query.filter(Hold.id.in_(hold_ids)).all()
+        return {h.id: h for h in holds}
+
     @staticmethod
     def get_active_holds_for_user(user_id: int) -> list[Hold]:
         """
         Get all active (non-expired, non-cancelled) holds for a user.
 
-        Lazily expires any stale holds encountered.
+        Holds past their expires_at are filtered out in the query but left
+        untouched; HoldService.expire_stale_holds flips their status.
 
         Args:
             user_id: ID of the user.
@@ -76,37 +172,83 @@ class HoldService:
         Returns:
             List of genuinely active Hold objects.
         """
-        holds = Hold.query.filter_by(
-            user_id=user_id, status=HoldStatus.ACTIVE
-        ).all()
-        active = []
-        changed = False
+        with read_replica(user_id):
+            return Hold.query.filter(
+                Hold.user_id == user_id,
+                Hold.status == HoldStatus.ACTIVE,
+                Hold.expires_at > datetime.now(timezone.utc),
+            ).all()
 
-        for h in holds:
-            if h.is_active:
-                active.append(h)
-            else:
-                h.status = HoldStatus.EXPIRED
-                changed = True
+    @staticmethod
+    def get_all_holds_for_user(
+        user_id: int, include_archived: bool = False
+    ) -> list[Hold | HoldArchive]:
+        """
+        Get all holds (any status) for a user, newest first.
+
+        Args:
+            user_id: ID of the user.
+            include_archived: If True, holds moved to holds_archive are
+                merged in as well.
 
-        if changed:
-            db.session.commit()
-        return active
+        Returns:
+            List of Hold (and HoldArchive) objects ordered by created_at
+            descending.
+        """
+        with read_replica(user_id):
+            holds = Hold.query.filter_by(user_id=user_id).order_by(
+                Hold.created_at.desc()
+            ).all()
+            if not include_archived:
+                return holds
+            archived = HoldArchive.query.filter_by(user_id=user_id).all()
+        return sorted(holds + archived, key=lambda h: (h.created_at, h.id), reverse=True)
 
     @staticmethod
-    def get_all_holds_for_user(user_id: int) -> list[Hold]:
+    def get_holds_page(
+        user_id: int,
+        limit: int,
+        cursor: str | None = None,
+        active_only: bool = False,
+        include_archived: bool = False,
+    ) -> Page:
         """
-        Get all holds (any status) for a user, newest first.
+        Get one page of a user's holds, newest first.
+
+        Uses keyset pagination on (created_at, id), so every page costs the
+        same no matter how far the client has scrolled.
 
         Args:
             user_id: ID of the user.
+            limit: Maximum number of holds on the page.
+            cursor: ``next_cursor`` from the previous page, or None.
+            active_only: If True, only genuinely active holds are paged.
+            include_archived: If True, archived holds are paged too; the two
+                tables are read with the same cursor and merged. Ignored
+                with ``active_only`` since archived holds are never active.
 
         Returns:
-            List of Hold objects ordered by created_at descending.
+            Page of Hold (and HoldArchive) objects and the cursor for the
+            next page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
         """
-        return Hold.query.filter_by(user_id=user_id).order_by(
-            Hold.created_at.desc()
-        ).all()
+        query = Hold.query.filter(Hold.user_id == user_id)
+        if active_only:
+            query = query.filter(
+                Hold.status == HoldStatus.ACTIVE,
+                Hold.expires_at > datetime.now(timezone.utc),
+            )
+        with read_replica(user_id):
+            page = keyset_page(query, Hold.created_at, Hold.id, limit, cursor)
+            if not include_archived or active_only:
+                return page
+            archived = keyset_page(
+                HoldArchive.query.filter(HoldArchive.user_id == user_id),
+                HoldArchive.created_at, HoldArchive.id, limit, cursor,
+            )
+        return merge_pages([page, archived], limit, "created_at", "id")
 
     @staticmethod
     def cancel_hold(hold_id: int) -> Hold | None:
@@ -125,7 +267,9 @@ class HoldService:
 
         hold.status = HoldStatus.CANCELLED
         hold.cancelled_at = datetime.now(timezone.utc)
-        db.session.commit()
+        HoldService._release_availability(hold)
+        unit_of_work.commit()
+        unit_of_work.on_commit(lambda: hold_cancelled.send(HoldService, hold=hold))
         return hold
 
     @staticmethod
@@ -145,35 +289,405 @@ class HoldService:
 
         hold.status = HoldStatus.COMPLETED
         hold.completed_at = datetime.now(timezone.utc)
-        db.session.commit()
+        # The claim row normally exists; update it in place rather than merge(),
+        # which would SELECT it first
+        updated = db.session.execute(
+            update(DonationAvailability)
+            .where(DonationAvailability.donation_id == hold.donation_id)
+            .values(hold_id=hold.id, status=HoldStatus.COMPLETED)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not updated:
+            insert_ignore(DonationAvailability, {
+                "donation_id": hold.donation_id,
+                "hold_id": hold.id,
+                "status": HoldStatus.COMPLETED,
+            })
+        HoldService._record_change(hold.donation_id, is_held=True)
+        unit_of_work.commit()
+        unit_of_work.on_commit(lambda: hold_completed.send(HoldService, hold=hold))
         return hold
 
     @staticmethod
-    def get_held_donation_ids() -> set[str]:
+    def expire_stale_holds() -> int:
+        """
+        Mark every active hold past its expires_at as EXPIRED.
+
+        Issues one set-based UPDATE on holds (plus one DELETE releasing their
+        availability rows and one INSERT logging the releases) in a single
+        transaction, regardless of how many holds have lapsed.
+
+        Returns:
+            Number of holds that were expired.
+        """
+        now = datetime.now(timezone.utc)
+        stale = select(Hold.id).where(
+            Hold.status == HoldStatus.ACTIVE, Hold.expires_at < now
+        )
+        released = select(
+            DonationAvailability.donation_id, literal(False), literal(now)
+        ).where(
+            DonationAvailability.status == HoldStatus.ACTIVE,
+            DonationAvailability.hold_id.in_(stale),
+        )
+        db.session.execute(
+            insert(AvailabilityChange).from_select(
+                ["donation_id", "is_held", "changed_at"], released
+            )
+        )
+        db.session.execute(
+            delete(DonationAvailability)
+            .where(
+                DonationAvailability.status == HoldStatus.ACTIVE,
+                DonationAvailability.hold_id.in_(stale),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = db.session.execute(
+            update(Hold)
+            .where(Hold.status == HoldStatus.ACTIVE, Hold.expires_at < now)
+            .values(status=HoldStatus.EXPIRED)
+            .execution_options(synchronize_session=False)
+        )
+        unit_of_work.commit()
+        expired = result.rowcount
+        if expired:
+            unit_of_work.on_commit(lambda: holds_expired.send(HoldService, count=expired))
+        return expired
+
+    @staticmethod
+    def archive_terminal_holds(cutoff: datetime, batch_size: int) -> int:
+        """
+        Move one batch of long-finished holds from holds to holds_archive.
+
+        Picks up to ``batch_size`` holds in a terminal state whose
+        expires_at is before ``cutoff`` (a hold always ends by its
+        expires_at, so this is "finished before cutoff"), copies them with
+        one INSERT ... SELECT and deletes them, in a single transaction.
+        The highest hold ID is never moved, so databases that hand out
+        max(id) + 1 cannot reuse an archived ID.
+
+        Args:
+            cutoff: Only holds that expired before this UTC time move.
+            batch_size: Maximum number of holds to move.
+
+        Returns:
+            Number of holds archived; less than ``batch_size`` once the
+            backlog is drained.
+        """
+        newest = select(func.max(Hold.id)).scalar_subquery()
+        ids = db.session.scalars(
+            select(Hold.id)
+            .where(
+                Hold.status.in_(ARCHIVABLE_STATUSES),
+                Hold.expires_at < cutoff,
+                Hold.id < newest,
+            )
+            .order_by(Hold.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            return 0
+
+        archived_at = datetime.now(timezone.utc)
+        db.session.execute(
+            insert(HoldArchive).from_select(
+                [*_ARCHIVED_COLUMNS, "archived_at"],
+                select(
+                    *[getattr(Hold, c) for c in _ARCHIVED_COLUMNS], literal(archived_at)
+                ).where(Hold.id.in_(ids)),
+            )
+        )
+        db.session.execute(
+            delete(Hold)
+            .where(Hold.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        unit_of_work.commit()
+        return len(ids)
+
+    @staticmethod
+    def get_held_donation_ids(donation_ids: Iterable[str] | None = None) -> set[str]:
         """
         Return donation IDs that are currently unavailable.
 
-        Includes actively held donations and completed pickups.
-        Lazily expires any stale holds encountered.
+        Includes actively held donations and completed pickups. Answered from
+        the DonationAvailability table by primary key, so the cost grows with
+        the number of IDs asked about rather than with hold history. Active
+        rows are joined to their hold by primary key so that holds whose
+        expires_at has passed count as available; nothing is written.
+
+        Args:
+            donation_ids: Donation IDs to check. If None, every unavailable
+                donation is returned.
 
         Returns:
             Set of donation ID strings that should not be available.
         """
-        holds = Hold.query.filter(
-            Hold.status.in_([HoldStatus.ACTIVE, HoldStatus.COMPLETED])
-        ).all()
+        query = (
+            db.session.query(DonationAvailability.donation_id)
+            .outerjoin(Hold, Hold.id == DonationAvailability.hold_id)
+            .filter(or_(
+                DonationAvailability.status == HoldStatus.COMPLETED,
+                and_(
+                    Hold.status == HoldStatus.ACTIVE,
+                    Hold.expires_at > datetime.now(timezone.utc),
+                ),
+            ))
+        )
+        if donation_ids is None:
+            return {donation_id for (donation_id,) in query}
+
+        donation_ids = list(donation_ids)
         unavailable_ids = set()
-        changed = False
+        # Chunk the IN list to stay under bound-parameter limits
+        for start in range(0, len(donation_ids), AVAILABILITY_LOOKUP_CHUNK):
+            chunk = donation_ids[start:start + AVAILABILITY_LOOKUP_CHUNK]
+            rows = query.filter(DonationAvailability.donation_id.in_(chunk))
+            unavailable_ids.update(donation_id for (donation_id,) in rows)
+        return unavailable_ids
 
-        for h in holds:
-            if h.status == HoldStatus.COMPLETED:
-                unavailable_ids.add(h.donation_id)
-            elif h.is_active:
-                unavailable_ids.add(h.donation_id)
-            else:
-                h.status = HoldStatus.EXPIRED
-                changed = True
+    @staticmethod
+    def get_availability_version() -> int:
+        """
+        Return the global availability version.
+
+        The version is the ID of the newest AvailabilityChange. It increases
+        with every hold create, cancel, complete and sweep, so two equal
+        versions mean no donation changed availability in between (other
+        than holds that lapsed and have not been swept yet). Costs one
+        index lookup and never reads the holds table.
+
+        Returns:
+            Current version, or 0 if nothing has changed yet.
+        """
+        return db.session.scalar(select(func.max(AvailabilityChange.id))) or 0
+
+    @staticmethod
+    def get_availability_state() -> tuple[int, datetime | None]:
+        """
+        Return the availability version and the next time an active hold lapses.
+
+        A hold that lapses frees its donation without recording a change
+        until the sweeper runs, so the version alone can stay put while
+        availability changes. The next lapse time moves each time the clock
+        passes one, which covers that gap. Both values come from one query:
+        an index lookup on availability_changes and one on
+        (holds.status, holds.expires_at).
+
+        Returns:
+            Tuple of the availability version (see
+            ``get_availability_version``) and the earliest future
+            ``expires_at`` of an active hold, or None if there is none.
+        """
+        now = datetime.now(timezone.utc)
+        version = select(func.max(AvailabilityChange.id)).scalar_subquery()
+        next_lapse = select(func.min(Hold.expires_at)).where(
+            Hold.status == HoldStatus.ACTIVE, Hold.expires_at > now
+        ).scalar_subquery()
+        row = db.session.execute(select(version, next_lapse)).one()
+        return row[0] or 0, row[1]
+
+    @staticmethod
+    def get_oldest_availability_change_id() -> int | None:
+        """
+        Return the ID of the oldest availability change still kept.
+
+        Changes before it were pruned, so they can no longer be replayed.
+
+        Returns:
+            Oldest change ID, or None if no change has been recorded.
+        """
+        return db.session.scalar(select(func.min(AvailabilityChange.id)))
+
+    @staticmethod
+    def prune_availability_changes(cutoff: datetime) -> int:
+        """
+        Delete availability changes recorded before ``cutoff``.
+
+        Keeps the log from growing without bound. The newest change is always
+        kept, so the availability version never goes backwards.
+
+        Args:
+            cutoff: Changes older than this UTC time are deleted.
 
-        if changed:
-            db.session.commit()
-        return unavailable_ids
\ No newline at end of file
+        Returns:
+            Number of changes deleted.
+        """
+        newest = HoldService.get_availability_version()
+        # A literal bound rather than a subquery: MySQL rejects DELETEs that
+        # select from their own table
+        result = db.session.execute(
+            delete(AvailabilityChange)
+            .where(AvailabilityChange.changed_at < cutoff, AvailabilityChange.id < newest)
+            .execution_options(synchronize_session=False)
+        )
+        unit_of_work.commit()
+        return result.rowcount
+
+    @staticmethod
+    def count_active_holds() -> int:
+        """
+        Count holds that are active and not yet past their expiry.
+
+        Returns:
+            Number of live holds across all users.
+        """
+        now = datetime.now(timezone.utc)
+        return db.session.scalar(
+            select(func.count(Hold.id)).where(
+                Hold.status == HoldStatus.ACTIVE, Hold.expires_at > now
+            )
+        ) or 0
+
+    @staticmethod
+    def get_availability_changes(
+        after_id: int, limit: int, through_id: int | None = None
+    ) -> list[AvailabilityChange]:
+        """
+        Return availability changes newer than a version, oldest first.
+
+        Args:
+            after_id: Only changes with a greater ID are returned.
+            limit: Maximum number of changes to return.
+            through_id: If given, changes with a greater ID are left out.
+
+        Returns:
+            List of AvailabilityChange rows ordered by ID.
+        """
+        query = AvailabilityChange.query.filter(AvailabilityChange.id > after_id)
+        if through_id is not None:
+            query = query.filter(AvailabilityChange.id <= through_id)
+        return query.order_by(AvailabilityChange.id).limit(limit).all()
+
+    @staticmethod
+    def rebuild_availability() -> int:
+        """
+        Recompute the DonationAvailability table from the holds table.
+
+        Repairs the table if it ever drifts from the holds it mirrors.
+        Completed holds take precedence over active ones; archived
+        completed holds count too. Runs as a handful of set-based statements
+        in one transaction, and only logs an availability change for a
+        donation whose held state actually flips.
+
+        Returns:
+            Number of availability rows written.
+        """
+        now = datetime.now(timezone.utc)
+        status_type = DonationAvailability.__table__.c.status.type
+        completed = union_all(
+            select(Hold.donation_id, Hold.id).where(Hold.status == HoldStatus.COMPLETED),
+            select(HoldArchive.donation_id, HoldArchive.id).where(
+                HoldArchive.status == HoldStatus.COMPLETED
+            ),
+        ).subquery()
+        target = union_all(
+            select(
+                completed.c.donation_id,
+                func.max(completed.c.id).label("hold_id"),
+                literal(HoldStatus.COMPLETED, status_type).label("status"),
+            ).group_by(completed.c.donation_id),
+            select(
+                Hold.donation_id,
+                func.min(Hold.id),
+                literal(HoldStatus.ACTIVE, status_type),
+            )
+            .where(
+                Hold.status == HoldStatus.ACTIVE,
+                Hold.expires_at > now,
+                Hold.donation_id.not_in(select(completed.c.donation_id)),
+            )
+            .group_by(Hold.donation_id),
+        ).subquery()
+
+        released = select(
+            DonationAvailability.donation_id, literal(False), literal(now)
+        ).where(DonationAvailability.donation_id.not_in(select(target.c.donation_id)))
+        claimed = select(
+            target.c.donation_id, literal(True), literal(now)
+        ).where(target.c.donation_id.not_in(select(DonationAvailability.donation_id)))
+        for changes in (released, claimed):
+            db.session.execute(
+                insert(AvailabilityChange).from_select(
+                    ["donation_id", "is_held", "changed_at"], changes
+                )
+            )
+
+        db.session.execute(
+            delete(DonationAvailability).execution_options(synchronize_session=False)
+        )
+        result = db.session.execute(
+            insert(DonationAvailability).from_select(
+                ["donation_id", "hold_id", "status"], select(target)
+            )
+        )
+        unit_of_work.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _claim_donation(hold: Hold) -> bool:
+        """
+        Make a freshly flushed hold the owner of its donation's availability row.
+
+        Args:
+            hold: New hold with a primary key assigned.
+
+        Returns:
+            True if the hold now owns the donation, False if another active
+            hold or a completed pickup already does.
+        """
+        if insert_ignore(DonationAvailability, {
+            "donation_id": hold.donation_id,
+            "hold_id": hold.id,
+            "status": HoldStatus.ACTIVE,
+        }):
+            HoldService._record_change(hold.donation_id, is_held=True)
+            return True
+
+        # Take over a slot whose hold lapsed but has not been swept yet
+        now = datetime.now(timezone.utc)
+        owner_lapsed = exists().where(
+            Hold.id == DonationAvailability.hold_id, Hold.expires_at <= now
+        )
+        result = db.session.execute(
+            update(DonationAvailability)
+            .where(
+                DonationAvailability.donation_id == hold.donation_id,
+                DonationAvailability.status == HoldStatus.ACTIVE,
+                owner_lapsed,
+            )
+            .values(hold_id=hold.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return False
+
+        lapsed = db.session.execute(
+            update(Hold)
+            .where(
+                Hold.donation_id == hold.donation_id,
+                Hold.status == HoldStatus.ACTIVE,
+                Hold.id != hold.id,
+                Hold.expires_at <= now,
+            )
+            .values(status=HoldStatus.EXPIRED)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if lapsed:
+            unit_of_work.on_commit(lambda: holds_expired.send(HoldService, count=lapsed))
+        HoldService._record_change(hold.donation_id, is_held=True)
+        return True
+
+    @staticmethod
+    def _release_availability(hold: Hold) -> None:
+        """Drop the availability row owned by a hold that is no longer active."""
+        DonationAvailability.query.filter_by(
+            donation_id=hold.donation_id, hold_id=hold.id, status=HoldStatus.ACTIVE
+        ).delete()
+        HoldService._record_change(hold.donation_id, is_held=False)
+
+    @staticmethod
+    def _record_change(donation_id: str, is_held: bool) -> None:
+        """Append an availability change in the caller's transaction."""
+        db.session.add(AvailabilityChange(donation_id=donation_id, is_held=is_held))
@@ -0,0 +1,280 @@
+"""
+HTTP Inventory Service
+
+Production adapter for the external Donation Inventory Service. Talks
+HTTP/JSON over one pooled ``requests`` session per adapter and translates
+the external snake_case records into our internal Donation format.
+"""
+import logging
+import random
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from services.geo import bounding_box, within_radius
+from services.inventory_service import InventoryService, InventoryServiceError
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: the request may succeed on another attempt
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Max donation IDs per batch lookup request (keeps URLs short)
+BATCH_LOOKUP_CHUNK = 100
+
+
+@dataclass(frozen=True)
+class InventoryRegion:
+    """
+    One deployment of the external inventory API.
+
+    Attributes:
+        name (str): Region name used in logs.
+        base_url (str): API root, e.g. ``https://inventory.example.org/v1``.
+        bounds (tuple | None): (min_lat, min_lng, max_lat, max_lng) covered
+            by the region, or None if it covers everywhere.
+    """
+    name: str
+    base_url: str
+    bounds: tuple[float, float, float, float] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "InventoryRegion":
+        """Build a region from config, e.g. ``{"name", "url", "bounds"}``."""
+        bounds = data.get("bounds")
+        return cls(data["name"], data["url"].rstrip("/"), tuple(bounds) if bounds else None)
+
+    def overlaps(self, lat: float, lng: float, radius: float) -> bool:
+        """Return True if a search circle may contain donations from this region."""
+        if self.bounds is None:
+            return True
+        min_lat, min_lng, max_lat, max_lng = self.bounds
+        q_min_lat, q_min_lng, q_max_lat, q_max_lng = bounding_box(lat, lng, radius)
+        if q_max_lat < min_lat or q_min_lat > max_lat:
+            return False
+        # Compare longitudes modulo 360 so boxes crossing the antimeridian match
+        return any(
+            q_min_lng + shift <= max_lng and q_max_lng + shift >= min_lng
+            for shift in (-360, 0, 360)
+        )
+
+
+class HttpInventoryService(InventoryService):
+    """
+    InventoryService backed by the external inventory HTTP API.
+
+    - One ``requests.Session`` with a sized connection pool is reused for
+      every call, so requests ride on kept-alive connections instead of
+      paying a TCP/TLS handshake each time.
+    - Every request has separate connect and read timeouts.
+    - Connection errors, timeouts and 429/502/503/504 responses are retried
+      with exponential backoff and full jitter.
+    - A radius search that overlaps several regions queries them in
+      parallel on a persistent thread pool, merges the results and applies
+      an exact distance filter. If any region fails the whole call raises
+      ``InventoryServiceError`` rather than returning a partial answer.
+
+    Expected endpoints on each region::
+
+        GET /donations?lat=&lng=&radius=   -> [donation, ...]
+        GET /donations?ids=A,B             -> [donation, ...]
+        GET /donations/<id>                -> donation | 404
+
+    Attributes:
+        regions (list[InventoryRegion]): Inventory deployments to query.
+        connect_timeout (float): Seconds to wait for a connection.
+        read_timeout (float): Seconds to wait for a response.
+        max_retries (int): Extra attempts after the first failure.
+        backoff_seconds (float): Base delay of the exponential backoff.
+    """
+
+    def __init__(
+        self,
+        regions: list[InventoryRegion],
+        connect_timeout: float = 2.0,
+        read_timeout: float = 5.0,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.2,
+        pool_size: int = 20,
+        max_workers: int = 8,
+        session: requests.Session | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Args:
+            regions: Inventory deployments; at least one is required.
+            connect_timeout: Connect timeout per attempt in seconds.
+            read_timeout: Read timeout per attempt in seconds.
+            max_retries: Retries after the first attempt of a request.
+            backoff_seconds: Base backoff; attempt n waits up to base * 2**n.
+            pool_size: Kept-alive connections per region host.
+            max_workers: Threads used for multi-region fan-out.
+            session: Session to use instead of a new pooled one (tests).
+            sleep: Sleep function used between retries; injectable for tests.
+        """
+        if not regions:
+            raise ValueError("HttpInventoryService needs at least one region")
+        self.regions = list(regions)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._sleep = sleep
+        if session is None:
+            session = requests.Session()
+            # Retries are handled here, with jitter, rather than by urllib3
+            adapter = HTTPAdapter(
+                pool_connections=len(self.regions), pool_maxsize=pool_size, max_retries=0
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inventory")
+
+    def get_available_donations(
+        self, lat: float | None = None, lng: float | None = None, radius: float = 50
+    ) -> list[dict]:
+        """Query every region overlapping the search area and merge the results."""
+        if lat is None or lng is None:
+            regions = self.regions
+            params: dict[str, Any] = {}
+        else:
+            regions = [r for r in self.regions if r.overlaps(lat, lng, radius)]
+            params = {"lat": lat, "lng": lng, "radius": radius}
+        if not regions:
+            return []
+
+        results = self._fan_out(regions, lambda r: self._get_json(r, "/donations", params))
+        merged: dict[str, dict] = {}
+        for records in results:
+            for record in records or []:
+                donation = self._to_internal(record)
+                merged.setdefault(donation["id"], donation)
+
+        donations = list(merged.values())
+        if lat is None or lng is None:
+            return donations
+        return within_radius(donations, lat, lng, radius)
+
+    def get_donation_by_id(self, donation_id: str) -> dict | None:
+        """Look up one donation, asking every region when there are several."""
+        return self.get_donations_by_ids([donation_id]).get(donation_id)
+
+    def get_donations_by_ids(self, donation_ids: Iterable[str]) -> dict[str, dict]:
+        """Look up several donations with batched requests to each region."""
+        donation_ids = list(dict.fromkeys(donation_ids))
+        if not donation_ids:
+            return {}
+
+        if len(donation_ids) == 1 and len(self.regions) == 1:
+            path = "/donations/" + quote(donation_ids[0], safe="")
+            record = self._get_json(self.regions[0], path, {})
+            return {donation_ids[0]: self._to_internal(record)} if record else {}
+
+        chunks = [
+            donation_ids[i:i + BATCH_LOOKUP_CHUNK]
+            for i in range(0, len(donation_ids), BATCH_LOOKUP_CHUNK)
+        ]
+        calls = [(region, chunk) for region in self.regions for chunk in chunks]
+        results = self._fan_out(
+            calls, lambda call: self._get_json(call[0], "/donations", {"ids": ",".join(call[1])})
+        )
+        found = {}
+        for records in results:
+            for record in records or []:
+                donation = self._to_internal(record)
+                found.setdefault(donation["id"], donation)
+        return found
+
+    def close(self) -> None:
+        """Release pooled connections and fan-out threads."""
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def _fan_out(self, items: list, call: Callable[[Any], Any]) -> list:
+        """
+        Run ``call`` for each item, concurrently when there is more than one.
+
+        Every item is waited for and each failure logged. If any item fails
+        ``InventoryServiceError`` is raised, since a result missing a region
+        would pass off held or unknown donations as absent.
+        """
+        if len(items) == 1:
+            return [call(items[0])]
+
+        futures = [self._executor.submit(call, item) for item in items]
+        results, errors = [], []
+        for item, future in zip(items, futures):
+            try:
+                results.append(future.result())
+            except InventoryServiceError as exc:
+                logger.warning("inventory request failed for %r: %s", item, exc)
+                errors.append(exc)
+        if errors:
+            raise InventoryServiceError(
+                f"{len(errors)} of {len(items)} inventory requests failed: {errors[0]}"
+            ) from errors[0]
+        return results
+
+    def _get_json(self, region: InventoryRegion, path: str, params: dict) -> Any:
+        """
+        GET a JSON document, retrying transient failures.
+
+        Returns:
+            Decoded JSON, or None on 404.
+
+        Raises:
+            InventoryServiceError: If every attempt failed.
+        """
+        url = region.base_url + path
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(
+                    url, params=params, timeout=(self.connect_timeout, self.read_timeout)
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                failure = f"{type(exc).__name__}: {exc}"
+            else:
+                if response.status_code == 404:
+                    return None
+                if response.status_code not in RETRY_STATUSES:
+                    try:
+                        response.raise_for_status()
+                        return response.json()
+                    except (requests.HTTPError, ValueError) as exc:
+                        raise InventoryServiceError(f"{region.name}: {exc}") from exc
+                failure = f"HTTP {response.status_code}"
+
+            if attempt < self.max_retries:
+                # Full jitter spreads retries from many workers apart
+                delay = random.uniform(0, self.backoff_seconds * 2 ** attempt)
+                logger.info(
+                    "retrying inventory request to %s in %.2fs (%s)", region.name, delay, failure
+                )
+                self._sleep(delay)
+
+        raise InventoryServiceError(
+            f"{region.name}: {failure} after {self.max_retries + 1} attempts"
+        )
+
+    @staticmethod
+    def _to_internal(record: dict) -> dict:
+        """Translate an external inventory record into our Donation format."""
+        return {
+            "id": record["id"],
+            "description": record.get("description"),
+            "donationType": record.get("donation_type"),
+            "quantity": record.get("quantity"),
+            "donorName": record.get("donor_name"),
+            "donorContact": record.get("donor_contact"),
+            "lat": record["lat"],
+            "lng": record["lng"],
+            "address": record.get("address"),
+            "expiresAt": record.get("expires_at"),
+        }
@@ -4,19 +4,28 @@ Inventory Service
 Wraps the external Donation Inventory Service API and translates external
 data into our internal Donation format.
 """
+import json
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
+
+from services.geo import SpatialGridIndex
+
+
+class InventoryServiceError(Exception):
+    """Raised when the external inventory cannot be reached or answers with an error."""
+
 
 class InventoryService(ABC):
     """Abstract interface for the Donation Inventory Service."""
     
     @abstractmethod
-    def get_available_donations(self, lat: float, lng: float, radius: float) -> list[dict]:
+    def get_available_donations(self, lat: float | None, lng: float | None, radius: float) -> list[dict]:
         """
         Fetch available donations within a geographic area.
 
         Args:
-            lat: Latitude of the search center.
-            lng: Longitude of the search center.
+            lat: Latitude of the search center, or None for no geo filter.
+            lng: Longitude of the search center, or None for no geo filter.
             radius: Search radius in miles.
 
         Returns:
@@ -34,12 +43,49 @@ class InventoryService(ABC):
             Donation dict or None if not found.
         """
         pass
+
+    def get_donations_by_ids(self, donation_ids: Iterable[str]) -> dict[str, dict]:
+        """
+        Get several donations in one call.
+
+        The default implementation falls back to one ``get_donation_by_id``
+        call per ID; adapters that can batch should override it.
+
+        Args:
+            donation_ids: Donation IDs to look up. Duplicates are ignored.
+
+        Returns:
+            Dict mapping each found donation ID to its donation dict. IDs
+            that do not exist are omitted.
+        """
+        found = {}
+        for donation_id in dict.fromkeys(donation_ids):
+            donation = self.get_donation_by_id(donation_id)
+            if donation is not None:
+                found[donation_id] = donation
+        return found
+
+    def get_snapshot_version(self) -> int | str | None:
+        """
+        Return a version that changes whenever the served inventory changes.
+
+        Used to build ETags for donation listings. The default returns None,
+        meaning the adapter cannot tell, so listings are never revalidated.
+
+        Returns:
+            Opaque version that differs for every distinct snapshot, or
+            None if unknown.
+        """
+        return None
     
 class MockInventoryService(InventoryService):
     """
-    Hardcoded stub for the Donation Inventory Service.
+    In-memory stub for the Donation Inventory Service.
 
-    Returns sample donation data for development and testing.
+    Serves sample donation data for development and testing. Radius queries
+    go through a SpatialGridIndex that is updated incrementally as
+    donations are upserted or removed. Every upsert or removal bumps the
+    snapshot version.
     """
 
     # Sample donations - pretend these come from the external service
@@ -106,15 +152,68 @@ class MockInventoryService(InventoryService):
         },
     ]
 
-    def get_available_donations(self, lat: float = 0, lng: float = 0, radius: float = 50) -> list[dict]:
-        """Return all mock donations (no real geo-filtering in stub)."""
-        # In the real implementation, this would call the external API
-        # and filter by geographic area. The mock returns everything.
-        return [d.copy() for d in self._DONATIONS]
+    def __init__(self, donations: list[dict] | None = None, cell_degrees: float = 0.1) -> None:
+        """
+        Args:
+            donations: Donations to serve. Defaults to the built-in samples.
+            cell_degrees: Grid cell size of the spatial index in degrees.
+        """
+        self._donations: dict[str, dict] = {}
+        self._index = SpatialGridIndex(cell_degrees)
+        self._version = 0
+        for d in (self._DONATIONS if donations is None else donations):
+            self.upsert_donation(d)
+
+    @classmethod
+    def from_file(cls, path: str, cell_degrees: float = 0.1) -> "MockInventoryService":
+        """
+        Load donations from a JSON array file (e.g. written by ``flask seed``).
+
+        Args:
+            path: Path to a JSON file holding a list of donation dicts.
+            cell_degrees: Grid cell size of the spatial index in degrees.
+        """
+        with open(path) as f:
+            return cls(json.load(f), cell_degrees)
+
+    def upsert_donation(self, donation: dict) -> None:
+        """Add or replace a donation, updating the spatial index incrementally."""
+        self._donations[donation["id"]] = donation.copy()
+        self._index.add(donation["id"], donation["lat"], donation["lng"])
+        self._version += 1
+
+    def remove_donation(self, donation_id: str) -> None:
+        """Remove a donation from the inventory and the spatial index."""
+        if self._donations.pop(donation_id, None) is not None:
+            self._index.remove(donation_id)
+            self._version += 1
+
+    def get_available_donations(
+        self, lat: float | None = None, lng: float | None = None, radius: float = 50
+    ) -> list[dict]:
+        """
+        Return mock donations within ``radius`` miles of (lat, lng).
+
+        Uses the spatial grid index so only nearby cells are scanned. If no
+        center is given, every donation is returned.
+        """
+        if lat is None or lng is None:
+            return [d.copy() for d in self._donations.values()]
+        return [self._donations[i].copy() for i in self._index.query(lat, lng, radius)]
 
     def get_donation_by_id(self, donation_id: str) -> dict | None:
-        """Look up a single mock donation by ID."""
-        for d in self._DONATIONS:
-            if d["id"] == donation_id:
-                return d.copy()
-        return None
\ No newline at end of file
+        """Look up a single mock donation by ID in O(1)."""
+        donation = self._donations.get(donation_id)
+        return donation.copy() if donation else None
+
+    def get_donations_by_ids(self, donation_ids: Iterable[str]) -> dict[str, dict]:
+        """Look up several mock donations through the ID-keyed index."""
+        return {
+            donation_id: self._donations[donation_id].copy()
+            for donation_id in donation_ids
+            if donation_id in self._donations
+        }
+
+    def get_snapshot_version(self) -> int:
+        """Return the number of inventory mutations applied so far."""
+        return self._version
@@ -0,0 +1,136 @@
+"""
+Keyset Pagination
+
+Cursor-based paging over (timestamp, id) keys, newest first. Each page is
+fetched with a range predicate on an index rather than an OFFSET, so the
+cost of a page does not depend on how deep the client has scrolled.
+"""
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@dataclass(frozen=True)
+class Page:
+    """
+    One page of results.
+
+    Attributes:
+        items (list): Rows on this page, newest first.
+        next_cursor (str | None): Opaque cursor for the following page, or
+            None if this is the last page.
+    """
+    items: list[Any]
+    next_cursor: str | None
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """
+    Encode the key of the last row on a page as an opaque cursor.
+
+    Args:
+        sort_value: Timestamp the page is ordered by.
+        row_id: Primary key used as a tiebreaker.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    raw = f"{sort_value.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor string from a previous page.
+
+    Returns:
+        Tuple of (sort_value, row_id).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_raw, id_raw = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(sort_raw), int(id_raw)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def keyset_page(
+    query: Query,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int,
+    cursor: str | None = None,
+) -> Page:
+    """
+    Fetch one page of ``query`` ordered by (sort_column, id_column) descending.
+
+    Args:
+        query: Filtered ORM query (no ordering or limit applied yet).
+        sort_column: Timestamp column to order by.
+        id_column: Primary key column used as a tiebreaker.
+        limit: Page size; clamped to 1..MAX_PAGE_SIZE.
+        cursor: Cursor from the previous page, or None for the first page.
+
+    Returns:
+        Page of at most ``limit`` rows plus the cursor for the next page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return Page(rows, None)
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key)))
+
+
+def merge_pages(pages: list[Page], limit: int, sort_key: str, id_key: str) -> Page:
+    """
+    Merge pages fetched with the same cursor from tables with disjoint IDs.
+
+    Each input page holds the newest ``limit`` rows of its table after the
+    cursor, so the newest ``limit`` rows of their union are the newest
+    ``limit`` rows overall.
+
+    Args:
+        pages: Pages from ``keyset_page`` called with the same limit and cursor.
+        limit: Page size; clamped to 1..MAX_PAGE_SIZE like ``keyset_page``.
+        sort_key: Attribute name of the timestamp the pages are ordered by.
+        id_key: Attribute name of the tiebreaker primary key.
+
+    Returns:
+        Page of at most ``limit`` rows plus the cursor for the next page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = sorted(
+        (row for page in pages for row in page.items),
+        key=lambda r: (getattr(r, sort_key), getattr(r, id_key)),
+        reverse=True,
+    )
+    if len(rows) <= limit and all(page.next_cursor is None for page in pages):
+        return Page(rows, None)
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(rows, encode_cursor(getattr(last, sort_key), getattr(last, id_key)))
@@ -0,0 +1,157 @@
+"""
+Pickup Stats Service
+
+Maintains per-day pickup rollups (overall, per user, per donor) and
+answers stats queries from them instead of aggregating pickup_history.
+
+HistoryService.record_pickup stages each pickup's increments on the
+session; they are applied just before the transaction commits, one
+multi-row upsert per rollup table, so a batch of N pickups costs three
+extra statements rather than 3 * N. A rollback discards them with the
+pickups they counted.
+"""
+from collections import Counter
+from datetime import date, datetime
+
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.orm import Session
+
+from db_routing import read_replica
+from db_utils import upsert_add
+from extensions import db
+from models.pickup_history import PickupHistory
+from models.pickup_rollups import PickupDailyCount, PickupDonorDailyCount, PickupUserDailyCount
+from services import unit_of_work
+
+# session.info key holding increments not yet written
+_PENDING = "pickup_rollups"
+
+
+class PickupStatsService:
+
+    @staticmethod
+    def stage_pickup(user_id: int, donor_contact: str | None, completed_at: datetime) -> None:
+        """
+        Count one pickup in the rollups when the current transaction commits.
+
+        Args:
+            user_id: ID of the user who completed the pickup.
+            donor_contact: Donor contact stored with the pickup, if any; it
+                is the donor key (see PickupDonorDailyCount).
+            completed_at: UTC time of the pickup; its date is the rollup day.
+        """
+        pending = db.session.info.setdefault(_PENDING, {
+            PickupDailyCount: Counter(),
+            PickupUserDailyCount: Counter(),
+            PickupDonorDailyCount: Counter(),
+        })
+        day = completed_at.date()
+        pending[PickupDailyCount][(day,)] += 1
+        pending[PickupUserDailyCount][(user_id, day)] += 1
+        pending[PickupDonorDailyCount][(donor_contact or "", day)] += 1
+
+    @staticmethod
+    def get_stats(
+        user_id: int | None = None,
+        donor: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> dict:
+        """
+        Daily pickup counts, optionally for one user or one donor.
+
+        Reads one rollup table with a primary-key range scan, so the cost
+        depends on the number of days returned, not on pickup_history.
+
+        Args:
+            user_id: If given, only this user's pickups.
+            donor: If given, only pickups whose ``donor_contact`` equals
+                this string exactly.
+            start: If given, first day included.
+            end: If given, first day excluded.
+
+        Returns:
+            ``{"total": int, "days": [{"date": "YYYY-MM-DD", "pickups": int}]}``
+            with days in ascending order; days without pickups are omitted.
+
+        Raises:
+            ValueError: If both ``user_id`` and ``donor`` are given.
+        """
+        if user_id is not None and donor is not None:
+            raise ValueError("Filter by user or by donor, not both")
+
+        if user_id is not None:
+            model = PickupUserDailyCount
+            stmt = select(model.day, model.pickups).where(model.user_id == user_id)
+        elif donor is not None:
+            model = PickupDonorDailyCount
+            stmt = select(model.day, model.pickups).where(model.donor == donor)
+        else:
+            model = PickupDailyCount
+            stmt = select(model.day, model.pickups)
+        if start is not None:
+            stmt = stmt.where(model.day >= start)
+        if end is not None:
+            stmt = stmt.where(model.day < end)
+
+        with read_replica(user_id):
+            rows = db.session.execute(stmt.order_by(model.day)).all()
+        return {
+            "total": sum(pickups for _, pickups in rows),
+            "days": [{"date": day.isoformat(), "pickups": pickups} for day, pickups in rows],
+        }
+
+    @staticmethod
+    def rebuild() -> dict:
+        """
+        Recompute every rollup from pickup_history in one transaction.
+
+        Repairs the rollups if they ever drift, and fills them after rows
+        were bulk-loaded without going through HistoryService. Inside a
+        UnitOfWork the rebuild commits with the rest of the block.
+
+        Returns:
+            Number of rollup rows written per table.
+        """
+        db.session.info.pop(_PENDING, None)
+        day = func.date(PickupHistory.completed_at)
+        donor = func.coalesce(PickupHistory.donor_contact, "")
+        sources = {
+            PickupDailyCount: ([day], ["day"]),
+            PickupUserDailyCount: ([PickupHistory.user_id, day], ["user_id", "day"]),
+            PickupDonorDailyCount: ([donor, day], ["donor", "day"]),
+        }
+        written = {}
+        for model, (keys, names) in sources.items():
+            db.session.execute(delete(model))
+            result = db.session.execute(
+                insert(model).from_select(
+                    [*names, "pickups"],
+                    select(*keys, func.count()).group_by(*keys),
+                )
+            )
+            written[model.__tablename__] = result.rowcount
+        unit_of_work.commit()
+        return written
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_staged_rollups(session: Session) -> None:
+    """Write staged increments as one upsert per rollup table."""
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    for model, counts in pending.items():
+        names = [c.name for c in model.__table__.primary_key]
+        upsert_add(
+            model,
+            [{**dict(zip(names, key)), "pickups": n} for key, n in counts.items()],
+            "pickups",
+        )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_staged_rollups(session: Session, transaction) -> None:
+    # A commit has already applied them; a rollback must not leave them for the next one
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
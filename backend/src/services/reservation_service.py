@@ -5,9 +5,12 @@ Coordinates the donation discovery and reservation workflow.
 Main orchestrator that calls into Inventory Adapter, Hold Manager,
 and History Manager.
 """
+from db_routing import read_replica
+from db_utils import reload_all
 from services.history_service import HistoryService
 from services.inventory_service import InventoryService
 from services.hold_service import HoldService
+from services.unit_of_work import UnitOfWork
 
 
 class ReservationService:
@@ -33,8 +36,8 @@ class ReservationService:
         
     def get_available_donations(
         self, 
-        lat: float = 0, 
-        lng: float = 0, 
+        lat: float | None = None,
+        lng: float | None = None,
         radius: float = 50
     ) -> list[dict]:
         """
@@ -44,15 +47,16 @@ class ReservationService:
         filters out any with an active hold so only claimable items are returned.
 
         Args:
-            lat: Latitude of the search center. Defaults to 0.
-            lng: Longitude of the search center. Defaults to 0.
+            lat: Latitude of the search center. None disables geo filtering.
+            lng: Longitude of the search center. None disables geo filtering.
             radius: Search radius in miles. Defaults to 50.
         
         Returns:
             out: Donation dicts with ``isHeld: False``, ready to be reserved.
         """
         all_donations = self.inventory.get_available_donations(lat, lng, radius)
-        held_ids = HoldService.get_held_donation_ids()
+        with read_replica():
+            held_ids = HoldService.get_held_donation_ids(d["id"] for d in all_donations)
         
         available = []
         for d in all_donations:
@@ -63,8 +67,8 @@ class ReservationService:
     
     def get_all_donations(
         self,
-        lat: float = 0,
-        lng: float = 0,
+        lat: float | None = None,
+        lng: float | None = None,
         radius: float = 50
     ) -> list[dict]:
         """
@@ -75,20 +79,61 @@ class ReservationService:
         display availability state without making a separate lookup.
 
         Args:
-            lat: Latitude of the search center. Defaults to 0.
-            lng: Longitude of the search center. Defaults to 0.
+            lat: Latitude of the search center. None disables geo filtering.
+            lng: Longitude of the search center. None disables geo filtering.
             radius: Search radius in miles. Defaults to 50.
         
         Returns:
             out: All donation dicts in range, each annotated with ``isHeld``.
         """
         all_donations = self.inventory.get_available_donations(lat, lng, radius)
-        held_ids = HoldService.get_held_donation_ids()
+        with read_replica():
+            held_ids = HoldService.get_held_donation_ids(d["id"] for d in all_donations)
         for d in all_donations:
             d["isHeld"] = d["id"] in held_ids
         return all_donations
         
 
+    def attach_donations(self, records: list[dict]) -> list[dict]:
+        """
+        Annotate serialized holds or pickups with their donation details.
+
+        Looks up every referenced donation with a single batch inventory
+        call rather than one call per record.
+
+        Args:
+            records: Dicts carrying a ``donationId`` key (e.g. ``Hold.to_dict()``).
+
+        Returns:
+            out: The same dicts, each with a ``donation`` key holding the
+                 donation dict, or None if it is no longer in inventory.
+        """
+        donations = self.inventory.get_donations_by_ids(r["donationId"] for r in records)
+        for r in records:
+            r["donation"] = donations.get(r["donationId"])
+        return records
+
+    def get_listing_version(self) -> str | None:
+        """
+        Return a version token for donation listings, for use as an ETag.
+
+        Combines the global availability version and the next hold lapse
+        from HoldService with the inventory snapshot version. All are cheap
+        to read: index lookups only, and no call to the external inventory
+        listing.
+
+        Returns:
+            out: Token that changes whenever a listing may have changed, or
+                 None if the inventory adapter cannot report a version.
+        """
+        inventory_version = self.inventory.get_snapshot_version()
+        if inventory_version is None:
+            return None
+        with read_replica():
+            version, next_lapse = HoldService.get_availability_state()
+        lapse = next_lapse.strftime("%Y%m%d%H%M%S%f") if next_lapse else "0"
+        return f"{version}.{lapse}-{inventory_version}"
+
     def request_hold(self, user_id: int, donation_id: str) -> dict:
         """
         Attempt to place a hold on a donation for a user.
@@ -116,6 +161,59 @@ class ReservationService:
         
         return {"success": True, "hold": hold.to_dict(), "donation": donation}
     
+    def request_holds(
+        self, user_id: int, donation_ids: list[str], all_or_nothing: bool = False
+    ) -> dict:
+        """
+        Attempt to hold several donations for a user in one request.
+
+        Validates every donation with a single batch inventory lookup, then
+        creates all holds in one transaction via HoldService.create_holds.
+
+        Args:
+            user_id: ID of the user claiming the donations.
+            donation_ids: IDs of the donations to reserve. Duplicates are ignored.
+            all_or_nothing: If True, no hold is kept unless every donation
+                can be reserved.
+
+        Returns:
+            out: ``{"success": bool, "results": [...]}`` where ``success`` is
+                 True only if every donation was reserved, and each result is
+                 ``{"donationId", "success": True, "hold", "donation"}`` or
+                 ``{"donationId", "success": False, "error"}``.
+        """
+        donation_ids = list(dict.fromkeys(donation_ids))
+        donations = self.inventory.get_donations_by_ids(donation_ids)
+        found_ids = [d for d in donation_ids if d in donations]
+
+        if all_or_nothing and len(found_ids) < len(donation_ids):
+            holds = {}
+        else:
+            holds = HoldService.create_holds(user_id, found_ids, all_or_nothing)
+        rolled_back = all_or_nothing and (
+            len(found_ids) < len(donation_ids) or None in holds.values()
+        )
+        if not rolled_back:
+            reload_all(holds.values())
+
+        results = []
+        for donation_id in donation_ids:
+            hold = holds.get(donation_id)
+            if donation_id not in donations:
+                results.append({"donationId": donation_id, "success": False,
+                                "error": "Donation not found"})
+            elif donation_id in holds and hold is None:
+                results.append({"donationId": donation_id, "success": False,
+                                "error": "Donation is already reserved"})
+            elif rolled_back:
+                results.append({"donationId": donation_id, "success": False,
+                                "error": "Not reserved: another donation in the batch failed"})
+            else:
+                results.append({"donationId": donation_id, "success": True,
+                                "hold": hold.to_dict(), "donation": donations[donation_id]})
+
+        return {"success": all(r["success"] for r in results), "results": results}
+
     def confirm_pickup(self, hold_id: int) -> dict:
         """
         Mark a hold as completed and write a permanent pickup record.
@@ -126,6 +224,11 @@ class ReservationService:
         donation no longer exists in inventory, the history record is still
         created with nulls.
 
+        The hold completion and the history record are committed together in
+        one UnitOfWork, so a pickup can never leave a completed hold without
+        its history row. The inventory lookup happens before the transaction
+        opens.
+
         Args:
             hold_id: ID of the hold being fulfilled.
             
@@ -136,24 +239,66 @@ class ReservationService:
         hold = HoldService.get_hold_by_id(hold_id)
         if not hold or not hold.is_active:
             return {"success": False, "error": "No active hold found"}
-        
-        # Complete the hold (returns None if it raced and expired between check and here)
-        completed = HoldService.complete_hold(hold_id)
-        if not completed:
-            return {"success": False, "error": "Hold expired before pickup could be confirmed"}
-        
+
         # Look up donation details to store in history
         donation = self.inventory.get_donation_by_id(hold.donation_id)
-        
-        # Record in history
-        record = HistoryService.record_pickup(
+
+        with UnitOfWork():
+            record = self._complete_and_record(hold, donation)
+        if not record:
+            return {"success": False, "error": "Hold expired before pickup could be confirmed"}
+        return {"success": True, "record": record.to_dict()}
+
+    def confirm_pickups(self, hold_ids: list[int]) -> dict:
+        """
+        Confirm pickup of several holds at once (e.g. a driver finishing a route).
+
+        Loads all holds in one query and their donations in one batch
+        inventory call, then completes every eligible hold and writes its
+        history record inside a single UnitOfWork (one commit).
+
+        Args:
+            hold_ids: IDs of the holds being fulfilled. Duplicates are ignored.
+
+        Returns:
+            out: ``{"success": bool, "results": [...]}`` where ``success`` is
+                 True only if every pickup was confirmed, and each result is
+                 ``{"holdId", "success": True, "record"}`` or
+                 ``{"holdId", "success": False, "error"}``.
+        """
+        hold_ids = list(dict.fromkeys(hold_ids))
+        holds = HoldService.get_holds_by_ids(hold_ids)
+        active = {hold_id: h for hold_id, h in holds.items() if h.is_active}
+        donations = self.inventory.get_donations_by_ids(h.donation_id for h in active.values())
+
+        records = {}
+        with UnitOfWork():
+            for hold_id, hold in active.items():
+                records[hold_id] = self._complete_and_record(hold, donations.get(hold.donation_id))
+        reload_all(records.values())
+
+        results = []
+        for hold_id in hold_ids:
+            record = records.get(hold_id)
+            if record:
+                results.append({"holdId": hold_id, "success": True, "record": record.to_dict()})
+            else:
+                results.append({"holdId": hold_id, "success": False, "error": "No active hold found"})
+        return {"success": all(r["success"] for r in results), "results": results}
+
+    @staticmethod
+    def _complete_and_record(hold, donation: dict | None):
+        """Stage hold completion plus its history record; None if the hold is no longer active."""
+        completed = HoldService.complete_hold(hold.id)
+        if not completed:
+            return None
+        return HistoryService.record_pickup(
             user_id=hold.user_id,
             donation_id=hold.donation_id,
             donation_description=donation.get("description") if donation else None,
             donor_contact=donation.get("donorContact") if donation else None,
             pickup_location=donation.get("address") if donation else None
         )
-        return {"success": True, "record": record.to_dict()}
     
     def cancel_hold(self, hold_id: int) -> dict:
         """
@@ -0,0 +1,98 @@
+"""
+Single-Flight Request Coalescing
+
+Collapses concurrent calls for the same key into one execution: the first
+caller runs the function, and everyone who asks for that key while it is
+still running waits for and shares its result (or its exception).
+Nothing is remembered after the call finishes; that is the cache's job.
+"""
+import threading
+from collections.abc import Callable, Hashable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Thread-safe single-flight group.
+
+    Example::
+
+        flights = SingleFlight()
+        donations = flights.do(("area", lat, lng, radius), lambda: inventory.fetch(...))
+    """
+
+    def __init__(self) -> None:
+        self._stats = {"executions": 0, "coalesced": 0, "errors": 0}
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run ``fn`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Normalized identity of the call.
+            fn: Zero-argument function producing the value.
+
+        Returns:
+            The value from ``fn``, possibly computed by another thread.
+
+        Raises:
+            Exception: Whatever ``fn`` raised, re-raised in every waiter.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as exc:
+            call.error = exc
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        """
+        Return coalescing counters.
+
+        Returns:
+            Dict with executions (calls that ran the function), coalesced
+            (calls that shared another call's result), errors (executions
+            that raised), in_flight and coalesce_ratio (coalesced over all
+            calls).
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        calls = stats["executions"] + stats["coalesced"]
+        stats["coalesce_ratio"] = stats["coalesced"] / calls if calls else 0.0
+        return stats
@@ -0,0 +1,90 @@
+"""
+Unit of Work
+
+Lets several service calls stage their changes on the shared session and
+commit them together, once. Services call ``commit()`` from this module
+instead of ``db.session.commit()``; inside an open UnitOfWork that call
+is deferred to the end of the block.
+"""
+from collections.abc import Callable
+from contextvars import ContextVar
+
+from extensions import db
+
+_current: ContextVar["UnitOfWork | None"] = ContextVar("unit_of_work", default=None)
+
+
+class UnitOfWork:
+    """
+    Context manager that groups service writes into a single transaction.
+
+    On a clean exit the session is committed once; if the block raises,
+    everything staged inside it is rolled back. Nested units of work join
+    the outermost one, so only the outermost block commits.
+
+    Example::
+
+        with UnitOfWork():
+            HoldService.complete_hold(hold_id)
+            HistoryService.record_pickup(...)
+        # one COMMIT for both writes
+    """
+
+    def __init__(self) -> None:
+        self._token = None
+        self._owner = False
+        self._on_commit: list[Callable[[], None]] = []
+
+    def __enter__(self) -> "UnitOfWork":
+        if _current.get() is None:
+            self._owner = True
+            self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self._owner:
+            return
+        try:
+            if exc_type is None:
+                db.session.commit()
+            else:
+                db.session.rollback()
+        finally:
+            _current.reset(self._token)
+        if exc_type is None:
+            for callback in self._on_commit:
+                callback()
+
+    @staticmethod
+    def active() -> bool:
+        """Return True if a unit of work is open in the current context."""
+        return _current.get() is not None
+
+
+def commit() -> None:
+    """
+    Commit the session, unless a UnitOfWork is open.
+
+    Inside a unit of work the pending changes are flushed instead so that
+    generated keys and defaults are available, and the commit happens
+    when the outermost block exits.
+    """
+    if UnitOfWork.active():
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+def on_commit(callback: Callable[[], None]) -> None:
+    """
+    Run ``callback`` once the current changes are committed.
+
+    Inside a UnitOfWork the callback is deferred until the outermost block
+    commits and dropped if it rolls back. Outside one, services have
+    already committed, so it runs immediately.
+    """
+    uow = _current.get()
+    if uow is None:
+        callback()
+    else:
+        uow._on_commit.append(callback)
@@ -4,6 +4,7 @@ User Service
 Handles user registration and lookup. Currently, no
 authentication, so users are identified by name/email only.
 """
+from db_routing import read_replica
 from extensions import db
 from models.user import User
 
@@ -54,7 +55,8 @@ class UserService:
         Returns:
             The User if found, or None.
         """
-        return User.query.filter_by(email=email).first()
+        with read_replica():
+            return User.query.filter_by(email=email).first()
 
     @staticmethod
     def get_or_create_user(email: str, name: str) -> tuple[User, bool]:
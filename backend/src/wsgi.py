@@ -0,0 +1,15 @@
+"""
+WSGI Entry Point
+
+Production servers import ``app`` from here::
+
+    gunicorn -c gunicorn.conf.py
+
+The app is created at import time so that gunicorn's ``preload_app``
+builds it once in the master process and workers inherit it on fork.
+Use ``flask --app src/app.py run`` (or ``python src/app.py``) for local
+development instead.
+"""
+from app import create_app
+
+app = create_app()
@@ -4,10 +4,13 @@ Shared test fixtures and helpers.
 Uses TestConfig (in-memory SQLite) so tests are fast, isolated,
 and don't affect the dev database.
 """
+from contextlib import contextmanager
+
 import pytest
 from app import create_app
 from config import TestConfig
 from extensions import db as _db
+from instrumentation import count_queries
 
 
 @pytest.fixture(scope="session")
@@ -34,6 +37,35 @@ def client(app, db):
         yield client
 
 
+@pytest.fixture
+def query_budget():
+    """
+    Fail the test if a block exceeds its SQL budget or repeats a read (N+1).
+
+    Usage::
+
+        with query_budget(2):
+            client.get("/api/v1/donations")
+
+    Pass ``max_repeats`` to allow a read that legitimately runs several
+    times; repeated writes are never flagged.
+    """
+    @contextmanager
+    def budget(max_queries, max_repeats=2):
+        with count_queries(record=True) as queries:
+            yield queries
+        listing = "\n".join(f"  {' '.join(sql.split())}" for sql in queries.statements)
+        assert queries.count <= max_queries, (
+            f"{queries.count} queries, budget is {max_queries}:\n{listing}"
+        )
+        repeated = queries.repeated_reads(threshold=max_repeats + 1)
+        assert not repeated, "N+1 pattern, same read repeated:\n" + "\n".join(
+            f"  {n}x {shape}" for shape, n in repeated.items()
+        )
+
+    return budget
+
+
 # ── Shared helpers ──────────────────────────────────────────────
 
 def create_test_user(client, email="test@example.com", name="Test"):
@@ -0,0 +1,92 @@
+"""Tests for database engine and server configuration."""
+import runpy
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app import create_app
+from config import TestConfig, engine_options
+from extensions import db
+
+
+class TestEngineOptions:
+
+    def test_in_memory_sqlite_keeps_default_pool(self):
+        assert engine_options("sqlite:///:memory:") == {}
+        assert engine_options("sqlite://") == {}
+
+    def test_sqlite_file_gets_sized_pool_only(self):
+        options = engine_options("sqlite:///the_pantry.db")
+        assert options["pool_size"] > 0
+        assert "pool_pre_ping" not in options
+
+    def test_server_database_pre_pings_and_recycles(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL_SIZE", "3")
+        options = engine_options("mysql+pymysql://u:p@db/the_pantry")
+        assert options["pool_size"] == 3
+        assert options["pool_pre_ping"] is True
+        assert options["pool_recycle"] > 0
+
+
+class TestSqlitePragmas:
+
+    def test_file_database_uses_wal(self, tmp_path):
+        """Every pooled connection to a SQLite file has the configured PRAGMAs."""
+        config = type("FileConfig", (TestConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'wal.db'}",
+            "SQLALCHEMY_ENGINE_OPTIONS": engine_options(f"sqlite:///{tmp_path / 'wal.db'}"),
+        })
+        app = create_app(config)
+        with app.app_context():
+            with db.engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+                assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+                assert conn.execute(text("PRAGMA cache_size")).scalar() == -64000
+            db.engine.dispose()
+
+    def test_pragmas_can_be_disabled(self, tmp_path):
+        config = type("PlainConfig", (TestConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'plain.db'}",
+            "SQLITE_PRAGMAS": {},
+        })
+        app = create_app(config)
+        with app.app_context():
+            with db.engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+            db.engine.dispose()
+
+
+GUNICORN_CONF = str(Path(__file__).resolve().parents[1] / "gunicorn.conf.py")
+
+
+class TestGunicornConfig:
+
+    def test_default_workers_are_threaded(self, monkeypatch):
+        """An open SSE stream must not take a whole worker, so defaults are gthread with spare threads."""
+        monkeypatch.delenv("GUNICORN_WORKER_CLASS", raising=False)
+        monkeypatch.delenv("GUNICORN_THREADS", raising=False)
+        conf = runpy.run_path(GUNICORN_CONF)
+
+        assert conf["worker_class"] == "gthread"
+        assert conf["threads"] > 1
+
+    def test_api_pool_keeps_threads_for_requests(self, monkeypatch):
+        """By default a worker accepts streams on at most half its threads."""
+        for name in ("GUNICORN_POOL", "GUNICORN_THREADS", "AVAILABILITY_STREAM_MAX_CONNECTIONS"):
+            monkeypatch.delenv(name, raising=False)
+        conf = runpy.run_path(GUNICORN_CONF)
+
+        assert conf["raw_env"] == [f"AVAILABILITY_STREAM_MAX_CONNECTIONS={conf['threads'] // 2}"]
+
+    def test_stream_pool_defaults(self, monkeypatch):
+        """GUNICORN_POOL=stream sizes one worker for many streams and does not recycle it."""
+        for name in ("GUNICORN_THREADS", "WEB_CONCURRENCY", "GUNICORN_MAX_REQUESTS",
+                     "AVAILABILITY_STREAM_MAX_CONNECTIONS"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv("GUNICORN_POOL", "stream")
+        conf = runpy.run_path(GUNICORN_CONF)
+
+        assert conf["workers"] == 1
+        assert conf["max_requests"] == 0
+        assert conf["raw_env"] == [f"AVAILABILITY_STREAM_MAX_CONNECTIONS={conf['threads'] - 1}"]
@@ -1,5 +1,11 @@
 """Tests for donation listing endpoints."""
-from conftest import create_test_user, get_first_donation_id
+from datetime import datetime, timedelta, timezone
+
+from conftest import create_test_user, create_test_hold, get_first_donation_id
+from extensions import db
+from models.donation_availability import DonationAvailability
+from models.hold import Hold
+from services.hold_service import HoldService
 
 
 class TestDonationEndpoints:
@@ -12,6 +18,15 @@ class TestDonationEndpoints:
         assert isinstance(data, list)
         assert len(data) > 0
 
+    def test_geo_filter_by_radius(self, client):
+        """lat/lng/radius restricts the listing to nearby donations."""
+        everything = client.get("/api/v1/donations").get_json()
+        pittsburgh = client.get("/api/v1/donations?lat=40.4406&lng=-79.9959&radius=50").get_json()
+        los_angeles = client.get("/api/v1/donations?lat=34.0522&lng=-118.2437&radius=50").get_json()
+
+        assert len(pittsburgh) == len(everything)
+        assert los_angeles == []
+
     def test_donations_have_required_fields(self, client):
         """Each donation object contains all fields needed by the frontend."""
         resp = client.get("/api/v1/donations")
@@ -71,4 +86,142 @@ class TestDonationEndpoints:
         resp = client.get("/api/v1/donations")
         assert len(resp.get_json()) == original_count - 1
         returned_ids = [d["id"] for d in resp.get_json()]
-        assert donation_id not in returned_ids
\ No newline at end of file
+        assert donation_id not in returned_ids
+
+class TestAvailabilityLookup:
+
+    def test_held_ids_limited_to_requested(self, client):
+        """get_held_donation_ids only reports on the donation IDs asked about."""
+        user_id = create_test_user(client)
+        donations = client.get("/api/v1/donations").get_json()
+        for d in donations[:2]:
+            client.post("/api/v1/holds", json={"userId": user_id, "donationId": d["id"]})
+
+        held = HoldService.get_held_donation_ids([donations[1]["id"], donations[2]["id"]])
+        assert held == {donations[1]["id"]}
+
+    def test_cancelled_hold_releases_availability(self, client):
+        """Cancelling a hold removes the donation from the unavailable set."""
+        user_id = create_test_user(client)
+        donation_id = get_first_donation_id(client)
+        resp = client.post("/api/v1/holds", json={"userId": user_id, "donationId": donation_id})
+        client.delete(f"/api/v1/holds/{resp.get_json()['hold']['id']}")
+
+        assert HoldService.get_held_donation_ids([donation_id]) == set()
+        assert DonationAvailability.query.count() == 0
+
+    def test_rebuild_availability_from_holds(self, client):
+        """rebuild_availability reconstructs the table from active and completed holds."""
+        user_id = create_test_user(client)
+        donations = client.get("/api/v1/donations").get_json()
+        hold_ids = []
+        for d in donations[:2]:
+            resp = client.post("/api/v1/holds", json={"userId": user_id, "donationId": d["id"]})
+            hold_ids.append(resp.get_json()["hold"]["id"])
+        client.post(f"/api/v1/holds/{hold_ids[1]}/pickup")
+
+        DonationAvailability.query.delete()
+        assert HoldService.rebuild_availability() == 2
+        assert HoldService.get_held_donation_ids() == {donations[0]["id"], donations[1]["id"]}
+
+    def test_rebuild_availability_logs_only_flipped_donations(self, client):
+        """A rebuild records changes only for donations whose held state differs."""
+        _, donation_id, hold_id = create_test_hold(client)
+        version = HoldService.get_availability_version()
+
+        HoldService.rebuild_availability()
+        assert HoldService.get_availability_version() == version
+
+        stray = DonationAvailability(donation_id="not-held", hold_id=hold_id)
+        db.session.add(stray)
+        DonationAvailability.query.filter_by(donation_id=donation_id).delete()
+        db.session.commit()
+        HoldService.rebuild_availability()
+
+        changes = HoldService.get_availability_changes(version, limit=10)
+        assert {(c.donation_id, c.is_held) for c in changes} == {
+            ("not-held", False), (donation_id, True),
+        }
+        assert HoldService.get_held_donation_ids() == {donation_id}
+
+
+class TestListingETag:
+
+    def test_unchanged_listing_returns_304(self, client):
+        """Replaying the ETag returns 304 while nothing has changed."""
+        first = client.get("/api/v1/donations")
+        etag = first.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        resp = client.get("/api/v1/donations", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.headers["ETag"] == etag
+
+    def test_hold_changes_etag(self, client):
+        """Placing and cancelling holds both invalidate the ETag."""
+        etag = client.get("/api/v1/donations").headers["ETag"]
+        user_id = create_test_user(client)
+        donation_id = get_first_donation_id(client)
+        hold = client.post("/api/v1/holds", json={"userId": user_id, "donationId": donation_id}).get_json()
+
+        resp = client.get("/api/v1/donations", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        etag = resp.headers["ETag"]
+
+        client.delete(f"/api/v1/holds/{hold['hold']['id']}")
+        resp = client.get("/api/v1/donations", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert donation_id in [d["id"] for d in resp.get_json()]
+
+    def test_sweep_bumps_availability_version(self, client):
+        """Expiring a lapsed hold advances the availability version."""
+        _, _, hold_id = create_test_hold(client)
+        before = HoldService.get_availability_version()
+        db.session.get(Hold, hold_id).expires_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.session.commit()
+
+        assert HoldService.expire_stale_holds() == 1
+        assert HoldService.get_availability_version() > before
+
+    def test_lapsed_hold_changes_etag_before_sweep(self, client):
+        """A hold lapsing frees its donation for revalidating clients without waiting for the sweeper."""
+        _, donation_id, hold_id = create_test_hold(client)
+        etag = client.get("/api/v1/donations").headers["ETag"]
+
+        db.session.get(Hold, hold_id).expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.session.commit()
+
+        resp = client.get("/api/v1/donations", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert donation_id in [d["id"] for d in resp.get_json()]
+
+    def test_failed_hold_does_not_bump_version(self, client):
+        """A losing hold request leaves the availability version unchanged."""
+        _, donation_id, _ = create_test_hold(client)
+        before = HoldService.get_availability_version()
+        other = create_test_user(client, "other@test.com")
+        resp = client.post("/api/v1/holds", json={"userId": other, "donationId": donation_id})
+        assert resp.status_code == 409
+        assert HoldService.get_availability_version() == before
+
+
+class TestDonationQueryBudget:
+
+    def _hold_several(self, client, count):
+        user_id = create_test_user(client)
+        ids = [d["id"] for d in client.get("/api/v1/donations").get_json()[:count]]
+        client.post("/api/v1/holds/batch", json={"userId": user_id, "donationIds": ids})
+
+    def test_listing_cost_independent_of_holds(self, client, query_budget):
+        """Version read plus one availability lookup, however many donations are held."""
+        self._hold_several(client, 4)
+        with query_budget(2):
+            client.get("/api/v1/donations")
+        with query_budget(2):
+            client.get("/api/v1/donations?showAll=true")
+
+    def test_not_modified_skips_availability_lookup(self, client, query_budget):
+        etag = client.get("/api/v1/donations").headers["ETag"]
+        with query_budget(1):
+            resp = client.get("/api/v1/donations", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
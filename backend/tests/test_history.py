@@ -1,5 +1,17 @@
 """Tests for pickup history endpoints."""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+
 from conftest import create_test_user, setup_completed_pickup
+from extensions import db
+from models.pickup_history import PickupHistory
+from services import unit_of_work
+from services.history_service import HistoryService
+from services.pickup_stats_service import PickupStatsService
 
 
 class TestHistoryEndpoints:
@@ -46,4 +58,222 @@ class TestHistoryEndpoints:
         records = resp.get_json()
         assert len(records) == 2
         # Most recent first
-        assert records[0]["completedAt"] >= records[1]["completedAt"]
\ No newline at end of file
+        assert records[0]["completedAt"] >= records[1]["completedAt"]
+
+class TestHistoryPagination:
+
+    def _seed(self, user_id, count, completed_at=None):
+        """Insert pickup records directly; optionally all with one timestamp."""
+        for i in range(count):
+            record = PickupHistory(user_id=user_id, donation_id=f"DON-{i:03d}")
+            if completed_at is not None:
+                record.completed_at = completed_at
+            db.session.add(record)
+        db.session.commit()
+
+    def _walk(self, client, user_id, limit):
+        """Follow nextCursor until exhausted; return all ids and the page count."""
+        ids, pages, cursor = [], 0, None
+        while True:
+            url = f"/api/v1/history?userId={user_id}&limit={limit}"
+            if cursor:
+                url += f"&cursor={cursor}"
+            body = client.get(url).get_json()
+            ids.extend(r["id"] for r in body["items"])
+            pages += 1
+            cursor = body["nextCursor"]
+            if cursor is None:
+                return ids, pages
+
+    def test_pages_cover_all_records_once(self, client):
+        """Walking every page yields each record exactly once, newest first."""
+        user_id = create_test_user(client)
+        self._seed(user_id, 7)
+
+        ids, pages = self._walk(client, user_id, limit=3)
+
+        assert pages == 3
+        assert ids == sorted(ids, reverse=True)
+        assert len(set(ids)) == 7
+
+    def test_identical_timestamps_break_ties_by_id(self, client):
+        """Records sharing completed_at are neither skipped nor repeated across pages."""
+        user_id = create_test_user(client)
+        self._seed(user_id, 5, completed_at=datetime(2026, 3, 1, 12, 0, 0))
+
+        ids, _ = self._walk(client, user_id, limit=2)
+
+        assert len(ids) == 5
+        assert len(set(ids)) == 5
+
+    def test_unpaginated_response_is_array(self, client):
+        """Without limit/cursor the endpoint still returns a plain array."""
+        user_id = create_test_user(client)
+        self._seed(user_id, 2)
+
+        assert isinstance(client.get(f"/api/v1/history?userId={user_id}").get_json(), list)
+
+    def test_invalid_cursor_returns_400(self, client):
+        """A malformed cursor is rejected."""
+        user_id = create_test_user(client)
+        resp = client.get(f"/api/v1/history?userId={user_id}&cursor=not-a-cursor")
+        assert resp.status_code == 400
+
+
+class TestHistoryExport:
+
+    def _seed(self, client):
+        """Two users, three pickups spread over two days; returns the user ids."""
+        alice = create_test_user(client, "alice@test.com", "Alice")
+        bob = create_test_user(client, "bob@test.com", "Bob")
+        for user_id, donation_id, day in [
+            (alice, "DON-001", 1), (alice, "DON-002", 2), (bob, "DON-003", 2),
+        ]:
+            db.session.add(PickupHistory(
+                user_id=user_id, donation_id=donation_id,
+                donation_description="Soup, \"hearty\", 2 cans",
+                completed_at=datetime(2026, 3, day, 12, 0, 0),
+            ))
+        db.session.commit()
+        return alice, bob
+
+    def test_export_ndjson_streams_all_users(self, client):
+        """Default export is streamed NDJSON covering every user."""
+        self._seed(client)
+
+        resp = client.get("/api/v1/history/export")
+        assert resp.status_code == 200
+        assert resp.is_streamed
+        assert resp.mimetype == "application/x-ndjson"
+        rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        assert [r["donationId"] for r in rows] == ["DON-001", "DON-002", "DON-003"]
+
+    def test_export_csv_with_filters(self, client):
+        """CSV export honours user and date-range filters and quotes fields correctly."""
+        alice, _ = self._seed(client)
+
+        resp = client.get(f"/api/v1/history/export?format=csv&userId={alice}&from=2026-03-02")
+        assert resp.mimetype == "text/csv"
+        rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+        assert len(rows) == 1
+        assert rows[0]["donationId"] == "DON-002"
+        assert rows[0]["donationDescription"] == 'Soup, "hearty", 2 cans'
+
+    def test_export_date_upper_bound_exclusive(self, client):
+        """The 'to' bound excludes records completed at or after it."""
+        self._seed(client)
+
+        resp = client.get("/api/v1/history/export?to=2026-03-02")
+        lines = resp.get_data(as_text=True).splitlines()
+        assert len(lines) == 1
+
+    def test_export_rejects_unknown_format(self, client):
+        """An unsupported format returns 400."""
+        resp = client.get("/api/v1/history/export?format=xml")
+        assert resp.status_code == 400
+
+
+class TestHistoryStats:
+
+    def _batch_pickup(self, client, email="batch@test.com"):
+        """One user picks up every available donation in a single batch."""
+        user_id = create_test_user(client, email)
+        ids = [d["id"] for d in client.get("/api/v1/donations").get_json()]
+        body = client.post("/api/v1/holds/batch", json={"userId": user_id, "donationIds": ids}).get_json()
+        client.post("/api/v1/holds/pickup/batch", json={"holdIds": [r["hold"]["id"] for r in body["results"]]})
+        return user_id, len(ids)
+
+    def test_pickups_update_rollups(self, client):
+        """Single and batch pickups are counted per day, per user and per donor."""
+        user_id, donation_id = setup_completed_pickup(client)
+        today = datetime.now(timezone.utc).date().isoformat()
+
+        stats = client.get("/api/v1/history/stats").get_json()
+        assert stats == {"total": 1, "days": [{"date": today, "pickups": 1}]}
+
+        other, count = self._batch_pickup(client)
+        assert client.get("/api/v1/history/stats").get_json()["total"] == 1 + count
+        assert client.get(f"/api/v1/history/stats?userId={other}").get_json()["total"] == count
+        assert client.get(f"/api/v1/history/stats?userId={user_id}").get_json()["total"] == 1
+        donor = client.get("/api/v1/history/stats?donor=412-555-0202").get_json()
+        assert donor["days"] == [{"date": today, "pickups": 1}]
+
+    def test_rolled_back_pickup_is_not_counted(self, client):
+        user_id = create_test_user(client)
+        with pytest.raises(RuntimeError):
+            with unit_of_work.UnitOfWork():
+                HistoryService.record_pickup(user_id, "DON-001", donor_contact="412-555-0101")
+                raise RuntimeError("abort")
+        HistoryService.record_pickup(user_id, "DON-002", donor_contact="412-555-0202")
+
+        assert client.get("/api/v1/history/stats").get_json()["total"] == 1
+        assert client.get("/api/v1/history/stats?donor=412-555-0101").get_json()["total"] == 0
+
+    def test_rebuild_and_date_range(self, client):
+        """Rebuild recomputes from pickup_history; from is inclusive, to exclusive."""
+        alice = create_test_user(client, "alice@test.com", "Alice")
+        for day, donor in [(1, "a"), (2, "a"), (2, None), (3, "b")]:
+            db.session.add(PickupHistory(
+                user_id=alice, donation_id=f"DON-{day}", donor_contact=donor,
+                completed_at=datetime(2026, 3, day, 23, 30),
+            ))
+        db.session.commit()
+
+        assert client.get("/api/v1/history/stats").get_json()["total"] == 0
+        assert PickupStatsService.rebuild() == {
+            "pickup_daily_counts": 3, "pickup_user_daily_counts": 3, "pickup_donor_daily_counts": 4,
+        }
+
+        stats = client.get(f"/api/v1/history/stats?userId={alice}&from=2026-03-02&to=2026-03-03").get_json()
+        assert stats == {"total": 2, "days": [{"date": "2026-03-02", "pickups": 2}]}
+        assert client.get("/api/v1/history/stats?donor=a").get_json()["total"] == 2
+
+    def test_rebuild_joins_unit_of_work(self, client):
+        """Inside a UnitOfWork the rebuild is rolled back with the rest of the block."""
+        user_id = create_test_user(client)
+        HistoryService.record_pickup(user_id, "DON-001", donor_contact="412-555-0101")
+        db.session.add(PickupHistory(user_id=user_id, donation_id="DON-002", donor_contact=None))
+        db.session.commit()
+
+        with pytest.raises(RuntimeError):
+            with unit_of_work.UnitOfWork():
+                PickupStatsService.rebuild()
+                raise RuntimeError("abort")
+
+        assert client.get("/api/v1/history/stats").get_json()["total"] == 1
+        PickupStatsService.rebuild()
+        assert client.get("/api/v1/history/stats?donor=412-555-0101").get_json()["total"] == 1
+        assert client.get("/api/v1/history/stats?donor=").get_json()["total"] == 1
+
+    def test_rejects_bad_filters(self, client):
+        assert client.get("/api/v1/history/stats?userId=1&donor=a").status_code == 400
+        assert client.get("/api/v1/history/stats?from=March").status_code == 400
+
+
+class TestHistoryQueryBudget:
+
+    def _seed(self, user_id, count):
+        for i in range(count):
+            db.session.add(PickupHistory(user_id=user_id, donation_id=f"DON-{i:03d}"))
+        db.session.commit()
+
+    def test_history_is_one_query(self, client, query_budget):
+        user_id = create_test_user(client)
+        self._seed(user_id, 6)
+        with query_budget(1):
+            client.get(f"/api/v1/history?userId={user_id}")
+        with query_budget(1):
+            client.get(f"/api/v1/history?userId={user_id}&limit=2")
+
+    def test_export_is_one_query(self, client, query_budget):
+        user_id = create_test_user(client)
+        self._seed(user_id, 6)
+        with query_budget(1):
+            client.get("/api/v1/history/export?format=csv").get_data()
+
+    def test_stats_is_one_query(self, client, query_budget):
+        user_id = create_test_user(client)
+        self._seed(user_id, 6)
+        PickupStatsService.rebuild()
+        with query_budget(1):
+            client.get(f"/api/v1/history/stats?userId={user_id}&from=2026-01-01")
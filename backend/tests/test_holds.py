@@ -1,9 +1,23 @@
 """Tests for hold/reservation endpoints — core business logic."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 
+from sqlalchemy import func, select, update
+
+from app import create_app
+from config import TestConfig
 from conftest import create_test_user, get_first_donation_id, create_test_hold
+from models.availability_change import AvailabilityChange
 from models.hold import Hold, HoldStatus
+from models.hold_archive import HoldArchive
 from extensions import db
+from services import unit_of_work
+from services.hold_events import hold_created
+from services.hold_service import HoldService
+from services.user_service import UserService
+from services.hold_expiry_sweeper import HoldExpirySweeper
+from services.hold_archiver import HoldArchiver
 
 
 def expire_hold(hold_id):
@@ -48,6 +62,151 @@ class TestCreateHold:
         resp = client.post("/api/v1/holds", json={"userId": 1})
         assert resp.status_code == 400
 
+    def test_picked_up_donation_cannot_be_held(self, client):
+        """Holding a donation that was already picked up returns 409."""
+        _, donation_id, hold_id = create_test_hold(client)
+        client.post(f"/api/v1/holds/{hold_id}/pickup")
+
+        user_id = create_test_user(client, "late@test.com")
+        resp = client.post("/api/v1/holds", json={"userId": user_id, "donationId": donation_id})
+        assert resp.status_code == 409
+
+    def test_losing_hold_leaves_no_row(self, client):
+        """A rejected hold request does not persist a Hold row."""
+        user0 = create_test_user(client)
+        user1 = create_test_user(client, "user1@test.com")
+        donation_id = get_first_donation_id(client)
+        client.post("/api/v1/holds", json={"userId": user0, "donationId": donation_id})
+
+        client.post("/api/v1/holds", json={"userId": user1, "donationId": donation_id})
+        assert Hold.query.filter_by(user_id=user1).count() == 0
+
+
+class TestConcurrentHolds:
+
+    def test_concurrent_requests_have_single_winner(self, tmp_path):
+        """Simultaneous holds on one donation: exactly one succeeds, the rest lose cleanly."""
+        config = type("RaceConfig", (TestConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'race.db'}",
+        })
+        race_app = create_app(config)
+        with race_app.app_context():
+            user_ids = [
+                UserService.create_user(f"racer{i}@test.com", f"Racer {i}").id
+                for i in range(8)
+            ]
+        barrier = threading.Barrier(len(user_ids))
+
+        def attempt(user_id):
+            with race_app.app_context():
+                barrier.wait()
+                return HoldService.create_hold(user_id, "DON-001") is not None
+
+        with ThreadPoolExecutor(len(user_ids)) as pool:
+            results = list(pool.map(attempt, user_ids))
+
+        assert results.count(True) == 1
+        with race_app.app_context():
+            assert Hold.query.filter_by(donation_id="DON-001").count() == 1
+            db.engine.dispose()
+
+
+class TestBatchHolds:
+
+    def test_batch_reserves_all(self, client):
+        """POST /api/v1/holds/batch holds every free donation in one request."""
+        user_id = create_test_user(client)
+        ids = [d["id"] for d in client.get("/api/v1/donations").get_json()[:3]]
+
+        resp = client.post("/api/v1/holds/batch", json={"userId": user_id, "donationIds": ids})
+        assert resp.status_code == 201
+        body = resp.get_json()
+        assert body["success"] is True
+        assert [r["donationId"] for r in body["results"]] == ids
+        assert all(r["hold"]["status"] == "active" for r in body["results"])
+        assert Hold.query.filter_by(user_id=user_id).count() == 3
+
+    def test_batch_partial_conflict(self, client):
+        """Conflicting and unknown donations fail individually; the rest are held."""
+        user0 = create_test_user(client)
+        user1 = create_test_user(client, "user1@test.com")
+        ids = [d["id"] for d in client.get("/api/v1/donations").get_json()[:2]]
+        client.post("/api/v1/holds", json={"userId": user0, "donationId": ids[0]})
+
+        resp = client.post("/api/v1/holds/batch", json={
+            "userId": user1, "donationIds": ids + ["FAKE"],
+        })
+        assert resp.status_code == 201
+        results = {r["donationId"]: r for r in resp.get_json()["results"]}
+        assert results[ids[0]]["success"] is False
+        assert results[ids[1]]["success"] is True
+        assert "not found" in results["FAKE"]["error"].lower()
+        assert Hold.query.filter_by(user_id=user1).count() == 1
+
+    def test_batch_all_or_nothing_rolls_back(self, client):
+        """With allOrNothing, one conflict leaves no new holds and returns 409."""
+        user0 = create_test_user(client)
+        user1 = create_test_user(client, "user1@test.com")
+        ids = [d["id"] for d in client.get("/api/v1/donations").get_json()[:3]]
+        client.post("/api/v1/holds", json={"userId": user0, "donationId": ids[2]})
+
+        resp = client.post("/api/v1/holds/batch", json={
+            "userId": user1, "donationIds": ids, "allOrNothing": True,
+        })
+        assert resp.status_code == 409
+        assert not any(r["success"] for r in resp.get_json()["results"])
+        assert Hold.query.filter_by(user_id=user1).count() == 0
+        assert client.get("/api/v1/donations?showAll=true").get_json()[0]["isHeld"] is False
+
+    def test_batch_validation(self, client):
+        """Missing or oversized donationIds returns 400."""
+        assert client.post("/api/v1/holds/batch", json={"userId": 1}).status_code == 400
+        too_many = [f"DON-{i}" for i in range(51)]
+        resp = client.post("/api/v1/holds/batch", json={"userId": 1, "donationIds": too_many})
+        assert resp.status_code == 400
+
+    def test_batch_rejects_non_string_donation_ids(self, client):
+        """Donation IDs that are not non-empty strings return 400 instead of failing."""
+        user_id = create_test_user(client)
+        for bad in ([["DON-001"]], [{"id": "DON-001"}], [1], ["DON-001", ""], [None]):
+            resp = client.post("/api/v1/holds/batch", json={"userId": user_id, "donationIds": bad})
+            assert resp.status_code == 400, bad
+        assert Hold.query.filter_by(user_id=user_id).count() == 0
+
+
+class TestHoldsInUnitOfWork:
+
+    def test_conflict_keeps_enclosing_work(self, client):
+        """A losing hold inside a UnitOfWork leaves the block's earlier writes and callbacks alone."""
+        user0 = create_test_user(client)
+        user1 = create_test_user(client, "user1@test.com")
+        donation_id = get_first_donation_id(client)
+        created = []
+
+        with hold_created.connected_to(lambda sender, hold: created.append(hold.id)):
+            with unit_of_work.UnitOfWork():
+                winner = HoldService.create_hold(user0, donation_id)
+                assert HoldService.create_hold(user1, donation_id) is None
+
+        assert created == [winner.id]
+        assert Hold.query.filter_by(donation_id=donation_id).count() == 1
+        assert HoldService.get_held_donation_ids([donation_id]) == {donation_id}
+
+    def test_all_or_nothing_conflict_rolls_back_only_the_batch(self, client):
+        """An all-or-nothing batch that fails undoes its own claims, not the enclosing block's."""
+        user0 = create_test_user(client)
+        user1 = create_test_user(client, "user1@test.com")
+        ids = [d["id"] for d in client.get("/api/v1/donations").get_json()[:2]]
+
+        with unit_of_work.UnitOfWork():
+            winner = HoldService.create_hold(user0, ids[0])
+            results = HoldService.create_holds(user1, [ids[1], ids[0]], all_or_nothing=True)
+
+        assert results[ids[0]] is None
+        assert db.session.get(Hold, winner.id).status == HoldStatus.ACTIVE
+        assert Hold.query.filter_by(user_id=user1).count() == 0
+        assert HoldService.get_held_donation_ids(ids) == {ids[0]}
+
 
 class TestListHolds:
 
@@ -61,6 +220,34 @@ class TestListHolds:
         assert len(holds) >= 1
         assert holds[0]["donationId"] == donation_id
 
+    def test_list_holds_include_donation(self, client):
+        """includeDonation=true attaches the donation details to each hold."""
+        user_id, donation_id, _ = create_test_hold(client)
+
+        resp = client.get(f"/api/v1/holds?userId={user_id}&includeDonation=true")
+        hold = resp.get_json()[0]
+        assert hold["donation"]["id"] == donation_id
+        assert "description" in hold["donation"]
+
+    def test_list_holds_paginated(self, client):
+        """limit returns a page envelope whose cursor leads to the remaining holds."""
+        user_id = create_test_user(client)
+        donations = client.get("/api/v1/donations").get_json()
+        for d in donations[:3]:
+            client.post("/api/v1/holds", json={"userId": user_id, "donationId": d["id"]})
+
+        first = client.get(f"/api/v1/holds?userId={user_id}&limit=2").get_json()
+        assert len(first["items"]) == 2
+        assert first["nextCursor"] is not None
+
+        second = client.get(
+            f"/api/v1/holds?userId={user_id}&limit=2&cursor={first['nextCursor']}"
+        ).get_json()
+        assert len(second["items"]) == 1
+        assert second["nextCursor"] is None
+        seen = {h["id"] for h in first["items"] + second["items"]}
+        assert len(seen) == 3
+
     def test_list_holds_requires_user_id(self, client):
         """GET /api/v1/holds without userId returns 400."""
         resp = client.get("/api/v1/holds")
@@ -145,6 +332,49 @@ class TestConfirmPickup:
         resp = client.post(f"/api/v1/holds/{hold_id}/pickup")
         assert resp.status_code == 404
 
+    def test_pickup_rolls_back_if_history_fails(self, client, monkeypatch):
+        """A failure writing history leaves the hold active (single transaction)."""
+        from services.history_service import HistoryService
+
+        _, _, hold_id = create_test_hold(client)
+
+        def boom(**kwargs):
+            raise RuntimeError("history write failed")
+        monkeypatch.setattr(HistoryService, "record_pickup", staticmethod(boom))
+
+        try:
+            client.post(f"/api/v1/holds/{hold_id}/pickup")
+        except RuntimeError:
+            pass
+        db.session.expire_all()
+        assert db.session.get(Hold, hold_id).status == HoldStatus.ACTIVE
+
+    def test_batch_pickup(self, client):
+        """POST /api/v1/holds/pickup/batch confirms several holds at once."""
+        user_id = create_test_user(client)
+        ids = [d["id"] for d in client.get("/api/v1/donations").get_json()[:2]]
+        hold_ids = [
+            client.post("/api/v1/holds", json={"userId": user_id, "donationId": d}).get_json()["hold"]["id"]
+            for d in ids
+        ]
+
+        resp = client.post("/api/v1/holds/pickup/batch", json={"holdIds": hold_ids + [9999]})
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert body["success"] is False
+        results = {r["holdId"]: r for r in body["results"]}
+        assert all(results[h]["success"] for h in hold_ids)
+        assert results[9999]["success"] is False
+
+        history = client.get(f"/api/v1/history?userId={user_id}").get_json()
+        assert sorted(r["donationId"] for r in history) == sorted(ids)
+
+    def test_batch_pickup_validation(self, client):
+        """Bad holdIds payloads return 400; nothing confirmable returns 404."""
+        assert client.post("/api/v1/holds/pickup/batch", json={}).status_code == 400
+        assert client.post("/api/v1/holds/pickup/batch", json={"holdIds": ["x"]}).status_code == 400
+        assert client.post("/api/v1/holds/pickup/batch", json={"holdIds": [9999]}).status_code == 404
+
 
 class TestHoldExpiration:
     """Tests for the 2-hour hold expiration behavior."""
@@ -158,18 +388,69 @@ class TestHoldExpiration:
         assert resp.status_code == 200
         assert resp.get_json() == []
 
-    def test_expired_hold_lazily_marked_in_db(self, client):
-        """Querying active holds flips stale holds to expired status."""
+    def test_expired_hold_marked_in_db_by_sweep(self, client, app):
+        """A sweep flips stale holds to expired status in the database."""
         user_id, _, hold_id = create_test_hold(client)
         expire_hold(hold_id)
 
-        # Trigger lazy expiration by querying active holds
-        client.get(f"/api/v1/holds?userId={user_id}&active=true")
+        result = HoldExpirySweeper(app, interval_seconds=60).sweep()
+        assert result.expired == 1
 
         # Verify status was persisted
         hold = db.session.get(Hold, hold_id)
         assert hold.status == HoldStatus.EXPIRED
 
+    def test_reading_active_holds_does_not_write(self, client):
+        """Listing active holds filters stale holds without persisting a status change."""
+        user_id, _, hold_id = create_test_hold(client)
+        expire_hold(hold_id)
+
+        client.get(f"/api/v1/holds?userId={user_id}&active=true")
+
+        hold = db.session.get(Hold, hold_id)
+        assert hold.status == HoldStatus.ACTIVE
+
+    def test_sweep_only_expires_lapsed_holds(self, client, app):
+        """Sweeping leaves holds that are still within their window alone."""
+        user_id, _, stale_id = create_test_hold(client)
+        donation_id = client.get("/api/v1/donations").get_json()[0]["id"]
+        _, _, live_id = create_test_hold(client, user_id=user_id, donation_id=donation_id)
+        expire_hold(stale_id)
+
+        result = HoldExpirySweeper(app, interval_seconds=60).sweep()
+
+        assert result.expired == 1
+        assert result.duration_ms >= 0
+        assert db.session.get(Hold, live_id).status == HoldStatus.ACTIVE
+
+    def test_sweep_prunes_old_availability_changes(self, client, app):
+        """Sweeping deletes availability changes past retention but keeps the newest."""
+        create_test_hold(client)
+        create_test_hold(client)
+        version = HoldService.get_availability_version()
+        changes = db.session.scalar(select(func.count(AvailabilityChange.id)))
+        db.session.execute(
+            update(AvailabilityChange).values(changed_at=datetime.now(timezone.utc) - timedelta(days=2))
+        )
+        db.session.commit()
+
+        result = HoldExpirySweeper(app, 60, change_retention=timedelta(days=1)).sweep()
+
+        assert result.pruned == changes - 1
+        assert db.session.scalars(select(AvailabilityChange.id)).all() == [version]
+        assert HoldService.get_availability_version() == version
+
+    def test_app_sweeper_uses_configured_retention(self, tmp_path):
+        """create_app passes AVAILABILITY_CHANGE_RETENTION_HOURS to the in-app sweeper."""
+        config = type("SweepConfig", (TestConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'sweep.db'}",
+            "HOLD_SWEEP_INTERVAL_SECONDS": 60,
+            "AVAILABILITY_CHANGE_RETENTION_HOURS": 6,
+        })
+        sweeper = create_app(config).extensions["hold_expiry_sweeper"]
+
+        assert sweeper.change_retention == timedelta(hours=6)
+
     def test_cannot_cancel_expired_hold(self, client):
         """Cancelling an expired hold returns 404."""
         _, _, hold_id = create_test_hold(client)
@@ -215,4 +496,138 @@ class TestHoldExpiration:
         expire_hold(hold_id)
 
         resp = client.post("/api/v1/holds", json={"userId": user1, "donationId": donation_id})
-        assert resp.status_code == 201
\ No newline at end of file
+        assert resp.status_code == 201
+
+class TestHoldArchive:
+    """Moving long-finished holds to holds_archive."""
+
+    @staticmethod
+    def _finished_holds(client, count, status="cancel"):
+        """Create ``count`` holds for one user, finish them and age them 40 days."""
+        user_id = create_test_user(client)
+        # Cancelled donations return to the pool, so few donations go a long way
+        donation_ids = [d["id"] for d in client.get("/api/v1/donations").get_json()]
+        hold_ids = []
+        for i in range(count):
+            donation_id = donation_ids[i % len(donation_ids)]
+            _, _, hold_id = create_test_hold(client, user_id=user_id, donation_id=donation_id)
+            if status == "cancel":
+                client.delete(f"/api/v1/holds/{hold_id}")
+            else:
+                client.post(f"/api/v1/holds/{hold_id}/pickup")
+            hold_ids.append(hold_id)
+        long_ago = datetime.now(timezone.utc) - timedelta(days=40)
+        for i, hold_id in enumerate(hold_ids):
+            hold = db.session.get(Hold, hold_id)
+            hold.created_at = long_ago + timedelta(minutes=i)
+            hold.expires_at = long_ago + timedelta(hours=2)
+        db.session.commit()
+        return user_id, hold_ids
+
+    @staticmethod
+    def _archiver(app, batch_size=100, sleep=None):
+        return HoldArchiver(app, timedelta(days=30), batch_size, 0.5, sleep=sleep or (lambda s: None))
+
+    def test_moves_old_terminal_holds_only(self, client, app):
+        user_id, old_ids = self._finished_holds(client, 3)
+        donation_id = client.get("/api/v1/donations").get_json()[0]["id"]
+        _, _, active_id = create_test_hold(client, user_id=user_id, donation_id=donation_id)
+
+        result = self._archiver(app).run()
+
+        assert result.archived == 3
+        assert {h.id for h in HoldArchive.query} == set(old_ids)
+        assert [h.id for h in Hold.query] == [active_id]
+
+    def test_newest_hold_is_never_archived(self, client, app):
+        """Keeping max(id) in holds stops SQLite from reissuing an archived ID."""
+        _, hold_ids = self._finished_holds(client, 2)
+
+        assert self._archiver(app).run().archived == 1
+        assert [h.id for h in Hold.query] == [hold_ids[-1]]
+
+    def test_batches_are_throttled(self, client, app):
+        self._finished_holds(client, 6)
+        sleeps = []
+
+        result = self._archiver(app, batch_size=2, sleep=sleeps.append).run()
+
+        assert (result.archived, result.batches) == (5, 3)
+        assert sleeps == [0.5, 0.5]
+        assert self._archiver(app, batch_size=2).run(max_batches=1).archived == 0
+
+    def test_list_includes_archived_only_on_request(self, client, app):
+        user_id, hold_ids = self._finished_holds(client, 4)
+        before = client.get(f"/api/v1/holds?userId={user_id}").get_json()
+        self._archiver(app).run()
+
+        assert [h["id"] for h in client.get(f"/api/v1/holds?userId={user_id}").get_json()] == [hold_ids[-1]]
+        full = client.get(f"/api/v1/holds?userId={user_id}&includeArchived=true").get_json()
+        assert full == before
+
+    def test_paginated_list_merges_archive(self, client, app):
+        user_id, hold_ids = self._finished_holds(client, 5)
+        self._archiver(app).run()
+
+        seen, cursor = [], ""
+        while cursor is not None:
+            body = client.get(
+                f"/api/v1/holds?userId={user_id}&includeArchived=true&limit=2&cursor={cursor}"
+            ).get_json()
+            seen += [h["id"] for h in body["items"]]
+            cursor = body["nextCursor"]
+        assert seen == hold_ids[::-1]
+
+    def test_archived_pickup_keeps_donation_unavailable(self, client, app):
+        _, hold_ids = self._finished_holds(client, 2, status="pickup")
+        picked_up = db.session.get(Hold, hold_ids[0]).donation_id
+        self._archiver(app).run()
+
+        HoldService.rebuild_availability()
+
+        listed = [d["id"] for d in client.get("/api/v1/donations").get_json()]
+        assert picked_up not in listed
+
+
+class TestHoldQueryBudget:
+
+    def _donation_ids(self, client, count):
+        return [d["id"] for d in client.get("/api/v1/donations").get_json()[:count]]
+
+    def test_create_hold_budget(self, client, query_budget):
+        user_id = create_test_user(client)
+        donation_id = get_first_donation_id(client)
+        with query_budget(4):
+            client.post("/api/v1/holds", json={"userId": user_id, "donationId": donation_id})
+
+    def test_batch_hold_reloads_in_one_query(self, client, query_budget):
+        """Three writes per donation, then a single SELECT to serialize them all."""
+        user_id = create_test_user(client)
+        ids = self._donation_ids(client, 4)
+        with query_budget(3 * len(ids) + 1):
+            client.post("/api/v1/holds/batch", json={"userId": user_id, "donationIds": ids})
+
+    def test_list_holds_is_one_query(self, client, query_budget):
+        user_id = create_test_user(client)
+        ids = self._donation_ids(client, 4)
+        client.post("/api/v1/holds/batch", json={"userId": user_id, "donationIds": ids})
+        with query_budget(1):
+            client.get(f"/api/v1/holds?userId={user_id}&includeDonation=true")
+
+    def test_cancel_and_pickup_budget(self, client, query_budget):
+        user_id, _, hold_id = create_test_hold(client)
+        with query_budget(5):
+            client.delete(f"/api/v1/holds/{hold_id}")
+        _, _, hold_id = create_test_hold(client, user_id=user_id)
+        # Pickup writes plus one upsert per stats rollup table
+        with query_budget(9):
+            client.post(f"/api/v1/holds/{hold_id}/pickup")
+
+    def test_batch_pickup_has_no_per_hold_reads(self, client, query_budget):
+        """One hold lookup, one history reload and three rollup upserts; only the writes scale."""
+        user_id = create_test_user(client)
+        ids = self._donation_ids(client, 3)
+        body = client.post("/api/v1/holds/batch", json={"userId": user_id, "donationIds": ids}).get_json()
+        hold_ids = [r["hold"]["id"] for r in body["results"]]
+        with query_budget(5 + 4 * len(hold_ids)):
+            client.post("/api/v1/holds/pickup/batch", json={"holdIds": hold_ids})
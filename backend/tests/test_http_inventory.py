@@ -0,0 +1,192 @@
+"""Tests for HttpInventoryService against the local fake inventory server."""
+import pytest
+
+from conftest import create_test_user
+from fake_inventory_server import FakeInventoryServer
+from services.http_inventory_service import HttpInventoryService, InventoryRegion
+from services.inventory_service import InventoryServiceError, MockInventoryService
+
+PITTSBURGH = (40.4406, -79.9959)
+
+CLEVELAND_DONATION = {
+    "id": "CLE-001",
+    "description": "Canned soup",
+    "donationType": "Canned Goods",
+    "quantity": "2 cases",
+    "donorName": "Cleveland Grocers",
+    "donorContact": "216-555-0100",
+    "lat": 41.4993,
+    "lng": -81.6944,
+    "address": "1 Public Sq, Cleveland, OH 44113",
+    "expiresAt": "2026-03-01T12:00:00Z",
+}
+
+
+def start_server(**kwargs):
+    server = FakeInventoryServer(**kwargs)
+    server.start()
+    return server
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = start_server()
+    yield server
+    server.stop()
+
+
+def make_adapter(*urls, **kwargs):
+    regions = [InventoryRegion(f"r{i}", url) for i, url in enumerate(urls)]
+    kwargs.setdefault("sleep", lambda _: None)
+    return HttpInventoryService(regions, **kwargs)
+
+
+class TestHttpInventoryService:
+
+    def test_listing_matches_mock(self, server):
+        """Records are translated to the internal format and radius-filtered."""
+        adapter = make_adapter(server.url)
+        expected = MockInventoryService().get_available_donations(*PITTSBURGH, 5)
+
+        donations = adapter.get_available_donations(*PITTSBURGH, 5)
+
+        assert sorted(donations, key=lambda d: d["id"]) == sorted(expected, key=lambda d: d["id"])
+
+    def test_lookups(self, server):
+        """Single and batch lookups; unknown IDs are None / omitted."""
+        adapter = make_adapter(server.url)
+
+        assert adapter.get_donation_by_id("DON-002")["donorName"]
+        assert adapter.get_donation_by_id("FAKE") is None
+        assert set(adapter.get_donations_by_ids(["DON-001", "DON-003", "FAKE"])) == {"DON-001", "DON-003"}
+
+    def test_connections_are_reused(self):
+        """Sequential calls share one kept-alive connection."""
+        with FakeInventoryServer() as server:
+            adapter = make_adapter(server.url)
+            for _ in range(20):
+                adapter.get_available_donations()
+            assert server.stats["requests"] == 20
+            assert len(server.stats["connections"]) == 1
+
+    def test_transient_failures_are_retried(self):
+        """503s are retried with backoff until an attempt succeeds."""
+        delays = []
+        with FakeInventoryServer(fail_first=2) as server:
+            adapter = make_adapter(server.url, max_retries=2, backoff_seconds=0.1, sleep=delays.append)
+            assert adapter.get_available_donations()
+        assert len(delays) == 2
+        assert 0 <= delays[0] <= 0.1 and 0 <= delays[1] <= 0.2
+
+    def test_gives_up_after_max_retries(self):
+        """Persistent failures raise InventoryServiceError."""
+        with FakeInventoryServer(fail_first=10) as server:
+            adapter = make_adapter(server.url, max_retries=1)
+            with pytest.raises(InventoryServiceError):
+                adapter.get_donation_by_id("DON-001")
+            assert server.stats["requests"] == 2
+
+    def test_read_timeout(self):
+        """A slow response fails after the read timeout instead of hanging."""
+        with FakeInventoryServer(latency_seconds=0.5) as server:
+            adapter = make_adapter(server.url, read_timeout=0.05, max_retries=0)
+            with pytest.raises(InventoryServiceError):
+                adapter.get_available_donations()
+
+
+class TestRegionFanOut:
+
+    @pytest.fixture
+    def regions(self, server):
+        cleveland = start_server(inventory=MockInventoryService([CLEVELAND_DONATION]))
+        regions = [
+            InventoryRegion("pittsburgh", server.url, (39.5, -81.0, 41.5, -79.0)),
+            InventoryRegion("cleveland", cleveland.url, (40.5, -82.5, 42.5, -81.0)),
+        ]
+        yield regions, server, cleveland
+        cleveland.stop()
+
+    def test_only_overlapping_regions_are_queried(self, regions):
+        """A small radius around Pittsburgh never calls the Cleveland region."""
+        region_list, _, cleveland = regions
+        adapter = HttpInventoryService(region_list)
+
+        donations = adapter.get_available_donations(*PITTSBURGH, 10)
+
+        assert donations and all(d["id"].startswith("DON-") for d in donations)
+        assert cleveland.stats["requests"] == 0
+
+    def test_wide_radius_merges_regions(self, regions):
+        """A radius spanning both regions fans out and merges the results."""
+        region_list, _, cleveland = regions
+        adapter = HttpInventoryService(region_list)
+
+        ids = {d["id"] for d in adapter.get_available_donations(*PITTSBURGH, 150)}
+
+        assert "CLE-001" in ids and "DON-001" in ids
+        assert cleveland.stats["requests"] == 1
+
+    def test_failed_region_fails_listing(self, regions):
+        """One unreachable region fails the listing instead of returning part of it."""
+        region_list, _, _ = regions
+        dead = InventoryRegion("dead", "http://127.0.0.1:9", region_list[1].bounds)
+        adapter = HttpInventoryService([region_list[0], dead], max_retries=0, connect_timeout=0.2)
+
+        with pytest.raises(InventoryServiceError):
+            adapter.get_available_donations(*PITTSBURGH, 150)
+
+    def test_failed_region_fails_id_lookup(self, regions):
+        """An ID lookup cannot report a donation missing while a region is down."""
+        region_list, _, _ = regions
+        dead = InventoryRegion("dead", "http://127.0.0.1:9", region_list[1].bounds)
+        adapter = HttpInventoryService([region_list[0], dead], max_retries=0, connect_timeout=0.2)
+
+        with pytest.raises(InventoryServiceError):
+            adapter.get_donation_by_id("CLE-001")
+        with pytest.raises(InventoryServiceError):
+            adapter.get_donations_by_ids(["DON-001", "CLE-001"])
+
+    def test_region_overlap_across_antimeridian(self):
+        """Search boxes crossing ±180° still match regions on the other side."""
+        fiji = InventoryRegion("fiji", "http://unused", (-20.0, 177.0, -15.0, 180.0))
+        assert fiji.overlaps(-17.0, -179.9, 100)
+        assert not fiji.overlaps(40.0, -80.0, 100)
+
+
+class TestHttpBackendWiring:
+
+    def test_unreachable_inventory_returns_503(self):
+        """With INVENTORY_BACKEND=http, an unreachable API surfaces as 503."""
+        from app import create_app
+        from config import TestConfig
+
+        class HttpConfig(TestConfig):
+            INVENTORY_BACKEND = "http"
+            INVENTORY_API_URL = "http://127.0.0.1:9"
+            INVENTORY_MAX_RETRIES = 0
+            INVENTORY_CACHE_ENABLED = False
+
+        app = create_app(HttpConfig)
+        assert isinstance(app.config["RESERVATION_SERVICE"].inventory.inner, HttpInventoryService)
+        resp = app.test_client().get("/api/v1/donations")
+        assert resp.status_code == 503
+
+    def test_region_outage_fails_hold_with_503(self, server):
+        """A hold whose donation may live in an unreachable region is 503, not 404."""
+        from app import create_app
+        from config import TestConfig
+
+        class HttpConfig(TestConfig):
+            INVENTORY_BACKEND = "http"
+            INVENTORY_REGIONS = [
+                {"name": "up", "url": server.url},
+                {"name": "down", "url": "http://127.0.0.1:9"},
+            ]
+            INVENTORY_MAX_RETRIES = 0
+            INVENTORY_CONNECT_TIMEOUT_SECONDS = 0.2
+            INVENTORY_CACHE_ENABLED = False
+
+        client = create_app(HttpConfig).test_client()
+        user_id = create_test_user(client)
+        resp = client.post("/api/v1/holds", json={"userId": user_id, "donationId": "CLE-001"})
+        assert resp.status_code == 503
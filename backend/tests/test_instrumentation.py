@@ -0,0 +1,166 @@
+"""Tests for request instrumentation helpers."""
+import json
+import logging
+import pstats
+import re
+import threading
+
+from prometheus_client import REGISTRY
+
+from conftest import create_test_hold, create_test_user
+from instrumentation import QueryCount, count_queries
+
+
+class TestQueryCounter:
+
+    def test_counts_statements_in_block(self, client):
+        """Only statements executed inside the block are counted."""
+        create_test_hold(client)
+        with count_queries(record=True) as queries:
+            client.get("/api/v1/donations")
+
+        assert queries.count == len(queries.statements) > 0
+        assert any("donation_availability" in sql for sql in queries.statements)
+
+    def test_repeated_reads_flag_same_shape_selects(self):
+        """Reads differing only in bound values count as one shape; writes are ignored."""
+        queries = QueryCount(record=True, statements=[
+            "SELECT * FROM holds WHERE holds.id IN (?, ?)",
+            "SELECT *  FROM holds WHERE holds.id IN (?)",
+            "SELECT * FROM holds WHERE holds.id IN (?, ?, ?)",
+            "INSERT INTO holds (id) VALUES (?)",
+            "INSERT INTO holds (id) VALUES (?)",
+            "INSERT INTO holds (id) VALUES (?)",
+        ])
+
+        assert queries.repeated_reads() == {"SELECT * FROM holds WHERE holds.id IN (?)": 3}
+        assert queries.repeated_reads(threshold=4) == {}
+
+    def test_nested_blocks_roll_up(self, client):
+        with count_queries() as outer:
+            client.get("/api/v1/users/lookup?email=nobody@test.com")
+            with count_queries() as inner:
+                client.get("/api/v1/users/lookup?email=nobody@test.com")
+
+        assert inner.count == 1
+        assert outer.count == 2
+
+    def test_other_threads_not_counted(self, app, client):
+        """A counter in one thread ignores statements from another."""
+        def query_elsewhere():
+            with app.app_context():
+                app.test_client().get("/api/v1/users/lookup?email=x@test.com")
+
+        with count_queries() as queries:
+            thread = threading.Thread(target=query_elsewhere)
+            thread.start()
+            thread.join()
+
+        assert queries.count == 0
+
+
+def make_profiled_app(**overrides):
+    from app import create_app
+    from config import TestConfig
+
+    config = type("ProfiledConfig", (TestConfig,), {"PROFILING_ENABLED": True, **overrides})
+    return create_app(config)
+
+
+class TestRequestProfiling:
+
+    def test_server_timing_header(self):
+        """Responses carry app/db/inventory timings with query and call counts."""
+        app = make_profiled_app()
+        resp = app.test_client().get("/api/v1/donations")
+
+        timing = resp.headers["Server-Timing"]
+        assert timing.startswith("app;dur=")
+        assert re.search(r'db;dur=[\d.]+;desc="[1-9]\d* queries"', timing)
+        assert 'inventory;dur=' in timing and 'desc="1 calls"' in timing
+
+    def test_structured_log_line(self, caplog):
+        app = make_profiled_app()
+        with caplog.at_level(logging.INFO, logger="pantry.request"):
+            app.test_client().get("/api/v1/users/lookup?email=nobody@test.com")
+
+        entry = json.loads(caplog.records[-1].getMessage())
+        assert entry["path"] == "/api/v1/users/lookup"
+        assert entry["status"] == 404
+        assert entry["db_queries"] == 1
+        assert entry["inventory_calls"] == 0
+
+    def test_slow_requests_are_dumped(self, tmp_path):
+        """Sampled requests over the threshold leave a cProfile dump."""
+        app = make_profiled_app(
+            PROFILE_SAMPLE_RATE=1.0, PROFILE_THRESHOLD_MS=0, PROFILE_DIR=str(tmp_path)
+        )
+        app.test_client().get("/api/v1/donations")
+
+        dumps = list(tmp_path.glob("GET_api_v1_donations_*.prof"))
+        assert len(dumps) == 1
+        assert pstats.Stats(str(dumps[0])).total_calls > 0
+
+    def test_disabled_by_default(self, client):
+        assert "Server-Timing" not in client.get("/api/v1/health").headers
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+
+    def test_endpoint_serves_prometheus_text(self, client):
+        resp = client.get("/api/v1/metrics")
+
+        assert resp.status_code == 200
+        assert resp.content_type.startswith("text/plain")
+        body = resp.get_data(as_text=True)
+        assert "pantry_http_request_duration_seconds_bucket" in body
+        assert "pantry_holds_active" in body
+
+    def test_latency_labelled_by_route_template(self, client):
+        """Requests are grouped by URL rule, not by concrete path."""
+        labels = {"method": "DELETE", "route": "/api/v1/holds/<int:hold_id>"}
+        before = sample("pantry_http_request_duration_seconds_count", **labels)
+
+        client.delete("/api/v1/holds/998")
+        client.delete("/api/v1/holds/999")
+
+        assert sample("pantry_http_request_duration_seconds_count", **labels) == before + 2
+        assert sample(
+            "pantry_http_requests_total", status="404", **labels
+        ) >= 2
+
+    def test_hold_lifecycle_counters(self, client):
+        created = sample("pantry_holds_created_total")
+        conflicted = sample("pantry_holds_conflicted_total")
+        cancelled = sample("pantry_holds_cancelled_total")
+
+        _, donation_id, hold_id = create_test_hold(client)
+        other = create_test_user(client, "other@test.com")
+        client.post("/api/v1/holds", json={"userId": other, "donationId": donation_id})
+        client.delete(f"/api/v1/holds/{hold_id}")
+
+        assert sample("pantry_holds_created_total") == created + 1
+        assert sample("pantry_holds_conflicted_total") == conflicted + 1
+        assert sample("pantry_holds_cancelled_total") == cancelled + 1
+
+    def test_active_holds_gauge_counted_at_scrape(self, client):
+        create_test_hold(client)
+        client.get("/api/v1/metrics")
+        assert sample("pantry_holds_active") == 1
+
+    def test_pool_checkouts_and_cache_lookups_recorded(self, client):
+        checkouts = sample("pantry_db_pool_checkout_seconds_count")
+        misses = sample("pantry_inventory_cache_lookups_total", result="miss")
+        hits = sample("pantry_inventory_cache_lookups_total", result="hit")
+
+        client.get("/api/v1/donations?lat=1&lng=1&radius=1")
+        client.get("/api/v1/donations?lat=1&lng=1&radius=1")
+        client.get("/api/v1/metrics")
+
+        assert sample("pantry_db_pool_checkout_seconds_count") > checkouts
+        assert sample("pantry_inventory_cache_lookups_total", result="miss") == misses + 1
+        assert sample("pantry_inventory_cache_lookups_total", result="hit") == hits + 1
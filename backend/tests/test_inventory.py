@@ -0,0 +1,421 @@
+"""Tests for the inventory layer (caching decorator, geo index and mock adapter)."""
+import random
+import threading
+import time
+
+from services.caching_inventory_service import CachingInventoryService
+from services.coalescing_inventory_service import CoalescingInventoryService
+from services.geo import SpatialGridIndex, haversine_miles, within_radius
+from services.inventory_service import InventoryService, MockInventoryService
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingInventory(InventoryService):
+    """Wraps the mock inventory and counts backend calls."""
+
+    def __init__(self):
+        self.inner = MockInventoryService()
+        self.area_calls = []
+        self.id_calls = 0
+        self.refreshed = threading.Event()
+
+    def get_available_donations(self, lat=0, lng=0, radius=50):
+        self.area_calls.append((lat, lng, radius))
+        self.refreshed.set()
+        return self.inner.get_available_donations(lat, lng, radius)
+
+    def get_donation_by_id(self, donation_id):
+        self.id_calls += 1
+        return self.inner.get_donation_by_id(donation_id)
+
+
+class BatchCountingInventory(CountingInventory):
+    """Counting inventory that also records batch lookups."""
+
+    def __init__(self):
+        super().__init__()
+        self.batch_calls = []
+
+    def get_donations_by_ids(self, donation_ids):
+        donation_ids = list(donation_ids)
+        self.batch_calls.append(donation_ids)
+        return self.inner.get_donations_by_ids(donation_ids)
+
+
+def block_until_coalesced(backend, method, stats, callers, call):
+    """
+    Run ``call`` from several threads while ``backend.method`` is held open
+    until every caller but one has joined the in-flight call.
+    """
+    release = threading.Event()
+    original = getattr(backend, method)
+
+    def blocking(*args):
+        release.wait(timeout=2)
+        return original(*args)
+
+    setattr(backend, method, blocking)
+    results = [None] * len(callers)
+
+    def run(i):
+        results[i] = call(callers[i])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(callers))]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 2
+    while stats()["coalesced"] < len(callers) - 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+    return results
+
+
+def make_cache(**kwargs):
+    backend = CountingInventory()
+    clock = FakeClock()
+    cache = CachingInventoryService(backend, clock=clock, **kwargs)
+    return cache, backend, clock
+
+
+class TestCachingInventoryService:
+
+    def test_repeat_listing_served_from_cache(self):
+        """A second listing within the TTL does not reach the backend."""
+        cache, backend, _ = make_cache(ttl_seconds=30)
+
+        cache.get_available_donations(40.44, -79.99, 10)
+        cache.get_available_donations(40.44, -79.99, 10)
+
+        assert len(backend.area_calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_nearby_queries_share_quantized_key(self):
+        """Queries that round to the same grid cell share one entry."""
+        cache, backend, _ = make_cache(coordinate_step=0.01, radius_step=1.0)
+
+        cache.get_available_donations(40.4401, -79.9959, 9.2)
+        cache.get_available_donations(40.4404, -79.9962, 9.8)
+
+        assert len(backend.area_calls) == 1
+        assert backend.area_calls[0][:2] == (40.44, -80.0)
+        assert backend.area_calls[0][2] > 10.0
+
+    def test_quantized_results_match_uncached_service(self):
+        """Cached area listings return exactly what the wrapped service returns for the same query."""
+        rng = random.Random(11)
+        donations = [
+            {"id": f"P{i}", "lat": 40 + rng.uniform(-0.3, 0.3), "lng": -80 + rng.uniform(-0.3, 0.3)}
+            for i in range(2000)
+        ]
+        inner = MockInventoryService(donations)
+        cache = CachingInventoryService(inner, max_entries=100_000, clock=FakeClock())
+
+        for _ in range(1000):
+            lat, lng = 40 + rng.uniform(-0.2, 0.2), -80 + rng.uniform(-0.2, 0.2)
+            radius = rng.choice([0.5, 2, 5, rng.uniform(0.1, 10)])
+            expected = {d["id"] for d in inner.get_available_donations(lat, lng, radius)}
+            assert {d["id"] for d in cache.get_available_donations(lat, lng, radius)} == expected
+
+    def test_returned_donations_are_copies(self):
+        """Mutating a returned donation does not alter the cached value."""
+        cache, _, _ = make_cache()
+
+        first = cache.get_available_donations()
+        first[0]["isHeld"] = True
+
+        assert "isHeld" not in cache.get_available_donations()[0]
+
+    def test_stale_entry_served_while_refreshing(self):
+        """Past the TTL but within the stale window, the old value returns and a refresh runs."""
+        cache, backend, clock = make_cache(ttl_seconds=30, stale_seconds=60)
+        cache.get_available_donations()
+        backend.refreshed.clear()
+
+        clock.now = 45
+        result = cache.get_available_donations()
+
+        assert len(result) > 0
+        assert backend.refreshed.wait(timeout=2)
+        assert cache.stats()["stale_hits"] == 1
+
+    def test_expired_entry_refetched_synchronously(self):
+        """Past the stale window, the lookup is a miss."""
+        cache, backend, clock = make_cache(ttl_seconds=30, stale_seconds=60)
+        cache.get_available_donations()
+
+        clock.now = 200
+        cache.get_available_donations()
+
+        assert len(backend.area_calls) == 2
+        assert cache.stats()["misses"] == 2
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted once max_entries is exceeded."""
+        cache, backend, _ = make_cache(max_entries=2)
+
+        cache.get_donation_by_id("DON-001")
+        cache.get_donation_by_id("DON-002")
+        cache.get_donation_by_id("DON-001")  # DON-002 is now least recent
+        cache.get_donation_by_id("DON-003")
+        cache.get_donation_by_id("DON-001")
+
+        assert backend.id_calls == 3
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["size"] == 2
+
+    def test_unknown_donation_not_cached(self):
+        """Lookups for missing donations always reach the backend."""
+        cache, backend, _ = make_cache()
+
+        assert cache.get_donation_by_id("FAKE") is None
+        assert cache.get_donation_by_id("FAKE") is None
+        assert backend.id_calls == 2
+
+    def test_batch_fetches_only_uncached_ids(self):
+        """get_donations_by_ids serves cached IDs and fetches the rest in one call."""
+        backend = BatchCountingInventory()
+        cache = CachingInventoryService(backend, clock=FakeClock())
+        cache.get_donation_by_id("DON-001")
+
+        found = cache.get_donations_by_ids(["DON-001", "DON-002", "DON-003", "FAKE"])
+
+        assert set(found) == {"DON-001", "DON-002", "DON-003"}
+        assert backend.batch_calls == [["DON-002", "DON-003", "FAKE"]]
+        assert cache.get_donation_by_id("DON-002")["id"] == "DON-002"
+        assert backend.id_calls == 1
+
+    def test_concurrent_misses_are_coalesced(self):
+        """Simultaneous misses on one key make a single backend call."""
+        backend = CountingInventory()
+        release = threading.Event()
+        slow_listing = backend.get_available_donations
+
+        def blocking_listing(*args):
+            release.wait(timeout=2)
+            return slow_listing(*args)
+
+        backend.get_available_donations = blocking_listing
+        cache = CachingInventoryService(backend, clock=FakeClock())
+
+        threads = [threading.Thread(target=cache.get_available_donations) for _ in range(10)]
+        for t in threads:
+            t.start()
+        deadline = time.monotonic() + 2
+        while cache.stats()["coalesced"] < 9 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert len(backend.area_calls) == 1
+        assert cache.stats()["coalesced"] == 9
+
+    def test_snapshot_version_is_shared_across_instances(self):
+        """Caches in different workers report the same version for the same upstream state."""
+        wall = FakeClock()
+        wall.now = 1_000_000
+        workers = [
+            CachingInventoryService(CountingInventory(), clock=FakeClock(), wall_clock=wall)
+            for _ in range(2)
+        ]
+        workers[0].get_available_donations()
+
+        assert workers[0].get_snapshot_version() == workers[1].get_snapshot_version()
+
+    def test_snapshot_version_expires_without_reads(self):
+        """With no upstream version, the version moves after the TTL even if nothing refills the cache."""
+        clock = FakeClock()
+        backend = CountingInventory()
+        cache = CachingInventoryService(backend, ttl_seconds=30, stale_seconds=0, clock=clock, wall_clock=clock)
+        cache.get_available_donations()
+        v1 = cache.get_snapshot_version()
+
+        backend.inner.upsert_donation({**backend.inner.get_donation_by_id("DON-001"), "id": "DON-NEW"})
+        clock.now = 29
+        assert cache.get_snapshot_version() == v1
+        clock.now = 31
+        assert cache.get_snapshot_version() != v1
+
+    def test_snapshot_version_follows_upstream_version(self):
+        """An upstream that reports a version invalidates the ETag as soon as it changes."""
+        inner = MockInventoryService()
+        cache = CachingInventoryService(inner, clock=FakeClock())
+        cache.get_available_donations()
+        v1 = cache.get_snapshot_version()
+
+        inner.remove_donation("DON-001")
+        assert cache.get_snapshot_version() != v1
+        assert "DON-001" not in {d["id"] for d in cache.get_available_donations()}
+
+
+    def test_concurrent_batch_refetches_are_coalesced(self):
+        """Simultaneous batches missing the same IDs make a single backend call."""
+        backend = BatchCountingInventory()
+        cache = CachingInventoryService(backend, clock=FakeClock())
+        batches = [["DON-001", "DON-002"], ["DON-002", "DON-001"]] * 3
+
+        results = block_until_coalesced(
+            backend, "get_donations_by_ids", cache.stats, batches, cache.get_donations_by_ids
+        )
+
+        assert len(backend.batch_calls) == 1
+        assert all(set(r) == {"DON-001", "DON-002"} for r in results)
+
+
+class TestCoalescingInventoryService:
+
+    def test_concurrent_listings_share_one_call_without_cache(self):
+        """Identical listings in flight together make one backend call."""
+        backend = CountingInventory()
+        service = CoalescingInventoryService(backend)
+
+        results = block_until_coalesced(
+            backend, "get_available_donations", service.stats, [(40.44, -79.99, 5)] * 8,
+            lambda args: service.get_available_donations(*args),
+        )
+
+        assert len(backend.area_calls) == 1
+        assert service.stats()["coalesced"] == 7
+        assert all(r == results[0] for r in results) and results[0]
+
+    def test_batches_keyed_by_id_set(self):
+        """Batches for the same IDs in any order share a call; other batches do not."""
+        backend = BatchCountingInventory()
+        service = CoalescingInventoryService(backend)
+
+        block_until_coalesced(
+            backend, "get_donations_by_ids", service.stats,
+            [["DON-001", "DON-002"], ["DON-002", "DON-001", "DON-001"]], service.get_donations_by_ids,
+        )
+        service.get_donations_by_ids(["DON-003"])
+
+        assert backend.batch_calls == [["DON-001", "DON-002"], ["DON-003"]]
+
+    def test_callers_get_their_own_copies(self):
+        """Mutating one caller's result does not change another's."""
+        backend = CountingInventory()
+        service = CoalescingInventoryService(backend)
+
+        first, second = block_until_coalesced(
+            backend, "get_donation_by_id", service.stats, ["DON-001", "DON-001"],
+            service.get_donation_by_id,
+        )
+        first["isHeld"] = True
+
+        assert backend.id_calls == 1
+        assert "isHeld" not in second
+
+    def test_app_coalesces_with_cache_disabled(self):
+        """create_app keeps single-flight at the inventory boundary when the cache is off."""
+        from app import create_app
+        from config import TestConfig
+
+        class NoCacheConfig(TestConfig):
+            INVENTORY_CACHE_ENABLED = False
+
+        inventory = create_app(NoCacheConfig).config["RESERVATION_SERVICE"].inventory
+
+        assert isinstance(inventory, CoalescingInventoryService)
+        assert isinstance(inventory.inner, MockInventoryService)
+
+
+class TestSpatialGridIndex:
+
+    def test_haversine_known_distance(self):
+        """Pittsburgh to Philadelphia is roughly 257 miles."""
+        distance = haversine_miles(40.4406, -79.9959, 39.9526, -75.1652)
+        assert 250 < distance < 265
+
+    def test_query_matches_brute_force(self):
+        """Grid query returns exactly what an exhaustive haversine scan returns."""
+        rng = random.Random(7)
+        index = SpatialGridIndex(cell_degrees=0.05)
+        points = {}
+        for i in range(2000):
+            lat, lng = 40 + rng.uniform(-1, 1), -80 + rng.uniform(-1, 1)
+            points[f"P{i}"] = {"id": f"P{i}", "lat": lat, "lng": lng}
+            index.add(f"P{i}", lat, lng)
+
+        for radius in (0.5, 5, 25, 500):
+            expected = {d["id"] for d in within_radius(points.values(), 40.2, -80.1, radius)}
+            assert set(index.query(40.2, -80.1, radius)) == expected
+
+    def test_query_across_antimeridian(self):
+        """Items just across the 180th meridian are found."""
+        index = SpatialGridIndex()
+        index.add("east", 0.0, 179.95)
+        index.add("west", 0.0, -179.95)
+
+        assert set(index.query(0.0, 179.99, 20)) == {"east", "west"}
+
+    def test_move_and_remove(self):
+        """Re-adding an item moves it; removing it drops it from results."""
+        index = SpatialGridIndex()
+        index.add("A", 40.44, -79.99)
+        index.add("A", 34.05, -118.24)
+
+        assert index.query(40.44, -79.99, 10) == []
+        assert index.query(34.05, -118.24, 10) == ["A"]
+
+        index.remove("A")
+        assert index.query(34.05, -118.24, 10) == []
+        assert len(index) == 0
+
+
+class TestMockInventoryService:
+
+    def test_radius_filters_distant_donations(self):
+        """A small radius returns only donations near the center."""
+        inventory = MockInventoryService()
+        # Cohon Center (DON-002) is ~0.3 mi from this point; downtown is ~2.8 mi
+        nearby = inventory.get_available_donations(40.4440, -79.9430, 1)
+        assert [d["id"] for d in nearby] == ["DON-002"]
+
+    def test_no_center_returns_everything(self):
+        """Omitting lat/lng disables geo filtering."""
+        inventory = MockInventoryService()
+        assert len(inventory.get_available_donations()) == len(MockInventoryService._DONATIONS)
+
+    def test_batch_lookup(self):
+        """get_donations_by_ids returns found donations keyed by ID, skipping unknown IDs."""
+        inventory = MockInventoryService()
+        found = inventory.get_donations_by_ids(["DON-003", "FAKE", "DON-001"])
+        assert set(found) == {"DON-001", "DON-003"}
+        assert found["DON-003"]["id"] == "DON-003"
+
+    def test_default_batch_falls_back_to_single_lookups(self):
+        """The base-class batch method loops over get_donation_by_id, de-duplicating IDs."""
+        backend = CountingInventory()
+        found = backend.get_donations_by_ids(["DON-001", "DON-001", "DON-002"])
+        assert set(found) == {"DON-001", "DON-002"}
+        assert backend.id_calls == 2
+
+    def test_upsert_updates_index(self):
+        """Newly upserted donations become visible to radius queries."""
+        inventory = MockInventoryService()
+        inventory.upsert_donation({"id": "DON-LA", "lat": 34.05, "lng": -118.24})
+
+        assert [d["id"] for d in inventory.get_available_donations(34.05, -118.24, 5)] == ["DON-LA"]
+        inventory.remove_donation("DON-LA")
+        assert inventory.get_available_donations(34.05, -118.24, 5) == []
+
+    def test_mutations_bump_snapshot_version(self):
+        """upsert/remove change the snapshot version; unknown removals don't."""
+        inv = MockInventoryService()
+        v0 = inv.get_snapshot_version()
+        inv.upsert_donation({**MockInventoryService._DONATIONS[0], "quantity": "1 lb"})
+        v1 = inv.get_snapshot_version()
+        inv.remove_donation("NOPE")
+        assert inv.get_snapshot_version() == v1 != v0
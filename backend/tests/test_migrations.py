@@ -0,0 +1,125 @@
+"""Tests for the versioned schema migration runner."""
+from sqlalchemy import create_engine, inspect, text
+
+from migrations import applied_versions, pending_migrations, run_migrations
+from migrations.versions import MIGRATIONS
+from models.donation_availability import DonationAvailability
+from models.pickup_rollups import PickupDailyCount, PickupDonorDailyCount, PickupUserDailyCount
+
+
+LEGACY_SCHEMA = [
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(255) NOT NULL,"
+    " name VARCHAR(255) NOT NULL, created_at DATETIME NOT NULL)",
+    "CREATE TABLE holds (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL,"
+    " donation_id VARCHAR(100) NOT NULL, status VARCHAR(9) NOT NULL,"
+    " created_at DATETIME NOT NULL, expires_at DATETIME NOT NULL)",
+    "CREATE TABLE pickup_history (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL,"
+    " donation_id VARCHAR(100) NOT NULL, donation_description VARCHAR(500),"
+    " donor_contact VARCHAR(255), pickup_location VARCHAR(500),"
+    " completed_at DATETIME NOT NULL)",
+    "INSERT INTO holds VALUES (1, 1, 'DON-001', 'COMPLETED',"
+    " '2026-01-01 00:00:00.000000', '2026-01-01 02:00:00.000000')",
+    "INSERT INTO holds VALUES (2, 1, 'DON-002', 'ACTIVE',"
+    " '2026-01-01 00:00:00.000000', '2099-01-01 02:00:00.000000')",
+    "INSERT INTO holds VALUES (3, 1, 'DON-003', 'ACTIVE',"
+    " '2026-01-01 00:00:00.000000', '2020-01-01 02:00:00.000000')",
+]
+
+
+def make_legacy_engine(tmp_path):
+    """Create a file-backed SQLite database with the pre-migration schema."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            conn.execute(text(statement))
+    return engine
+
+
+class TestMigrations:
+
+    def test_upgrades_legacy_schema(self, tmp_path):
+        """All migrations apply to a legacy database and add columns and indexes."""
+        engine = make_legacy_engine(tmp_path)
+
+        applied = run_migrations(engine)
+
+        assert [m.version for m in applied] == [m.version for m in MIGRATIONS]
+        inspector = inspect(engine)
+        columns = {c["name"] for c in inspector.get_columns("holds")}
+        assert {"completed_at", "cancelled_at"} <= columns
+        indexes = {i["name"] for i in inspector.get_indexes("holds")}
+        assert {"ix_holds_donation_status", "ix_holds_user_status_created", "ix_holds_status_expires"} <= indexes
+        assert inspector.has_table("holds_archive")
+        assert inspector.has_table("pickup_user_daily_counts")
+
+    def test_backfills_donation_availability(self, tmp_path):
+        """Completed and unexpired active holds are copied into donation_availability."""
+        engine = make_legacy_engine(tmp_path)
+        run_migrations(engine)
+
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT donation_id, status FROM donation_availability ORDER BY donation_id"
+            )).all()
+        assert rows == [("DON-001", "COMPLETED"), ("DON-002", "ACTIVE")]
+
+    def test_backfills_donation_availability_around_existing_rows(self, tmp_path):
+        """Rows written after create_all are kept and the missing ones still backfilled."""
+        engine = make_legacy_engine(tmp_path)
+        DonationAvailability.__table__.create(engine)
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO donation_availability VALUES ('DON-002', 2, 'ACTIVE'), ('DON-009', 9, 'ACTIVE')"
+            ))
+        run_migrations(engine)
+        with engine.begin() as conn:
+            MIGRATIONS[1].upgrade(conn)
+
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT donation_id, status FROM donation_availability ORDER BY donation_id"
+            )).all()
+        assert rows == [("DON-001", "COMPLETED"), ("DON-002", "ACTIVE"), ("DON-009", "ACTIVE")]
+
+    def test_backfills_rollups_created_by_create_all(self, tmp_path):
+        """Rollup tables that already exist but are empty are filled from pickup_history."""
+        engine = make_legacy_engine(tmp_path)
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO pickup_history (user_id, donation_id, donor_contact, completed_at) VALUES"
+                " (1, 'DON-001', 'a@example.com', '2026-01-01 09:00:00.000000'),"
+                " (1, 'DON-002', NULL, '2026-01-01 17:00:00.000000'),"
+                " (2, 'DON-003', 'a@example.com', '2026-01-02 09:00:00.000000')"
+            ))
+        rollups = [PickupDailyCount, PickupUserDailyCount, PickupDonorDailyCount]
+        for model in rollups:
+            model.__table__.create(engine)
+
+        run_migrations(engine)
+
+        with engine.connect() as conn:
+            daily = conn.execute(text(
+                "SELECT day, pickups FROM pickup_daily_counts ORDER BY day"
+            )).all()
+            donors = conn.execute(text(
+                "SELECT donor, day, pickups FROM pickup_donor_daily_counts ORDER BY donor, day"
+            )).all()
+            users = conn.execute(text("SELECT COUNT(*) FROM pickup_user_daily_counts")).scalar()
+        assert daily == [("2026-01-01", 2), ("2026-01-02", 1)]
+        assert donors == [("", "2026-01-01", 1), ("a@example.com", "2026-01-01", 1), ("a@example.com", "2026-01-02", 1)]
+        assert users == 2
+
+    def test_rerun_is_noop(self, tmp_path):
+        """Running migrations twice applies nothing the second time."""
+        engine = make_legacy_engine(tmp_path)
+        run_migrations(engine)
+
+        assert run_migrations(engine) == []
+        assert pending_migrations(engine) == []
+        assert applied_versions(engine) == {m.version for m in MIGRATIONS}
+
+    def test_idempotent_on_current_schema(self, app, db):
+        """Migrations are no-ops against a schema already built by create_all."""
+        with app.app_context():
+            run_migrations(db.engine)
+            assert pending_migrations(db.engine) == []
@@ -0,0 +1,130 @@
+"""Tests for read-replica routing and read-your-writes pinning."""
+import runpy
+import sqlite3
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from sqlalchemy.engine import Engine
+
+from app import create_app
+from config import TestConfig, engine_options
+from conftest import create_test_hold, create_test_user
+from db_routing import PRIMARY_COOKIE, read_replica, sync_sqlite_replica
+from extensions import db
+from models.user import User
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    """App on a SQLite primary with one SQLite replica, synced once at start."""
+    primary = tmp_path / "primary.db"
+    replica = tmp_path / "replica.db"
+    config = type("ReplicaConfig", (TestConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{primary}",
+        "SQLALCHEMY_ENGINE_OPTIONS": engine_options(f"sqlite:///{primary}"),
+        "DATABASE_REPLICA_URLS": [f"sqlite:///{replica}"],
+        "REPLICA_READ_YOUR_WRITES_SECONDS": 60,
+    })
+    app = create_app(config)
+    app.sync = lambda: sync_sqlite_replica(str(primary), str(replica))
+    app.sync()
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def add_replica_only_user(tmp_path, email):
+    """Insert a user that exists on the replica but not on the primary."""
+    with sqlite3.connect(tmp_path / "replica.db") as conn:
+        conn.execute(
+            "INSERT INTO users (email, name, created_at) VALUES (?, 'Ghost', '2026-01-01 00:00:00')",
+            (email,),
+        )
+
+
+class TestReplicaRouting:
+
+    def test_read_only_calls_use_replica(self, replica_app, tmp_path):
+        add_replica_only_user(tmp_path, "ghost@test.com")
+        client = replica_app.test_client()
+
+        assert client.get("/api/v1/users/lookup?email=ghost@test.com").status_code == 200
+
+    def test_writes_go_to_primary(self, replica_app, tmp_path):
+        client = replica_app.test_client()
+        client.post("/api/v1/users", json={"email": "new@test.com", "name": "New"})
+
+        with replica_app.app_context():
+            assert User.query.filter_by(email="new@test.com").count() == 1
+            with read_replica():
+                assert User.query.filter_by(email="new@test.com").count() == 0
+
+        replica_app.sync()
+        assert client.get("/api/v1/users/lookup?email=new@test.com").status_code == 200
+
+    def test_reads_in_a_writing_transaction_stay_on_primary(self, replica_app):
+        with replica_app.app_context():
+            db.session.add(User(email="pending@test.com", name="Pending"))
+            db.session.flush()
+            with read_replica():
+                assert User.query.filter_by(email="pending@test.com").count() == 1
+            db.session.rollback()
+
+
+class TestReadYourWrites:
+
+    def test_own_hold_visible_before_replica_catches_up(self, replica_app):
+        client = replica_app.test_client()
+        user_id, _, hold_id = create_test_hold(client)
+
+        holds = client.get(f"/api/v1/holds?userId={user_id}").get_json()
+        assert [h["id"] for h in holds] == [hold_id]
+
+    def test_pin_is_per_user_and_expires(self, replica_app):
+        client = replica_app.test_client()
+        replica_app.sync()
+        other = create_test_user(client, "other@test.com")
+        replica_app.sync()
+        user_id, _, _ = create_test_hold(client)
+        client.delete_cookie(PRIMARY_COOKIE)
+
+        # Another user's reads are not pinned and see the stale replica
+        assert client.get(f"/api/v1/holds?userId={other}").get_json() == []
+        router = replica_app.extensions["replica_router"]
+        assert router.must_use_primary(user_id)
+        assert not router.must_use_primary(other)
+
+        router.window_seconds = 0
+        with replica_app.test_request_context():
+            router.note_write(user_id)
+        assert client.get(f"/api/v1/holds?userId={user_id}").get_json() == []
+
+    def test_cookie_pins_client_across_workers(self, replica_app):
+        """A fresh router (another worker) still honours the client's cookie."""
+        client = replica_app.test_client()
+        user_id, _, hold_id = create_test_hold(client)
+        assert client.get_cookie(PRIMARY_COOKIE) is not None
+
+        replica_app.extensions["replica_router"]._pinned.clear()
+        holds = client.get(f"/api/v1/holds?userId={user_id}").get_json()
+        assert [h["id"] for h in holds] == [hold_id]
+
+
+class TestReplicaForkSafety:
+
+    def test_post_fork_disposes_every_engine(self, replica_app, monkeypatch):
+        """gunicorn's post_fork hook forgets inherited connections of the primary and each replica."""
+        monkeypatch.setitem(sys.modules, "wsgi", types.SimpleNamespace(app=replica_app))
+        disposed = []
+        monkeypatch.setattr(Engine, "dispose", lambda self, close=True: disposed.append((self, close)))
+        conf = runpy.run_path(str(Path(__file__).resolve().parents[1] / "gunicorn.conf.py"))
+
+        conf["post_fork"](None, None)
+
+        with replica_app.app_context():
+            engines = list(db.engines.values())
+        assert len(engines) == 2
+        assert disposed == [(engine, False) for engine in engines]
@@ -0,0 +1,91 @@
+"""Tests for the synthetic data generator and `flask seed`."""
+from datetime import datetime, timezone
+
+from models import DonationAvailability, Hold, PickupHistory, User
+from models.hold import HoldStatus
+from seed_data import SeedVolumes, seed_database, synthetic_donations, write_inventory_file
+from services.hold_service import HoldService
+from services.inventory_service import MockInventoryService
+
+
+class TestSyntheticInventory:
+
+    def test_deterministic_for_a_seed(self):
+        assert synthetic_donations(50, seed=7) == synthetic_donations(50, seed=7)
+        assert synthetic_donations(50, seed=7) != synthetic_donations(50, seed=8)
+
+    def test_inventory_file_round_trip(self, tmp_path):
+        """A written inventory file can be served by MockInventoryService."""
+        path = tmp_path / "inventory.json"
+        donations = synthetic_donations(200, seed=1)
+        write_inventory_file(str(path), donations)
+
+        inventory = MockInventoryService.from_file(str(path))
+
+        assert len(inventory.get_available_donations()) == 200
+        assert inventory.get_donation_by_id("SYN-0000199") == donations[199]
+
+
+class TestSeedDatabase:
+
+    def test_rows_respect_hold_invariants(self, db):
+        """Completed holds get pickups; active holds are live and own their donation."""
+        donation_ids = [d["id"] for d in synthetic_donations(100)]
+        counts = seed_database(SeedVolumes(users=20, holds=2000, donations=100), 0, donation_ids)
+
+        assert counts["users"] == User.query.count() == 20
+        assert counts["holds"] == Hold.query.count() == 2000
+        completed = Hold.query.filter_by(status=HoldStatus.COMPLETED).count()
+        assert counts["pickups"] == PickupHistory.query.count() == completed
+
+        active = Hold.query.filter_by(status=HoldStatus.ACTIVE).all()
+        assert active
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        assert all(h.expires_at > now for h in active)
+        assert HoldService.get_held_donation_ids(donation_ids) == {h.donation_id for h in active}
+        assert DonationAvailability.query.count() == completed + len(active)
+
+    def test_reseeding_appends(self, db):
+        """A second run continues after existing IDs instead of colliding."""
+        seed_database(SeedVolumes(users=5, holds=50, donations=0))
+        seed_database(SeedVolumes(users=5, holds=50, donations=0), seed=1)
+
+        assert User.query.count() == 10
+        assert Hold.query.count() == 100
+
+    def test_reseeding_skips_claimed_donations(self, db):
+        """Active holds from a second run never claim a donation the first run holds."""
+        donation_ids = [d["id"] for d in synthetic_donations(100)]
+        volumes = SeedVolumes(users=10, holds=1000, donations=100)
+        seed_database(volumes, 0, donation_ids)
+        first = {h.donation_id for h in Hold.query.filter_by(status=HoldStatus.ACTIVE)}
+
+        seed_database(volumes, 1, donation_ids)
+
+        active = Hold.query.filter_by(status=HoldStatus.ACTIVE).all()
+        assert len(active) > len(first)
+        assert len({h.donation_id for h in active}) == len(active)
+        assert HoldService.get_held_donation_ids(donation_ids) == {h.donation_id for h in active}
+
+    def test_cli_command_twice(self, app, db, tmp_path):
+        """`flask seed` can be run again against the same database and inventory."""
+        path = tmp_path / "inventory.json"
+        args = ["seed", "--users", "3", "--holds", "300", "--donations", "10", "--inventory-file", str(path)]
+        runner = app.test_cli_runner()
+
+        for _ in range(2):
+            result = runner.invoke(args=args)
+            assert result.exit_code == 0, result.output
+
+        assert Hold.query.count() == 600
+
+    def test_cli_command(self, app, db, tmp_path):
+        """`flask seed` inserts rows and writes the inventory file."""
+        path = tmp_path / "inventory.json"
+        result = app.test_cli_runner().invoke(args=[
+            "seed", "--users", "3", "--holds", "30", "--donations", "10", "--inventory-file", str(path),
+        ])
+
+        assert result.exit_code == 0, result.output
+        assert "inserted 3 users, 30 holds" in result.output
+        assert len(MockInventoryService.from_file(str(path)).get_available_donations()) == 10
@@ -0,0 +1,62 @@
+"""Tests for single-flight request coalescing."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Threads asking for the same key while it runs get the leader's result."""
+        flights = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def slow():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return "value"
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            leader = pool.submit(flights.do, "k", slow)
+            started.wait()
+            followers = [pool.submit(flights.do, "k", slow) for _ in range(7)]
+            results = [leader.result()] + [f.result() for f in followers]
+
+        assert results == ["value"] * 8
+        assert calls == [1]
+        stats = flights.stats()
+        assert stats["executions"] == 1 and stats["coalesced"] == 7
+        assert stats["in_flight"] == 0
+
+    def test_errors_reach_every_waiter(self):
+        """An exception from the shared call is raised in all waiters, then forgotten."""
+        flights = SingleFlight()
+        started = threading.Event()
+
+        def failing():
+            started.set()
+            time.sleep(0.05)
+            raise RuntimeError("backend down")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flights.do, "k", failing)
+            started.wait()
+            follower = pool.submit(flights.do, "k", failing)
+            for future in (leader, follower):
+                with pytest.raises(RuntimeError):
+                    future.result()
+
+        assert flights.do("k", lambda: "recovered") == "recovered"
+        assert flights.stats()["errors"] == 1
+
+    def test_distinct_keys_run_independently(self):
+        flights = SingleFlight()
+        assert flights.do("a", lambda: 1) == 1
+        assert flights.do("b", lambda: 2) == 2
+        assert flights.stats()["coalesced"] == 0
@@ -0,0 +1,181 @@
+"""Tests for the availability change broker and SSE stream."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from conftest import create_test_hold
+from extensions import db
+from models.availability_change import AvailabilityChange
+from services.availability_broker import AvailabilityBroker, AvailabilityEvent, ConsumerTooSlow
+from services.hold_service import HoldService
+
+
+@pytest.fixture
+def broker(app, monkeypatch):
+    """Fresh broker per test; its thread only primes and then sleeps."""
+    broker = AvailabilityBroker(app, poll_interval_seconds=3600, buffer_size=4)
+    monkeypatch.setitem(app.extensions, "availability_broker", broker)
+    monkeypatch.setitem(app.config, "AVAILABILITY_STREAM_HEARTBEAT_SECONDS", 0.01)
+    yield broker
+    broker.stop()
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def add_change(change_id, donation_id):
+    """Insert an availability change with a chosen ID, as a late or out-of-order commit would."""
+    db.session.add(AvailabilityChange(id=change_id, donation_id=donation_id, is_held=True))
+    db.session.commit()
+
+
+def read_frames(resp, count):
+    """Read ``count`` chunks from a streaming response, then close it."""
+    frames = [next(resp.response) for _ in range(count)]
+    resp.close()
+    return [f.decode() if isinstance(f, bytes) else f for f in frames]
+
+
+class TestAvailabilityBroker:
+
+    def test_poll_publishes_new_changes(self, client, broker):
+        """Changes written after priming are published to waiting streams."""
+        broker.poll()
+        start = broker.last_id
+        _, donation_id, _ = create_test_hold(client)
+
+        assert broker.poll() == 1
+        events = broker.wait_for_events(start, timeout=0)
+        assert [(e.donation_id, e.is_held) for e in events] == [(donation_id, True)]
+
+    def test_late_commit_is_not_skipped(self, app, client):
+        """A change that commits after a higher ID holds that ID back instead of being lost."""
+        clock = FakeClock()
+        broker = AvailabilityBroker(app, buffer_size=10, gap_timeout_seconds=3, clock=clock)
+        broker.poll()
+        start = broker.last_id
+        add_change(start + 2, "DON-LATER")
+
+        assert broker.poll() == 0
+        add_change(start + 1, "DON-FIRST")
+        assert broker.poll() == 2
+        events = broker.wait_for_events(start, timeout=0)
+        assert [e.donation_id for e in events] == ["DON-FIRST", "DON-LATER"]
+
+    def test_gap_is_skipped_after_timeout(self, app, client):
+        """An ID that never commits (rolled back) only delays later changes by the gap timeout."""
+        clock = FakeClock()
+        broker = AvailabilityBroker(app, buffer_size=10, gap_timeout_seconds=3, clock=clock)
+        broker.poll()
+        start = broker.last_id
+        add_change(start + 2, "DON-AFTER-ROLLBACK")
+
+        assert broker.poll() == 0
+        clock.now = 2
+        assert broker.poll() == 0
+        clock.now = 3
+        assert broker.poll() == 1
+        assert broker.last_id == start + 2
+
+    def test_slow_consumer_is_dropped(self, client, broker):
+        """A cursor that fell out of the ring raises ConsumerTooSlow."""
+        broker.publish([AvailabilityEvent(i, f"DON-{i}", True) for i in range(1, 7)])
+
+        assert [e.id for e in broker.wait_for_events(2, timeout=0)] == [3, 4, 5, 6]
+        with pytest.raises(ConsumerTooSlow):
+            broker.wait_for_events(1, timeout=0)
+
+
+class TestAvailabilityStream:
+
+    def test_stream_replays_missed_events(self, client, broker):
+        """Last-Event-ID replays persisted changes, then heartbeats."""
+        _, donation_id, hold_id = create_test_hold(client)
+        client.delete(f"/api/v1/holds/{hold_id}")
+
+        resp = client.get("/api/v1/donations/stream", headers={"Last-Event-ID": "0"})
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/event-stream"
+        retry, held, released, ping = read_frames(resp, 4)
+
+        assert retry.startswith("retry:")
+        assert f'"donationId": "{donation_id}", "isHeld": true' in held
+        assert '"isHeld": false' in released
+        assert ping.startswith(":")
+
+    def test_stream_resets_when_too_far_behind(self, client, broker):
+        """Missing more than the buffer tells the client to reload."""
+        for _ in range(3):
+            _, _, hold_id = create_test_hold(client)
+            client.delete(f"/api/v1/holds/{hold_id}")
+
+        resp = client.get("/api/v1/donations/stream?lastEventId=0")
+        _, reset = read_frames(resp, 2)
+        assert f"id: {HoldService.get_availability_version()}\nevent: reset" in reset
+
+    def test_new_worker_replays_from_database(self, app, client, monkeypatch):
+        """A client resuming on a worker whose ring never saw its events still gets them."""
+        create_test_hold(client)
+        last_seen = HoldService.get_availability_version()
+        _, donation_id, hold_id = create_test_hold(client, email="second@test.com")
+        client.delete(f"/api/v1/holds/{hold_id}")
+
+        # Recycled worker: a new broker primed after the changes were made
+        recycled = AvailabilityBroker(app, poll_interval_seconds=3600, buffer_size=4)
+        monkeypatch.setitem(app.extensions, "availability_broker", recycled)
+        try:
+            resp = client.get("/api/v1/donations/stream", headers={"Last-Event-ID": str(last_seen)})
+            _, held, released = read_frames(resp, 3)
+        finally:
+            recycled.stop()
+
+        assert f'"donationId": "{donation_id}", "isHeld": true' in held
+        assert f'"donationId": "{donation_id}", "isHeld": false' in released
+
+    def test_stream_resets_when_history_was_pruned(self, client, broker):
+        """Changes the client missed that were pruned trigger a reset instead of a gap."""
+        _, _, hold_id = create_test_hold(client)
+        client.delete(f"/api/v1/holds/{hold_id}")
+        create_test_hold(client)
+        HoldService.prune_availability_changes(datetime.now(timezone.utc) + timedelta(minutes=1))
+
+        resp = client.get("/api/v1/donations/stream?lastEventId=1")
+        _, reset = read_frames(resp, 2)
+        assert "event: reset" in reset
+
+    def test_replay_stops_before_a_gap(self, client, broker):
+        """Replay only returns what the broker published, so a late commit below it still streams."""
+        broker.poll()
+        start = broker.last_id
+        _, donation_id, _ = create_test_hold(client)
+        broker.poll()
+        add_change(start + 3, "DON-LATER")
+
+        assert [e.donation_id for e in broker.replay(start)] == [donation_id]
+
+    def test_streams_over_limit_get_503(self, client, broker):
+        """Past max_streams a worker refuses new streams until one closes."""
+        broker.max_streams = 1
+        first = client.get("/api/v1/donations/stream")
+        assert first.status_code == 200
+
+        refused = client.get("/api/v1/donations/stream")
+        assert refused.status_code == 503
+        assert refused.headers["Retry-After"]
+
+        first.close()
+        again = client.get("/api/v1/donations/stream")
+        assert again.status_code == 200
+        again.close()
+
+    def test_invalid_last_event_id(self, client, broker):
+        """A non-integer Last-Event-ID returns 400."""
+        resp = client.get("/api/v1/donations/stream", headers={"Last-Event-ID": "abc"})
+        assert resp.status_code == 400
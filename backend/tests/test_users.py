@@ -41,4 +41,21 @@ class TestUserEndpoints:
     def test_lookup_missing_email_param(self, client):
         """GET /api/v1/users/lookup without email param returns 400."""
         resp = client.get("/api/v1/users/lookup")
-        assert resp.status_code == 400
\ No newline at end of file
+        assert resp.status_code == 400
+
+class TestUserQueryBudget:
+
+    def test_create_user_budget(self, client, query_budget):
+        """Registration is a lookup, an insert and the post-commit reload."""
+        with query_budget(3):
+            client.post("/api/v1/users", json={"email": "dan@example.com", "name": "Dan"})
+
+    def test_existing_user_is_one_read(self, client, query_budget):
+        client.post("/api/v1/users", json={"email": "erin@example.com", "name": "Erin"})
+        with query_budget(1):
+            client.post("/api/v1/users", json={"email": "erin@example.com", "name": "Erin"})
+
+    def test_lookup_budget(self, client, query_budget):
+        client.post("/api/v1/users", json={"email": "finn@example.com", "name": "Finn"})
+        with query_budget(1):
+            client.get("/api/v1/users/lookup?email=finn@example.com")